@@ -1,7 +1,45 @@
+from baml_agents._agent_loop._agent_loop import (
+    AgentBudget,
+    AgentLoop,
+    AgentRun,
+    AgentStep,
+)
+from baml_agents._agent_loop._episodes import (
+    EpisodeResult,
+    iter_episodes,
+    run_episodes,
+)
+from baml_agents._agent_loop._interaction_history import (
+    CompactionPolicy,
+    HistoryEntry,
+    InteractionHistory,
+    SlidingWindow,
+    SummarizeTurns,
+    TruncateResults,
+)
 from baml_agents._agent_tools._action import Action
 from baml_agents._agent_tools._mcp import ActionRunner
+from baml_agents._agent_tools._mcp_cache import McpCache, McpCacheStats
+from baml_agents._agent_tools._mcp_discovery import (
+    McpDiscoveryReport,
+    McpServerDiscovery,
+)
+from baml_agents._agent_tools._mcp_schema_to_type_builder._baml_tool_prompt_config import (
+    BamlToolPromptConfig,
+)
+from baml_agents._agent_tools._mcp_schema_to_type_builder._schema_compaction import (
+    SchemaCompaction,
+)
+from baml_agents._agent_tools._mcp_session import (
+    McpServerCrashedError,
+    McpSessionError,
+    McpStdioSession,
+)
+from baml_agents._agent_tools._mcptools_utils import set_mcptools_binary
+from baml_agents._agent_tools._result_limits import ResultLimits
 from baml_agents._agent_tools._str_result import Result
 from baml_agents._agent_tools._tool_definition import McpToolDefinition
+from baml_agents._agent_tools._tool_index import ToolIndex
 from baml_agents._agent_tools._utils._baml_utils import (
     default_format_role,
     disable_format_role,
@@ -9,11 +47,25 @@ from baml_agents._agent_tools._utils._baml_utils import (
     get_prompt,
 )
 from baml_agents._baml_client_proxy._baml_client_proxy import BamlClientProxy
+from baml_agents._baml_client_proxy._batch import BatchItemResult
 from baml_agents._baml_client_proxy._hook_engine import HookEngineAsync, HookEngineSync
 from baml_agents._baml_client_proxy._hooks._base_hook import (
     BaseBamlHook,
     BaseBamlHookContext,
 )
+from baml_agents._baml_client_proxy._hooks._implementations._fallback_clients import (
+    FallbackClients,
+)
+from baml_agents._baml_client_proxy._hooks._implementations._response_cache import (
+    ResponseCacheHook,
+)
+from baml_agents._baml_client_proxy._hooks._implementations._retry_with_backoff import (
+    RetryWithBackoff,
+    is_transient_baml_error,
+)
+from baml_agents._baml_client_proxy._hooks._implementations._return_cached_on_error import (
+    ReturnCachedOnError,
+)
 from baml_agents._baml_client_proxy._hooks._implementations._test_generator import (
     BamlTestGeneratorHook,
 )
@@ -37,6 +89,8 @@ from baml_agents._baml_client_proxy._hooks._on_error_hook import (
     OnErrorHookAsync,
     OnErrorHookContext,
     OnErrorHookSync,
+    RetryCall,
+    ReturnValue,
 )
 from baml_agents._baml_client_proxy._hooks._on_partial_response_parsed_hook import (
     OnPartialResponseParsedHookAsync,
@@ -44,11 +98,21 @@ from baml_agents._baml_client_proxy._hooks._on_partial_response_parsed_hook impo
     OnPartialResponseParsedHookSync,
 )
 from baml_agents._baml_client_proxy._hooks._types import Mutable
+from baml_agents._baml_client_proxy._streaming import PartialHookPolicy
 from baml_agents._baml_client_proxy._with_hooks import with_hooks
-from baml_agents._baml_clients._with_baml_client import with_baml_client
+from baml_agents._baml_clients._with_baml_client import (
+    make_client_registry,
+    with_baml_client,
+)
 from baml_agents._baml_clients._with_model import BamlModelConfig, with_model
 from baml_agents._project_utils._get_root_path import get_root_path
 from baml_agents._project_utils._init_logging import init_logging
+from baml_agents._utils._cache_store import (
+    CacheStore,
+    MemoryCacheStore,
+    SqliteCacheStore,
+    TieredCacheStore,
+)
 from baml_agents._utils._must import must
 from baml_agents._utils._sole import sole
 
@@ -56,14 +120,34 @@ __version__ = "0.46.1"
 __all__ = [
     "Action",
     "ActionRunner",
+    "AgentBudget",
+    "AgentLoop",
+    "AgentRun",
+    "AgentStep",
     "BamlClientProxy",
     "BamlModelConfig",
     "BamlTestGeneratorHook",
+    "BamlToolPromptConfig",
     "BaseBamlHook",
     "BaseBamlHookContext",
+    "BatchItemResult",
+    "CacheStore",
+    "CompactionPolicy",
+    "EpisodeResult",
+    "FallbackClients",
+    "HistoryEntry",
     "HookEngineAsync",
     "HookEngineSync",
+    "InteractionHistory",
+    "McpCache",
+    "McpCacheStats",
+    "McpDiscoveryReport",
+    "McpServerCrashedError",
+    "McpServerDiscovery",
+    "McpSessionError",
+    "McpStdioSession",
     "McpToolDefinition",
+    "MemoryCacheStore",
     "Mutable",
     "OnAfterCallSuccessHookAsync",
     "OnAfterCallSuccessHookContext",
@@ -77,7 +161,21 @@ __all__ = [
     "OnPartialResponseParsedHookAsync",
     "OnPartialResponseParsedHookContext",
     "OnPartialResponseParsedHookSync",
+    "PartialHookPolicy",
+    "ResponseCacheHook",
     "Result",
+    "ResultLimits",
+    "RetryCall",
+    "RetryWithBackoff",
+    "ReturnCachedOnError",
+    "ReturnValue",
+    "SchemaCompaction",
+    "SlidingWindow",
+    "SqliteCacheStore",
+    "SummarizeTurns",
+    "TieredCacheStore",
+    "ToolIndex",
+    "TruncateResults",
     "WithOptions",
     "default_format_role",
     "disable_format_role",
@@ -86,7 +184,12 @@ __all__ = [
     "get_prompt",
     "get_root_path",
     "init_logging",
+    "is_transient_baml_error",
+    "iter_episodes",
+    "make_client_registry",
     "must",
+    "run_episodes",
+    "set_mcptools_binary",
     "sole",
     "with_baml_client",
     "with_hooks",
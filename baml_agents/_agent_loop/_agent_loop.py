@@ -0,0 +1,324 @@
+import asyncio
+import inspect
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from typing import Any, Generic, Literal, TypeVar, cast
+
+from baml_py.type_builder import TypeBuilder
+from loguru import logger
+
+from baml_agents._agent_loop._interaction_history import (
+    InteractionHistory,
+    merge_results,
+)
+from baml_agents._agent_tools._mcp import ActionRunner, normalize_action_id
+from baml_agents._agent_tools._str_result import Result
+from baml_agents._agent_tools._tool_definition import McpToolDefinition
+
+B = TypeVar("B")
+
+StopReason = Literal["stop", "max_steps", "max_wall_s", "max_cost"]
+
+
+@dataclass(frozen=True)
+class AgentBudget:
+    """Limits of one `AgentLoop.run`, checked before every step."""
+
+    max_steps: int | None = field(
+        default=20,
+        metadata={"description": "Steps (LLM call plus tool calls) per run"},
+    )
+    max_wall_s: float | None = field(
+        default=None,
+        metadata={"description": "Wall-clock seconds per run, a step is cut short"},
+    )
+    max_cost: float | None = field(
+        default=None,
+        metadata={"description": "Sum of the `cost` of the steps per run"},
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class AgentStep:
+    index: int
+    action: Any
+    result: Result | list[Result]
+    tb_s: float
+    llm_s: float
+    tool_s: float
+    total_s: float
+    cost: float = 0.0
+
+
+@dataclass
+class AgentRun:
+    goal: str
+    steps: list[AgentStep]
+    interactions: list[Any]
+    stop_reason: StopReason
+    elapsed_s: float
+    final_action: Any = None
+    history: InteractionHistory | None = None
+
+    @property
+    def cost(self) -> float:
+        return sum(s.cost for s in self.steps)
+
+    def timings(self) -> str:
+        """A table of the time spent per step, in milliseconds."""
+        lines = [f"{'step':>4}{'tb':>9}{'llm':>9}{'tool':>9}{'total':>9}"]
+        lines.extend(
+            f"{s.index:>4}{s.tb_s * 1000:>9.1f}{s.llm_s * 1000:>9.1f}"
+            f"{s.tool_s * 1000:>9.1f}{s.total_s * 1000:>9.1f}"
+            for s in self.steps
+        )
+        return "\n".join(lines)
+
+
+@dataclass
+class _StepProgress:
+    """How far the current step got, to record it if it is cut short."""
+
+    start: float
+    tb_done: float | None = None
+    llm_done: float | None = None
+    action: Any = None
+    recorded: bool = False
+    # The TypeBuilder of the next step, built while the tools run
+    next_tb: "asyncio.Future[TypeBuilder] | None" = None
+
+
+def default_interaction(action: Any, result: Result | list[Result]) -> dict:
+    """The arguments of the `Interaction` class in `GetNextAction.baml`."""
+    result = merge_results(result)
+    return {
+        "action": str(action),
+        "result": {"content": result.content, "error": result.error},
+    }
+
+
+class AgentLoop(Generic[B]):
+    """
+    Runs the agent loop of `notebooks/05_simple_agent_demo.ipynb`: asks `b`
+    for the next action, runs it with `runner` and appends the interaction,
+    until a stop action is chosen or the `budget` is used up. A step cut
+    short by `AgentBudget.max_wall_s` while its tools run is recorded with an
+    error Result; one cut short before the action was chosen is dropped.
+
+        loop = AgentLoop(runner, with_hooks(b, hooks), stop_actions=["stop"])
+        run = await loop.run(goal)
+        print(run.final_action, run.timings())
+
+    `b` is the (async) BAML client, not `runner.b`: the loop passes the
+    TypeBuilder itself, as `baml_options={"tb": tb}` of `function`. The
+    TypeBuilder of the next step doesn't depend on the tool results, so it is
+    built in a thread while the tools of the current step run.
+
+    A stop action (in `stop_actions` or accepted by `stop`) ends the run
+    without being executed, it is returned as `AgentRun.final_action`.
+    `cost(step)` is summed up for `AgentBudget.max_cost`, e.g. computed from a
+    BAML `Collector` passed in `baml_options`.
+
+    Pass an `InteractionHistory` to `run` to keep the prompt of long runs within
+    a token budget; the interactions are then rendered and compacted by it
+    instead of `new_interaction`.
+
+    `include` keeps the same tools for every step. `include_for(goal,
+    interactions)` instead returns the filter of each step, e.g. to put only
+    the tools relevant to the goal into the prompt:
+
+        include_for=lambda goal, _: runner.relevant_actions(goal, always_include=["stop"])
+
+    As the TypeBuilder is built while the tools of the previous step run, the
+    interactions passed don't have that step's results yet.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        runner: ActionRunner,
+        b: B,
+        *,
+        function: str = "GetNextAction",
+        return_class: str = "NextAction",
+        include: Callable[[McpToolDefinition], bool] | None = None,
+        include_for: Callable[
+            [str, Sequence[Any]], Callable[[McpToolDefinition], bool] | None
+        ]
+        | None = None,
+        stop_actions: Sequence[str] = (),
+        stop: Callable[[Any], bool] | None = None,
+        budget: AgentBudget | None = None,
+        cost: Callable[[AgentStep], float] | None = None,
+        new_interaction: Callable[[Any, Result | list[Result]], Any] = (
+            default_interaction
+        ),
+        baml_options: Mapping[str, Any] | None = None,
+        tool_timeout_s: float | None = None,
+    ):
+        self._runner = runner
+        self._b = b
+        self._function = function
+        self._return_class = return_class
+        if include is not None and include_for is not None:
+            raise ValueError("Pass either `include` or `include_for`, not both.")
+        self._include = include
+        self._include_for = include_for
+        self._stop_actions = {normalize_action_id(a) for a in stop_actions}
+        self._stop = stop
+        self._budget = budget or AgentBudget()
+        if self._budget.max_cost is not None and cost is None:
+            raise ValueError("AgentBudget.max_cost needs a `cost` function.")
+        self._cost = cost
+        self._new_interaction = new_interaction
+        self._baml_options = dict(baml_options or {})
+        self._tool_timeout_s = tool_timeout_s
+
+    async def run(
+        self,
+        goal: str,
+        interactions: Sequence[Any] = (),
+        *,
+        history: InteractionHistory | None = None,
+    ) -> AgentRun:
+        if history is not None and interactions:
+            raise ValueError("Pass either `interactions` or `history`, not both.")
+        start = time.perf_counter()
+        budget = self._budget
+        run = AgentRun(goal, [], list(interactions), "max_steps", 0.0, history=history)
+        next_tb = self._start_tb(run)
+        progress: _StepProgress | None = None
+        try:
+            while budget.max_steps is None or len(run.steps) < budget.max_steps:
+                if budget.max_cost is not None and run.cost >= budget.max_cost:
+                    run.stop_reason = "max_cost"
+                    break
+                remaining_s = None
+                if budget.max_wall_s is not None:
+                    remaining_s = budget.max_wall_s - (time.perf_counter() - start)
+                    if remaining_s <= 0:
+                        run.stop_reason = "max_wall_s"
+                        break
+                progress = _StepProgress(start=time.perf_counter())
+                try:
+                    step, next_tb = await asyncio.wait_for(
+                        self._step(run, next_tb, progress), remaining_s
+                    )
+                except TimeoutError:
+                    run.stop_reason = "max_wall_s"
+                    self._record_cut_short(run, progress)
+                    break
+                if step is None:
+                    run.stop_reason = "stop"
+                    break
+                logger.debug(
+                    "Agent step",
+                    step=step.index,
+                    tb_s=step.tb_s,
+                    llm_s=step.llm_s,
+                    tool_s=step.tool_s,
+                )
+        finally:
+            next_tb.cancel()
+            if progress is not None and progress.next_tb is not None:
+                progress.next_tb.cancel()
+        if history is not None:
+            run.interactions = history.interactions
+        run.elapsed_s = time.perf_counter() - start
+        return run
+
+    async def _step(
+        self,
+        run: AgentRun,
+        tb: "asyncio.Future[TypeBuilder]",
+        progress: _StepProgress,
+    ) -> tuple[AgentStep | None, "asyncio.Future[TypeBuilder]"]:
+        built = await tb
+        progress.tb_done = time.perf_counter()
+
+        interactions = self._interactions(run)
+        call = getattr(self._b, self._function)(
+            run.goal,
+            interactions,
+            baml_options={**self._baml_options, "tb": built},
+        )
+        action = await call if inspect.isawaitable(call) else call
+        progress.llm_done = time.perf_counter()
+
+        if self._is_stop(action):
+            run.final_action = action
+            return None, tb
+
+        progress.action = action
+        # Built while the tools run, it doesn't depend on their results
+        next_tb = progress.next_tb = self._start_tb(run)
+        result = await self._runner.arun(action, timeout_s=self._tool_timeout_s)
+
+        step = self._record(run, progress, result)
+        if run.history is not None and run.history.needs_compaction:
+            # Before the next prompt is rendered, while its TypeBuilder builds
+            await run.history.compact()
+        return step, next_tb
+
+    def _record_cut_short(self, run: AgentRun, progress: _StepProgress) -> None:
+        if progress.action is None or progress.recorded:
+            # Not chosen yet, or cut short while compacting the history
+            return
+        cut = Result(content="Cut short by AgentBudget.max_wall_s", error=True)
+        chosen = progress.action.model_dump()["chosen_action"]
+        self._record(
+            run, progress, [cut] * len(chosen) if isinstance(chosen, list) else cut
+        )
+
+    def _record(
+        self,
+        run: AgentRun,
+        progress: _StepProgress,
+        result: Result | list[Result],
+    ) -> AgentStep:
+        """Appends the step, and its interaction, to `run`."""
+        done = time.perf_counter()
+        tb_done = cast("float", progress.tb_done)
+        llm_done = cast("float", progress.llm_done)
+        step = AgentStep(
+            index=len(run.steps),
+            action=progress.action,
+            result=result,
+            tb_s=tb_done - progress.start,
+            llm_s=llm_done - tb_done,
+            tool_s=done - llm_done,
+            total_s=done - progress.start,
+        )
+        if self._cost is not None:
+            step = replace(step, cost=self._cost(step))
+        run.steps.append(step)
+        progress.recorded = True
+        if run.history is None:
+            run.interactions.append(self._new_interaction(progress.action, result))
+        else:
+            run.history.add(progress.action, result)
+        return step
+
+    @staticmethod
+    def _interactions(run: AgentRun) -> list[Any]:
+        return run.interactions if run.history is None else run.history.interactions
+
+    def _start_tb(self, run: AgentRun) -> "asyncio.Future[TypeBuilder]":
+        # A copy, the interactions change while the TypeBuilder is built
+        interactions = list(self._interactions(run))
+        return asyncio.ensure_future(
+            asyncio.to_thread(self._build_tb, run.goal, interactions)
+        )
+
+    def _build_tb(self, goal: str, interactions: Sequence[Any]) -> TypeBuilder:
+        include = self._include
+        if self._include_for is not None:
+            include = self._include_for(goal, interactions)
+        return self._runner.tb(self._return_class, include=include)
+
+    def _is_stop(self, action: Any) -> bool:
+        if self._stop is not None and self._stop(action):
+            return True
+        chosen = action.model_dump()["chosen_action"]
+        chosen = chosen if isinstance(chosen, list) else [chosen]
+        return any(a.get("action_id") in self._stop_actions for a in chosen)
@@ -0,0 +1,141 @@
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from pydantic import BaseModel
+
+from baml_agents._agent_loop._agent_loop import AgentLoop, AgentRun
+from baml_agents._agent_loop._interaction_history import InteractionHistory
+
+
+@dataclass(frozen=True)
+class EpisodeResult:
+    """Outcome of one goal of `run_episodes`, either a `run` or an `error`."""
+
+    index: int
+    goal: str
+    run: AgentRun | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> AgentRun:
+        if self.error is not None:
+            raise self.error
+        return self.run  # type: ignore[return-value]
+
+    def to_json(self) -> dict[str, Any]:
+        """The result as a JSON record, actions as their JSON values."""
+        record: dict[str, Any] = {"index": self.index, "goal": self.goal}
+        if self.error is not None:
+            return {**record, "error": repr(self.error)}
+        run = self.unwrap()
+        return {
+            **record,
+            "stop_reason": run.stop_reason,
+            "final_action": _jsonable(run.final_action),
+            "elapsed_s": run.elapsed_s,
+            "cost": run.cost,
+            "steps": [
+                {
+                    "action": _jsonable(s.action),
+                    "tb_s": s.tb_s,
+                    "llm_s": s.llm_s,
+                    "tool_s": s.tool_s,
+                    "cost": s.cost,
+                }
+                for s in run.steps
+            ],
+        }
+
+
+async def iter_episodes(
+    loop: AgentLoop,
+    goals: Iterable[str],
+    *,
+    max_concurrency: int = 8,
+    history: Callable[[], InteractionHistory] | None = None,
+) -> AsyncIterator[EpisodeResult]:
+    """
+    Runs `loop` once per goal, `max_concurrency` at a time, and yields the
+    results as the episodes finish. A failed episode doesn't affect the
+    others, its error is kept in its `EpisodeResult`.
+
+    All episodes share the `ActionRunner` of `loop`, and with it the converted
+    tool schemas, the MCP cache and persistent MCP sessions; the tools of each
+    goal can be picked by `AgentLoop(include_for=...)`. `history` creates the
+    `InteractionHistory` of each episode.
+
+    `goals` is consumed lazily, so it can be a generator over a large dataset.
+    """
+    pending = iter(enumerate(goals))
+    results: asyncio.Queue[EpisodeResult | None] = asyncio.Queue()
+
+    async def worker() -> None:
+        # Goals are taken one at a time, in the event loop thread
+        for index, goal in pending:
+            try:
+                run = await loop.run(
+                    goal, history=history() if history is not None else None
+                )
+                await results.put(EpisodeResult(index, goal, run=run))
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Episode failed", index=index, error=e)
+                await results.put(EpisodeResult(index, goal, error=e))
+        await results.put(None)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            if (result := await results.get()) is None:
+                running -= 1
+            else:
+                yield result
+    finally:
+        for w in workers:
+            w.cancel()
+
+
+async def run_episodes(
+    loop: AgentLoop,
+    goals: Iterable[str],
+    *,
+    jsonl_path: str | Path | None = None,
+    max_concurrency: int = 8,
+    history: Callable[[], InteractionHistory] | None = None,
+) -> list[EpisodeResult]:
+    """
+    Like `iter_episodes`, but returns the results in the order of `goals`.
+    With `jsonl_path`, each result is appended to the file as one JSON line
+    as soon as its episode finishes, so partial runs are kept.
+    """
+    results: list[EpisodeResult] = []
+    path = Path(jsonl_path) if jsonl_path is not None else None
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") if path else contextlib.nullcontext() as file:
+        async for result in iter_episodes(
+            loop, goals, max_concurrency=max_concurrency, history=history
+        ):
+            results.append(result)
+            if file is not None:
+                record = json.dumps(result.to_json(), ensure_ascii=False, default=str)
+                file.write(record + "\n")
+                file.flush()
+    return sorted(results, key=lambda r: r.index)
+
+
+def _jsonable(value: Any) -> Any:
+    # Other values are passed through, `run_episodes` writes what JSON can't
+    # represent as str
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
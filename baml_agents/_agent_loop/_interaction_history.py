@@ -0,0 +1,204 @@
+import inspect
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+
+from baml_agents._agent_tools._mcp_schema_to_type_builder._prompt_size import (
+    estimate_tokens,
+)
+from baml_agents._agent_tools._result_limits import ResultLimits
+from baml_agents._agent_tools._str_result import Result
+
+# Role markers and the rest of the prompt template around each interaction
+_TOKENS_PER_ENTRY = 8
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    action: str
+    result: Result
+    tokens: int = field(init=False, compare=False)
+
+    def __post_init__(self):
+        tokens = estimate_tokens(self.action) + estimate_tokens(self.result.content)
+        object.__setattr__(self, "tokens", tokens + _TOKENS_PER_ENTRY)
+
+
+def merge_results(result: Result | list[Result]) -> Result:
+    """One Result for the results of parallel actions."""
+    if not isinstance(result, list):
+        return result
+    return Result(
+        content="\n\n".join(r.content for r in result),
+        error=any(r.error for r in result),
+    )
+
+
+class CompactionPolicy(ABC):
+    """Shortens the history, oldest entries first."""
+
+    @abstractmethod
+    def compact(
+        self, entries: list[HistoryEntry], target_tokens: int
+    ) -> list[HistoryEntry] | Awaitable[list[HistoryEntry]]:
+        """
+        Returns the compacted entries, within `target_tokens` if this policy
+        can get there (the next policy continues from its result).
+        """
+
+
+class SlidingWindow(CompactionPolicy):
+    """Drops the oldest entries, keeping at least the last `min_entries`."""
+
+    def __init__(self, min_entries: int = 1):
+        self.min_entries = min_entries
+
+    def compact(self, entries, target_tokens):
+        tokens = _total(entries)
+        start = 0
+        while len(entries) - start > self.min_entries and tokens > target_tokens:
+            tokens -= entries[start].tokens
+            start += 1
+        return entries[start:]
+
+
+class TruncateResults(CompactionPolicy):
+    """
+    Truncates the result content of older entries to `max_chars`, leaving the
+    last `keep_last` entries intact.
+    """
+
+    def __init__(self, max_chars: int = 200, keep_last: int = 2):
+        self.max_chars = max_chars
+        self.keep_last = keep_last
+
+    def compact(self, entries, target_tokens):
+        limits = ResultLimits(max_chars=self.max_chars)
+        entries = list(entries)
+        tokens = _total(entries)
+        for i in range(max(0, len(entries) - self.keep_last)):
+            if tokens <= target_tokens:
+                break
+            entry = entries[i]
+            truncated = HistoryEntry(entry.action, limits.apply(entry.result))
+            tokens += truncated.tokens - entry.tokens
+            entries[i] = truncated
+        return entries
+
+
+class SummarizeTurns(CompactionPolicy):
+    """
+    Replaces all but the last `keep_last` entries by one summary entry, e.g.
+    written by a BAML function:
+
+        SummarizeTurns(lambda entries: b.SummarizeInteractions(
+            [f"{e.action}: {e.result.content}" for e in entries]
+        ))
+    """
+
+    def __init__(
+        self,
+        summarize: Callable[[list[HistoryEntry]], str | Awaitable[str]],
+        *,
+        keep_last: int = 4,
+        action: str = "Summary of the earlier steps",
+    ):
+        self.summarize = summarize
+        self.keep_last = keep_last
+        self.action = action
+
+    async def compact(self, entries, target_tokens):  # noqa: ARG002
+        older = entries[: -self.keep_last] if self.keep_last else entries
+        if len(older) < 2:  # noqa: PLR2004
+            return entries
+        summary = self.summarize(older)
+        if inspect.isawaitable(summary):
+            summary = await summary
+        return [
+            HistoryEntry(self.action, Result(content=summary)),
+            *entries[len(older) :],
+        ]
+
+
+class InteractionHistory:
+    """
+    The interactions of an agent run, with a running token estimate. Once it
+    exceeds `compact_at` of `max_tokens`, `compact()` applies the `policies`
+    in order until the history is within `compact_to` of `max_tokens`, so the
+    prompt stays under budget and isn't compacted again on every step.
+
+    `interactions` renders the entries with `to_interaction`, by default as
+    the arguments of the `Interaction` class in `GetNextAction.baml`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_tokens: int | None = None,
+        policies: Sequence[CompactionPolicy] = (),
+        compact_at: float = 0.8,
+        compact_to: float = 0.6,
+        to_interaction: Callable[[HistoryEntry], object] | None = None,
+    ):
+        if not 0 < compact_to <= compact_at <= 1:
+            raise ValueError("Expected 0 < compact_to <= compact_at <= 1.")
+        self.max_tokens = max_tokens
+        self.policies = list(policies)
+        self.compact_at = compact_at
+        self.compact_to = compact_to
+        self._to_interaction = to_interaction or _default_interaction
+        self._entries: list[HistoryEntry] = []
+        self._tokens = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def entries(self) -> tuple[HistoryEntry, ...]:
+        return tuple(self._entries)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated prompt tokens of the interactions."""
+        return self._tokens
+
+    @property
+    def interactions(self) -> list[object]:
+        return [self._to_interaction(e) for e in self._entries]
+
+    @property
+    def needs_compaction(self) -> bool:
+        if self.max_tokens is None or not self.policies:
+            return False
+        return self._tokens > self.max_tokens * self.compact_at
+
+    def add(self, action: object, result: Result | list[Result]) -> None:
+        entry = HistoryEntry(str(action), merge_results(result))
+        self._entries.append(entry)
+        self._tokens += entry.tokens
+
+    async def compact(self) -> None:
+        if self.max_tokens is None:
+            return
+        target = int(self.max_tokens * self.compact_to)
+        entries = self._entries
+        for policy in self.policies:
+            if _total(entries) <= target:
+                break
+            compacted = policy.compact(entries, target)
+            if inspect.isawaitable(compacted):
+                compacted = await compacted
+            entries = list(compacted)
+        self._entries = entries
+        self._tokens = _total(entries)
+
+
+def _total(entries: Sequence[HistoryEntry]) -> int:
+    return sum(e.tokens for e in entries)
+
+
+def _default_interaction(entry: HistoryEntry) -> dict:
+    return {
+        "action": entry.action,
+        "result": {"content": entry.result.content, "error": entry.result.error},
+    }
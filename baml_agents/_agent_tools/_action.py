@@ -1,6 +1,8 @@
 import inspect
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable
 from typing import Any, ClassVar, Self
+from weakref import WeakKeyDictionary
 
 from loguru import logger
 from pydantic import BaseModel
@@ -10,14 +12,21 @@ from baml_agents._agent_tools._utils._snake_to_pascal import pascal_to_snake
 
 from ._tool_definition import McpToolDefinition
 
+# Definitions are computed once per Action subclass, on first use
+_mcp_definitions: "WeakKeyDictionary[type[Action], McpToolDefinition]" = (
+    WeakKeyDictionary()
+)
+
 
 class Action(BaseModel, ABC):
     """
     Abstract base class for creating local MCP-compatible tools using Pydantic.
 
-    Subclasses define Pydantic fields for arguments and implement `__call__`.
+    Subclasses define Pydantic fields for arguments and implement `run`, which
+    may be async (it's then awaited by `ActionRunner.arun`).
     Class attributes `_mcp_tool_name` and `_mcp_annotations` provide overrides.
-    `get_mcp_definition` returns an MCPToolDefinition instance.
+    `get_mcp_definition` returns an MCPToolDefinition instance, which is
+    computed once per class and shared (it's read-only).
     """
 
     _alias: ClassVar[str | None] = None
@@ -29,6 +38,10 @@ class Action(BaseModel, ABC):
         Returns the canonical name of the action, using the alias if set, otherwise the class name,
         always in snake_case.
         """
+        return cls.get_mcp_definition().name
+
+    @classmethod
+    def _build_action_id(cls) -> str:
         tool_name_override = cls._alias
         tool_name = (
             tool_name_override
@@ -38,7 +51,7 @@ class Action(BaseModel, ABC):
         return pascal_to_snake(tool_name)
 
     @abstractmethod
-    def run(self) -> Result: ...
+    def run(self) -> Result | Awaitable[Result]: ...
 
     @classmethod
     def validate(cls, model: BaseModel) -> Self:
@@ -50,10 +63,16 @@ class Action(BaseModel, ABC):
     @classmethod
     def get_mcp_definition(cls) -> McpToolDefinition:
         """
-        Generates the strict MCPToolDefinition dataclass instance for this tool.
+        Returns the strict MCPToolDefinition instance for this tool.
         """
+        if (definition := _mcp_definitions.get(cls)) is None:
+            definition = _mcp_definitions.setdefault(cls, cls._build_mcp_definition())
+        return definition
+
+    @classmethod
+    def _build_mcp_definition(cls) -> McpToolDefinition:
         # 1. Determine Tool Name using the property for canonicalization
-        tool_name = cls.get_action_id()
+        tool_name = cls._build_action_id()
 
         # 2. Determine Tool Description
         tool_desc = inspect.getdoc(cls) or f"Executes the {tool_name} tool."
@@ -99,4 +118,3 @@ class Action(BaseModel, ABC):
             parameters_json_schema=input_schema_dict,
             annotations=tool_annotations,
         )
-
@@ -1,14 +1,21 @@
-from collections.abc import Mapping
+import json
+import os
+from collections.abc import Callable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from typing import Any
 
 from baml_agents._agent_tools._json_schema_to_baml_source._model_to_baml_source import (
     BamlModelToBamlSourceConverter,
 )
+from baml_agents._agent_tools._utils._snake_to_pascal import snake_to_pascal
+from baml_agents._utils._cache_store import CacheStore
 
 from ._json_to_model import (
     JsonSchemaToBamlModelConverter,
     JsonSchemaToBamlModelConverterConfig,
 )
+from ._source_cache import baml_source_cache_key, resolve_baml_source_cache
 
 
 def json_schema_to_baml_source(
@@ -16,12 +23,103 @@ def json_schema_to_baml_source(
     json_schema: str | Mapping[str, Any],
     *,
     schema_to_model_config: JsonSchemaToBamlModelConverterConfig | None = None,
+    cache: bool | CacheStore | None = None,
 ):
+    """
+    Generates the BAML source for `json_schema`. `cache=True` stores the
+    source on disk under `.cache/`, shared by all processes in the working
+    dir, or pass a `CacheStore`.
+    """
+    if (store := resolve_baml_source_cache(cache)) is None:
+        return _convert(class_name, json_schema, schema_to_model_config)
+    if isinstance(json_schema, str):
+        json_schema = json.loads(json_schema)
+    key = baml_source_cache_key(class_name, json_schema, schema_to_model_config)
+    hit, baml_source = store.get(key)
+    if not hit:
+        baml_source = _convert(class_name, json_schema, schema_to_model_config)
+        store.set(key, baml_source)
+    return baml_source
+
+
+def _convert(
+    class_name,
+    json_schema: str | Mapping[str, Any],
+    config: JsonSchemaToBamlModelConverterConfig | None,
+) -> str:
     schema_to_model = JsonSchemaToBamlModelConverter(
-        json_schema, class_name, config=schema_to_model_config
+        json_schema, class_name, config=config
     )
     baml_models = schema_to_model.convert()
     model_to_source = BamlModelToBamlSourceConverter(baml_models)
     baml_source = model_to_source.generate()
     return baml_source
 
+
+def _convert_job(
+    job: tuple[str, Mapping[str, Any], JsonSchemaToBamlModelConverterConfig | None],
+) -> str:
+    return _convert(*job)
+
+
+def _class_name_from_path(path: Path) -> str:
+    return snake_to_pascal(path.stem)
+
+
+def json_schemas_to_baml_sources(  # noqa: PLR0913
+    schema_dir: str | Path,
+    *,
+    output_dir: str | Path | None = None,
+    pattern: str = "*.json",
+    class_name: Callable[[Path], str] = _class_name_from_path,
+    schema_to_model_config: JsonSchemaToBamlModelConverterConfig | None = None,
+    cache: bool | CacheStore | None = None,
+    max_workers: int | None = None,
+) -> dict[Path, str]:
+    """
+    Generates the BAML source of every schema in `schema_dir` matching
+    `pattern`, e.g. as a build step. The class is named after the file
+    (`get_weather.json` -> `GetWeather`) unless `class_name` says otherwise.
+
+    `cache` is as for `json_schema_to_baml_source`. Only schemas not found
+    in it are converted, across a pool of
+    `max_workers` processes (so `schema_to_model_config` must be picklable).
+    With `output_dir`, each source is also written to
+    `<output_dir>/<stem>.baml`; files that wouldn't change are left untouched.
+    """
+    store = resolve_baml_source_cache(cache)
+    sources: dict[Path, str] = {}
+    misses: list[tuple[Path, str | None]] = []
+    jobs = []
+    for path in sorted(Path(schema_dir).glob(pattern)):
+        name = class_name(path)
+        schema = json.loads(path.read_text(encoding="utf-8"))
+        key = None
+        if store is not None:
+            key = baml_source_cache_key(name, schema, schema_to_model_config)
+        hit, sources[path] = store.get(key) if key is not None else (False, None)
+        if not hit:
+            misses.append((path, key))
+            jobs.append((name, schema, schema_to_model_config))
+
+    if len(jobs) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers) as pool:
+            # Batches of jobs per task, most schemas convert in a millisecond or two
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(jobs) // (workers * 4))
+            converted = list(pool.map(_convert_job, jobs, chunksize=chunksize))
+    else:
+        converted = [_convert_job(job) for job in jobs]
+    for (path, key), baml_source in zip(misses, converted, strict=True):
+        sources[path] = baml_source
+        if store is not None and key is not None:
+            store.set(key, baml_source)
+
+    if output_dir is not None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for path, baml_source in sources.items():
+            target = output_dir / f"{path.stem}.baml"
+            if not target.exists() or target.read_text(encoding="utf-8") != baml_source:
+                target.write_text(baml_source, encoding="utf-8")
+    return sources
@@ -1,5 +1,6 @@
 import json
 from abc import ABC, abstractmethod
+from collections import Counter
 from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any, Generic, Protocol, TypeVar, runtime_checkable
 
@@ -45,8 +46,8 @@ class AbstractJsonSchemaToBamlModelConverter(ABC, BaseSchemaConverter):
 class BamlModelConverter:
     def __init__(self, baml_models: list[BamlClassModel | BamlEnumModel]):
         # Check for duplicate model names
-        names = [model.name for model in baml_models]
-        duplicates = {name for name in names if names.count(name) > 1}
+        names = Counter(model.name for model in baml_models)
+        duplicates = {name for name, count in names.items() if count > 1}
         if duplicates:
             raise ValueError(
                 f"Duplicate model names found: {', '.join(sorted(duplicates))}"
@@ -1,7 +1,7 @@
 import re
 import warnings
-from collections.abc import Mapping
-from contextlib import suppress
+from collections.abc import Generator, Mapping
+from functools import lru_cache
 from typing import Any, NamedTuple
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -26,6 +26,18 @@ from ._model import (
     BamlTypeInfo,
 )
 
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+_NAME_WORDS = re.compile(r"[A-Z]?[a-z0-9]+|[A-Z]+(?=[A-Z]|$)")
+
+# JSON pointer segments that don't name anything, skipped when deriving a name
+_STRUCTURAL_POINTER_PARTS = frozenset(
+    ("properties", "items", "$defs", "definitions", "anyOf", "oneOf", "type"),
+)
+
+# A parsing step: a generator that yields the sub-steps it needs the result of
+# and returns its own result, see JsonSchemaToBamlModelConverter._run
+_Step = Generator["_Step", Any, Any]
+
 
 class SchemaTypeAndUnions(NamedTuple):
     effective_type: str | None
@@ -36,11 +48,24 @@ class JsonSchemaToBamlModelConverterConfig(BaseModel):
     prop_name: PropNameCallback = Field(default_factory=DefaultPropName)
     desc: DescCallback = Field(default_factory=DefaultDesc)
     alias: AliasCallback = Field(default_factory=DefaultAlias)
+    # Part of the BAML source cache key, along with the names of the callbacks.
+    # Bump it when a callback's behavior changes, see `baml_source_cache_key`
+    cache_key: str = ""
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
 class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
+    """
+    Converts a JSON schema into BAML class and enum models.
+
+    Nested schemas are parsed on an explicit stack rather than the call
+    stack: the parsing methods are generators that yield the sub-schemas
+    they need parsed and receive the result back (see `_run`). Arbitrarily
+    deep schemas therefore don't hit Python's recursion limit, and the
+    conversion stays linear in the size of the schema.
+    """
+
     def __init__(
         self,
         schema: str | Mapping[str, Any],
@@ -55,6 +80,10 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
             str,
             BamlClassModel | BamlEnumModel | _RefPlaceholder,
         ] = {}
+        # Resolved $refs, kept apart so that a model isn't listed once per $ref
+        self._refs: dict[str, BamlClassModel | BamlEnumModel | _RefPlaceholder] = {}
+        # Last counter appended to a colliding name, e.g. {"Address": 3}
+        self._name_counters: dict[str, int] = {}
         self._anonymous_type_counter = 0
         self._cfg = config or JsonSchemaToBamlModelConverterConfig()
 
@@ -71,13 +100,17 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
 
         """
         self._definitions = {}  # Reset definitions for potentially multiple calls
+        self._refs = {}
+        self._name_counters = {}
         self._anonymous_type_counter = 0
 
         # Start parsing from the root schema, using the provided class_name
-        self._parse_schema_to_type_info(
-            schema=self._root_schema,
-            json_pointer="#",
-            forced_class_name=self._class_name,
+        self._run(
+            self._parse_schema_to_type_info(
+                schema=self._root_schema,
+                json_pointer=_Pointer.root("#"),
+                forced_class_name=self._class_name,
+            ),
         )
 
         # Extract all successfully created models from the definitions map
@@ -88,16 +121,50 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
         ]
         return models
 
+    @staticmethod
+    def _run(step: _Step) -> Any:
+        """
+        Runs a parsing step to completion and returns its result.
+
+        A step yields a sub-step wherever it would otherwise recurse, e.g.
+        `type_info = yield self._parse_schema_to_type_info(...)`. The sub-step
+        is pushed onto the stack and run, and its result is sent back into
+        the step (or its exception thrown into it, so `try`/`except` around a
+        `yield` behaves like around a call).
+        """
+        stack = [step]
+        value: Any = None
+        error: Exception | None = None
+        while stack:
+            try:
+                if error is None:
+                    sub_step = stack[-1].send(value)
+                else:
+                    sub_step = stack[-1].throw(error)
+            except StopIteration as done:
+                stack.pop()
+                value, error = done.value, None
+                continue
+            except Exception as e:
+                stack.pop()
+                if not stack:
+                    raise
+                value, error = None, e
+                continue
+            stack.append(sub_step)
+            value, error = None, None
+        return value
+
     # --- Core Parsing Orchestrator ---
 
     def _parse_schema_to_type_info(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
         *,
         is_property_optional: bool = False,
         forced_class_name: str | None = None,
-    ) -> BamlTypeInfo:
+    ) -> _Step:
         """
         Orchestrates the parsing of a JSON schema node into a BamlTypeInfo.
         Delegates to specialized handlers based on the schema structure.
@@ -113,23 +180,23 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
 
         """
         # Step 1: Handle $ref if present (returns immediately if ref found)
-        ref_type_info = self._handle_ref(
-            schema,
-            json_pointer,
-            is_property_optional=is_property_optional,
-        )
-        if ref_type_info:
-            return ref_type_info
+        if schema.get("$ref"):
+            return (
+                yield self._handle_ref(
+                    schema,
+                    json_pointer,
+                    is_property_optional=is_property_optional,
+                )
+            )
 
         # Step 2: Determine the primary type(s) defined (explicit type, anyOf, oneOf)
-        type_str, union_options = self._determine_schema_type_and_unions(
+        type_str, union_options = yield self._determine_schema_type_and_unions(
             schema,
             json_pointer,
         )
 
         # Step 3: Handle Unions (anyOf, oneOf, type array)
         if union_options is not None:
-            # This recursively calls _parse_schema_to_type_info for each option
             return self._create_union_or_optional_type(
                 union_options,
                 is_context_optional=is_property_optional,
@@ -139,7 +206,7 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
         effective_type = type_str or self._infer_effective_type(schema, json_pointer)
 
         # Step 5: Process based on the determined single effective type
-        final_type_info = self._process_single_type_schema(
+        final_type_info = yield self._process_single_type_schema(
             schema=schema,
             json_pointer=json_pointer,
             effective_type=effective_type,
@@ -159,65 +226,50 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _handle_ref(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
         *,
         is_property_optional: bool,
-    ) -> BamlTypeInfo | None:
+    ) -> _Step:
         """
         Handles schema nodes containing a '$ref'. Resolves the reference,
         parses the target schema (handling recursion and caching), and returns
-        the corresponding BamlTypeInfo if a '$ref' exists.
-
-        Returns:
-            BamlTypeInfo if a valid $ref is processed, None otherwise.
-
+        the corresponding BamlTypeInfo.
         """
-        ref = schema.get("$ref")
-        if not ref:
-            return None  # Not a reference schema
-
+        ref = schema["$ref"]
         if not isinstance(ref, str):
             raise InvalidRefError(
                 f"Invalid $ref value at '{json_pointer}': must be a string, got {type(ref)}",
             )
 
         # Check cache first to handle recursion and avoid re-parsing
-        if ref in self._definitions:
-            existing = self._definitions[ref]
+        if ref in self._refs:
+            existing = self._refs[ref]
             if isinstance(existing, _RefPlaceholder):
                 # Circular reference detected during resolution
                 raise CircularRefError(
                     f"Circular $ref detected involving '{ref}' (encountered at '{json_pointer}')",
                 )
-            if isinstance(existing, BamlClassModel):
-                # Return type info for existing cached class
-                return BamlTypeInfo(
-                    base_type=BamlBaseType.CLASS,
-                    custom_type_name=existing.name,
-                    is_optional=is_property_optional,  # Optionality depends on context
-                )
-            if isinstance(existing, BamlEnumModel):
-                # Return type info for existing cached enum
-                return BamlTypeInfo(
-                    base_type=BamlBaseType.ENUM,
-                    custom_type_name=existing.name,
-                    is_optional=is_property_optional,  # Optionality depends on context
-                )
-            # Should not happen
-            raise UnexpectedTypeError(
-                f"Unexpected cached type for $ref '{ref}': {type(existing)}",
+            return BamlTypeInfo(
+                base_type=(
+                    BamlBaseType.CLASS
+                    if isinstance(existing, BamlClassModel)
+                    else BamlBaseType.ENUM
+                ),
+                custom_type_name=existing.name,
+                is_optional=is_property_optional,  # Optionality depends on context
             )
 
-        # Ref not cached, resolve and parse recursively
+        # Ref not cached, resolve and parse it
         try:
             resolved_schema = self._resolve_ref(ref, json_pointer)
-            # Add placeholder *before* recursive call to detect circularity
-            self._definitions[ref] = _RefPlaceholder(ref)
+            # Add placeholder *before* parsing to detect circularity
+            self._refs[ref] = _RefPlaceholder(ref)
 
-            # Recursively parse the resolved schema. Crucially, pass the *contextual* optionality.
-            type_info = self._parse_schema_to_type_info(
+            # Parse the resolved schema. Crucially, pass the *contextual* optionality.
+            type_info = yield self._parse_schema_to_type_info(
                 schema=resolved_schema,
-                json_pointer=ref,  # Use the ref itself as the new pointer context
+                # Use the ref itself as the new pointer context
+                json_pointer=_Pointer.root(ref),
                 is_property_optional=is_property_optional,  # Pass down optionality
             )
 
@@ -236,95 +288,46 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
             TypeError,
             ValueError,
         ) as e:
-            # Clean up placeholder if resolution/parsing failed
-            if ref in self._definitions and isinstance(
-                self._definitions[ref],
-                _RefPlaceholder,
-            ):
-                del self._definitions[ref]
             raise RefResolutionError(
                 f"Error processing $ref '{ref}' at '{json_pointer}': {e}",
             ) from e
         finally:
-            # Ensure placeholder is removed if it wasn't replaced by a model,
-            # unless an error was already raised. This handles refs to primitives.
-            if ref in self._definitions and isinstance(
-                self._definitions[ref],
-                _RefPlaceholder,
-            ):
-                # Check if a model corresponding to the type info was actually created and cached
-                # If type_info points to a class/enum, check if that name exists as a model
-                should_delete = True
-                if (
-                    hasattr(type_info, "custom_type_name")
-                    and type_info.custom_type_name
-                    and type_info.custom_type_name in self._definitions
-                ):
-                    # A model likely exists, cache_resolved_ref_model should handle it
-                    pass  # Keep placeholder for now, let cache_resolved_ref_model decide
-                if (
-                    should_delete
-                    and ref in self._definitions
-                    and isinstance(self._definitions[ref], _RefPlaceholder)
-                ):
-                    # Might have been deleted by _cache_resolved_ref_model already
-                    with suppress(KeyError):
-                        del self._definitions[ref]
+            # Refs to primitives, and refs that failed, aren't cached
+            if isinstance(self._refs.get(ref), _RefPlaceholder):
+                del self._refs[ref]
 
     def _cache_resolved_ref_model(self, ref: str, type_info: BamlTypeInfo) -> None:
-        """Helper to update the definitions cache after resolving a $ref."""
+        """Helper to update the $ref cache after resolving a $ref."""
         if type_info.base_type == BamlBaseType.CLASS and type_info.custom_type_name:
             model = self._definitions.get(type_info.custom_type_name)
             if isinstance(model, BamlClassModel):
-                self._definitions[ref] = model  # Replace placeholder with actual model
+                self._refs[ref] = model  # Replace placeholder with actual model
             else:
                 warnings.warn(
                     f"Could not find BamlClassModel '{type_info.custom_type_name}' to cache for $ref '{ref}'."
                     " This might happen with complex nested anonymous types referenced later.",
                 )
-                # Decide whether to keep or delete placeholder if model not found
-                if ref in self._definitions and isinstance(
-                    self._definitions[ref],
-                    _RefPlaceholder,
-                ):
-                    del self._definitions[
-                        ref
-                    ]  # Remove placeholder if model link is broken
-
         elif type_info.base_type == BamlBaseType.ENUM and type_info.custom_type_name:
             model = self._definitions.get(type_info.custom_type_name)
             if isinstance(model, BamlEnumModel):
-                self._definitions[ref] = model  # Replace placeholder with actual model
+                self._refs[ref] = model  # Replace placeholder with actual model
             else:
                 warnings.warn(
                     f"Could not find BamlEnumModel '{type_info.custom_type_name}' to cache for $ref '{ref}'.",
                 )
-                if ref in self._definitions and isinstance(
-                    self._definitions[ref],
-                    _RefPlaceholder,
-                ):
-                    del self._definitions[ref]  # Remove placeholder
-
-        # If the ref resolved to a primitive or basic type, the placeholder
-        # should generally be removed (handled in the finally block of _handle_ref or here).
-        elif ref in self._definitions and isinstance(
-            self._definitions[ref],
-            _RefPlaceholder,
-        ):
-
-            with suppress(KeyError):
-                del self._definitions[ref]
+        # Refs to primitives or basic types keep their placeholder, which
+        # _handle_ref removes
 
     def _determine_schema_type_and_unions(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
-    ) -> SchemaTypeAndUnions:
+        json_pointer: "_Pointer",
+    ) -> _Step:
         """
         Determines the effective JSON schema type(s). Handles explicit 'type' keyword
         (string or list), 'anyOf', and 'oneOf'.
 
-        Returns:
+        Returns (as the result of the step):
             A tuple: (effective_type_string, list_of_union_options | None).
             - If a single type string is found, returns (type_string, None).
             - If multiple types (type list, anyOf, oneOf) are found, returns (None, list_of_parsed_BamlTypeInfo).
@@ -347,16 +350,16 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
             key = "anyOf" if "anyOf" in schema else "oneOf"
             for i, sub_schema in enumerate(union_schemas):
                 if isinstance(sub_schema, dict):
-                    # Recursively parse each option *without* passing contextual optionality yet
+                    # Parse each option *without* passing contextual optionality yet
                     # Optionality will be handled by _create_union_or_optional_type
-                    option_type = self._parse_schema_to_type_info(
+                    option_type = yield self._parse_schema_to_type_info(
                         sub_schema,
-                        f"{json_pointer}/{key}/{i}",
+                        json_pointer.child(key, str(i)),
                     )
                     union_options.append(option_type)
                 else:
                     warnings.warn(
-                        f"Ignoring non-dictionary item in {key} at '{json_pointer}/{key}/{i}'",
+                        f"Ignoring non-dictionary item in {key} at '{json_pointer.child(key, str(i))}'",
                     )
             return SchemaTypeAndUnions(
                 None,
@@ -369,10 +372,10 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
             simulated_anyof = [{"type": t} for t in types]
             union_options = []
             for i, sub_schema in enumerate(simulated_anyof):
-                # Recursively parse each simulated option
-                option_type = self._parse_schema_to_type_info(
+                # Parse each simulated option
+                option_type = yield self._parse_schema_to_type_info(
                     sub_schema,
-                    f"{json_pointer}/type/{i}",  # Pointer reflects source
+                    json_pointer.child("type", str(i)),  # Pointer reflects source
                 )
                 union_options.append(option_type)
             return SchemaTypeAndUnions(
@@ -390,7 +393,7 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _infer_effective_type(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
     ) -> str | None:
         """
         Infers the JSON schema type if not explicitly provided, based on other
@@ -423,10 +426,10 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _process_single_type_schema(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
         effective_type: str | None,
         forced_class_name: str | None = None,
-    ) -> BamlTypeInfo:
+    ) -> _Step:
         """
         Processes a schema node based on a single, determined effective type
         (e.g., 'object', 'array', 'string', 'integer', etc.). Delegates to
@@ -452,11 +455,13 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
                     "Consider using 'any' if a truly dynamic map is needed.",
                 )
             # Delegate to object parsing (handles class creation/caching)
-            return self._parse_object_schema(schema, json_pointer, forced_class_name)
+            return (
+                yield self._parse_object_schema(schema, json_pointer, forced_class_name)
+            )
 
         if effective_type == "array":
             # Delegate to array parsing
-            return self._parse_array_schema(schema, json_pointer)
+            return (yield self._parse_array_schema(schema, json_pointer))
 
         if effective_type == "string":
             # Delegate to string parsing (handles enums within)
@@ -495,16 +500,18 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _parse_array_schema(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
-    ) -> BamlTypeInfo:
+        json_pointer: "_Pointer",
+    ) -> _Step:
         """Parses an 'array' type schema."""
         items_schema = schema.get("items")
         item_type_info: BamlTypeInfo
 
         if isinstance(items_schema, dict):
-            item_pointer = f"{json_pointer}/items"
-            # Recursively parse the item schema. Optionality of items is determined within this call.
-            item_type_info = self._parse_schema_to_type_info(items_schema, item_pointer)
+            item_pointer = json_pointer.child("items")
+            # Parse the item schema. Optionality of items is determined within this step.
+            item_type_info = yield self._parse_schema_to_type_info(
+                items_schema, item_pointer
+            )
         elif items_schema is None:
             # Array with no 'items' defined - default to any[]
             warnings.warn(
@@ -538,7 +545,7 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _parse_string_schema(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
     ) -> BamlTypeInfo:
         """Parses a 'string' type schema, handling enums."""
         enum_values = schema.get("enum")
@@ -579,12 +586,12 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _parse_object_schema(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
         forced_class_name: str | None = None,
-    ) -> BamlTypeInfo:
+    ) -> _Step:
         """
         Parses an 'object' type schema into a BamlClassModel, handling caching
-        and recursive property parsing.
+        and parsing its properties.
         """
         class_name = self._get_or_create_model_name(
             schema,
@@ -636,11 +643,11 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
                 )
                 continue
 
-            prop_pointer = f"{json_pointer}/properties/{prop_name}"
+            prop_pointer = json_pointer.child("properties", prop_name)
             is_optional = prop_name not in required_props
             try:
-                # Recursively parse property schema
-                prop_type_info = self._parse_schema_to_type_info(
+                # Parse property schema
+                prop_type_info = yield self._parse_schema_to_type_info(
                     prop_schema,
                     prop_pointer,
                     is_property_optional=is_optional,  # Pass optionality context
@@ -696,7 +703,7 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _parse_enum_schema(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
         values: list[str | None],
     ) -> BamlTypeInfo:
         """
@@ -727,6 +734,7 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
         self._definitions[enum_name] = _RefPlaceholder(json_pointer)
 
         enum_values_models: list[BamlEnumValueModel] = []
+        baml_value_names: set[str] = set()
         has_null = False
         valid_string_values = (
             set()
@@ -756,12 +764,13 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
 
             # Handle potential collisions after sanitization (e.g., "my-value" and "MyValue" -> MyValue)
             # This simple check doesn't fully resolve, just warns. A robust solution might append numbers.
-            if any(evm.name == baml_val_name for evm in enum_values_models):
+            if baml_val_name in baml_value_names:
                 warnings.warn(
                     f"Enum value sanitization collision for '{val}' resulting in duplicate name '{baml_val_name}' in enum '{enum_name}'. Check BAML output.",
                 )
                 # Consider appending a number or using a different strategy if this is common
 
+            baml_value_names.add(baml_val_name)
             alias = val if baml_val_name != val else None
             # Consider for future improvement: Look for richer enum descriptions if available in schema extensions?
             enum_values_models.append(
@@ -924,7 +933,7 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
     def _get_or_create_model_name(
         self,
         schema: dict[str, Any],
-        json_pointer: str,
+        json_pointer: "_Pointer",
         type_kind: str,  # "Class" or "Enum"
         forced_name: str | None = None,
     ) -> str:
@@ -952,39 +961,14 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
             if title and isinstance(title, str):
                 name = self._sanitize_name(title, capitalize=True)
             else:
-                # Attempt to derive name from JSON pointer structure
-                parts = json_pointer.strip("#/").split("/")
-                # Filter out generic structural parts to find meaningful name components
-                meaningful_parts = [
-                    p
-                    for p in parts
-                    if p
-                    not in (
-                        "properties",
-                        "items",
-                        "$defs",
-                        "definitions",
-                        "anyOf",
-                        "oneOf",
-                        "type",
-                    )
-                    and not p.isdigit()
-                ]
-                if meaningful_parts:
-                    # Use last meaningful part, e.g., #/$defs/User -> User, #/properties/address -> Address
-                    derived_name = meaningful_parts[-1]
-                    # Check if it looks like a property name (likely camelCase) and PascalCase it
-                    if derived_name and derived_name[0].islower():
-                        name = self._sanitize_name(derived_name, capitalize=True)
-                    elif derived_name:
-                        name = self._sanitize_name(
-                            derived_name,
-                            capitalize=True,
-                        )  # Already likely Pascal or needs sanitizing
-                    else:  # Meaningful part was empty after filtering? Fallback.
-                        name = ""  # Handled by fallback below
-                else:
-                    name = ""  # No meaningful parts found
+                # Derive the name from the last meaningful JSON pointer segment,
+                # e.g. #/$defs/User -> User, #/properties/address -> Address
+                derived_name = json_pointer.name_part()
+                name = (
+                    self._sanitize_name(derived_name, capitalize=True)
+                    if derived_name
+                    else ""
+                )
 
                 # Fallback to anonymous naming if no title or derived name
                 if not name:
@@ -995,28 +979,26 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
                     )
 
         # Ensure name uniqueness across all definitions
+        existing = self._definitions.get(name)
+        # If we encounter a placeholder for the name we are trying to define,
+        # it means we are resolving a reference *to* this schema being defined.
+        if existing is None or isinstance(existing, _RefPlaceholder):
+            return name
+        # Simple name collision (e.g. two schemas with the same title/derived
+        # name), append a counter. Counting on from the last counter used for
+        # this name keeps many collisions linear.
         original_name = name
-        count = 1
-        while name in self._definitions:
-            existing = self._definitions[name]
-            # If we encounter a placeholder for the *same* name we are trying to define,
-            # it means we are resolving a reference *to* this schema being defined. Return the name.
-            if isinstance(existing, _RefPlaceholder):
-                # Ensure the placeholder corresponds to *this* schema definition attempt, not an unrelated one
-                # This check is tricky. Assume if name matches placeholder, it's the recursive case.
-                return name
-            if isinstance(existing, (BamlClassModel, BamlEnumModel)):
-                # Simple name collision (e.g. two schemas with same title/derived name), append counter
-                count += 1
-                name = f"{original_name}{count}"
-                warnings.warn(
-                    f"Name collision detected for '{original_name}'. Renaming to '{name}' for schema at '{json_pointer}'.",
-                )
-            else:  # Should not happen
-                raise UnexpectedTypeError(
-                    f"Unexpected type in definitions map for key '{name}': {type(existing)}",
-                )
-
+        count = self._name_counters.get(original_name, 1)
+        while True:
+            count += 1
+            name = f"{original_name}{count}"
+            existing = self._definitions.get(name)
+            if existing is None or isinstance(existing, _RefPlaceholder):
+                break
+        self._name_counters[original_name] = count
+        warnings.warn(
+            f"Name collision detected for '{original_name}'. Renaming to '{name}' for schema at '{json_pointer}'.",
+        )
         return name
 
     @staticmethod
@@ -1025,27 +1007,139 @@ class JsonSchemaToBamlModelConverter(AbstractJsonSchemaToBamlModelConverter):
         Converts a string to a valid BAML identifier (PascalCase for types, camelCase for fields).
         Handles common separators and invalid characters.
         """
-        if not name:
-            return "Unnamed"  # Or raise error?
+        return _sanitize_name(name, capitalize=capitalize)
 
-        # Replace common separators and invalid characters with underscores
-        name = re.sub(r"[^a-zA-Z0-9_]", "_", name)
 
-        # Split by underscore or camelCase transitions
-        words = re.findall(r"[A-Z]?[a-z0-9]+|[A-Z]+(?=[A-Z]|$)", name)
+@lru_cache(maxsize=4096)
+def _sanitize_name(name: str, *, capitalize: bool) -> str:
+    # Property and enum value names repeat a lot across large schemas
+    if not name:
+        return "Unnamed"  # Or raise error?
 
-        if not words:
-            # Handle cases like "__" or numeric inputs becoming empty
-            return (
-                f"InvalidName{name}"
-                if not capitalize
-                else f"InvalidName{name.capitalize()}"
-            )
+    # Replace common separators and invalid characters with underscores
+    name = _INVALID_NAME_CHARS.sub("_", name)
+
+    # Split by underscore or camelCase transitions
+    words = _NAME_WORDS.findall(name)
 
-        if capitalize:  # PascalCase for types (classes, enums)
-            return "".join(word.capitalize() for word in words)
-        # camelCase for fields/properties
-        return words[0].lower() + "".join(word.capitalize() for word in words[1:])
+    if not words:
+        # Handle cases like "__" or numeric inputs becoming empty
+        return (
+            f"InvalidName{name}"
+            if not capitalize
+            else f"InvalidName{name.capitalize()}"
+        )
+
+    if capitalize:  # PascalCase for types (classes, enums)
+        return "".join(word.capitalize() for word in words)
+    # camelCase for fields/properties
+    return words[0].lower() + "".join(word.capitalize() for word in words[1:])
+
+
+def _is_meaningful_pointer_part(part: str) -> bool:
+    return part not in _STRUCTURAL_POINTER_PARTS and not part.isdigit()
+
+
+class _NameState(NamedTuple):
+    """
+    What `_Pointer.name_part` is derived from, updated part by part as
+    segments are added to a pointer. "Real" parts have a character other
+    than '#'.
+    """
+
+    # The first real part, with leading '#' stripped
+    first: str | None = None
+    # The last real part (the nearest name candidate)
+    last: str | None = None
+    last_is_first: bool = False
+    # The last meaningful part between `first` and `last` (its fallback)
+    parent: str | None = None
+    # The last '#'-only part after `last`, meaningful once another part follows
+    trailing: str | None = None
+
+    def fed(self, segment: str) -> "_NameState":
+        state = self
+        for part in segment.split("/"):
+            if not part.strip("#"):
+                # Stripped off the ends, but meaningful between other parts
+                if state.last is not None:
+                    state = state._replace(trailing=part)
+                continue
+            if state.last is None:
+                state = _NameState(part.lstrip("#"), part, last_is_first=True)
+                continue
+            parent = state.parent
+            if state.trailing is not None:
+                parent = state.trailing
+            elif not state.last_is_first and _is_meaningful_pointer_part(state.last):
+                parent = state.last
+            state = _NameState(state.first, part, last_is_first=False, parent=parent)
+        return state
+
+    def name_part(self) -> str | None:
+        if self.last is None:
+            return None
+        last = self.last.strip("#") if self.last_is_first else self.last.rstrip("#")
+        if _is_meaningful_pointer_part(last):
+            return last
+        if self.parent is not None:
+            return self.parent
+        if not self.last_is_first and _is_meaningful_pointer_part(self.first):
+            return self.first
+        return None
+
+
+class _Pointer:
+    """
+    The JSON pointer of a schema node, e.g. `#/properties/address`.
+
+    Only the segment added to the parent is stored; the full string is built
+    when first needed (mostly for warnings). The name derived from the
+    pointer is tracked as segments are added, so that neither costs time
+    proportional to the nesting depth.
+    """
+
+    __slots__ = ("name_state", "parent", "segment", "text")
+
+    def __init__(
+        self,
+        parent: "_Pointer | None",
+        segment: str,
+        name_state: _NameState,
+    ):
+        self.parent = parent
+        self.segment = segment
+        self.text: str | None = None
+        self.name_state = name_state
+
+    @classmethod
+    def root(cls, text: str) -> "_Pointer":
+        """A pointer to the root schema (`#`) or to the target of a $ref."""
+        return cls(None, text, _NameState().fed(text))
+
+    def child(self, *segments: str) -> "_Pointer":
+        segment = "/".join(segments)
+        return _Pointer(self, segment, self.name_state.fed(segment))
+
+    def name_part(self) -> str | None:
+        """
+        The last part of the pointer, without leading and trailing '#' and '/',
+        that isn't a structural keyword or an index. Derived incrementally.
+        """
+        return self.name_state.name_part()
+
+    def __str__(self) -> str:
+        if self.text is None:
+            # Iterative, deeply nested pointers would overflow the stack otherwise
+            segments = []
+            node: _Pointer | None = self
+            while node is not None and node.text is None:
+                segments.append(node.segment)
+                node = node.parent
+            if node is not None:
+                segments.append(node.text)
+            self.text = "/".join(reversed(segments))
+        return self.text
 
 
 class _RefPlaceholder:
@@ -1081,4 +1175,3 @@ class UnexpectedTypeError(JsonSchemaToBamlModelError):
 
 class RefResolutionError(JsonSchemaToBamlModelError):
     """Raised when a $ref cannot be resolved."""
-
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import threading
+import types
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from baml_agents._utils._cache_store import CacheStore, SqliteCacheStore
+
+from ._json_to_model import JsonSchemaToBamlModelConverterConfig
+
+_default_cache: SqliteCacheStore | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_baml_source_cache() -> SqliteCacheStore:
+    """The cache used for `cache=True`, stored under `.cache/` of the working dir."""
+    global _default_cache  # noqa: PLW0603
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SqliteCacheStore(
+                Path(".cache") / "baml_source_cache.sqlite"
+            )
+        return _default_cache
+
+
+def resolve_baml_source_cache(cache: bool | CacheStore | None) -> CacheStore | None:  # noqa: FBT001
+    if isinstance(cache, CacheStore):
+        return cache
+    return get_default_baml_source_cache() if cache else None
+
+
+def baml_source_cache_key(
+    class_name: str,
+    json_schema: str | Mapping[str, Any],
+    config: JsonSchemaToBamlModelConverterConfig | None = None,
+) -> str:
+    """
+    A hash of everything the generated source depends on: the schema (parsed,
+    so formatting and key order don't matter), the class name, the converter
+    config and the baml-agents version.
+
+    Config callbacks count by name only (`module.qualname` of the function,
+    or of the class of a callable object), together with `config.cache_key`.
+    Bump `cache_key` whenever a callback's behavior changes, or entries
+    generated with the old behavior will keep being returned.
+    """
+    # Imported here, baml_agents imports this module
+    from baml_agents import __version__
+
+    schema = json.loads(json_schema) if isinstance(json_schema, str) else json_schema
+    config = config or JsonSchemaToBamlModelConverterConfig()
+    canonical = json.dumps(
+        {
+            "schema": schema,
+            "class_name": class_name,
+            "config": {
+                "prop_name": _callback_name(config.prop_name),
+                "desc": _callback_name(config.desc),
+                "alias": _callback_name(config.alias),
+                "cache_key": config.cache_key,
+            },
+            "version": __version__,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return f"baml_source:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+def _callback_name(callback: Any) -> str:
+    if not isinstance(callback, types.FunctionType | types.MethodType | type):
+        callback = type(callback)
+    return f"{callback.__module__}.{callback.__qualname__}"
@@ -1,14 +1,19 @@
-import hashlib
+import asyncio
+import functools
+import inspect
 import json
 import os
-import shelve
+import re
 import shlex
 import subprocess
 import threading
+import time
+from collections import Counter
 from collections.abc import Callable, Sequence
-from copy import deepcopy
-from pathlib import Path
-from typing import Any, Generic, TypeVar, cast
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass
+from typing import Any, Generic, Self, TypeVar, cast
 
 from baml_py.type_builder import TypeBuilder
 from loguru import logger
@@ -16,31 +21,42 @@ from pydantic import BaseModel
 
 from baml_agents._agent_tools._action import Action
 from baml_agents._agent_tools._baml_client_passthrough_wrapper import PassthroughWrapper
+from baml_agents._agent_tools._mcp_cache import McpCache, get_default_mcp_cache
+from baml_agents._agent_tools._mcp_discovery import (
+    McpDiscoveryReport,
+    McpServerDiscovery,
+)
+from baml_agents._agent_tools._mcp_schema_to_type_builder._baml_tool_prompt_config import (
+    BamlToolPromptConfig,
+)
 from baml_agents._agent_tools._mcp_schema_to_type_builder._facade import (
     add_available_actions,
+    estimate_prompt_tokens,
+    incremental_orchestrator,
 )
+from baml_agents._agent_tools._mcp_session import McpStdioSession
 from baml_agents._agent_tools._mcptools_utils import find_mcptools_binary
-from baml_agents._agent_tools._str_result import Result
+from baml_agents._agent_tools._result_limits import ResultLimits
+from baml_agents._agent_tools._str_result import TRUNCATED_AT_BYTES, Result
 from baml_agents._agent_tools._tool_definition import McpToolDefinition
+from baml_agents._agent_tools._tool_index import ToolIndex
 from baml_agents._agent_tools._utils._snake_to_pascal import pascal_to_snake
+from baml_agents._utils._freeze import SequenceView
 
-# Use a lock to avoid concurrent shelve access issues
-_shelve_lock = threading.Lock()
+_STREAM_CHUNK_BYTES = 64 * 1024
+# Raw output read per byte of text, see `call_tool`
+_RAW_OUTPUT_FACTOR = 4
+# Quotes inside JSON strings are escaped, so this only matches keys
+_TEXT_FIELD = re.compile(r'"text"\s*:\s*"')
 
 T = TypeVar("T", bound=TypeBuilder)
 B = TypeVar("B")
 
 
-def get_cache_path() -> str:
-    cache_path = Path(".cache") / "mcp_cli_cache"
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    return str(cache_path)
-
-
-def _make_cache_key(*args) -> str:
-    # Deterministically hash the arguments for a cache key
-    key_str = json.dumps(args, sort_keys=True, default=str)
-    return hashlib.sha256(key_str.encode("utf-8")).hexdigest()
+def _resolve_cache(cache: bool | McpCache | None) -> McpCache | None:  # noqa: FBT001
+    if isinstance(cache, McpCache):
+        return cache
+    return get_default_mcp_cache() if cache else None
 
 
 def normalize_action_id(action_id):
@@ -50,13 +66,26 @@ def normalize_action_id(action_id):
 NO_SILENT_TYPEBUILDER_OVERWRITE = True
 
 
+@dataclass(frozen=True, slots=True)
+class _BamlCallOptions:
+    """The options of one `ActionRunner.b_(...)` call."""
+
+    return_class: "str | type[BaseModel] | None" = None
+    tb: TypeBuilder | None = None
+    include: Callable[[McpToolDefinition], bool] | None = None
+
+
 class ActionRunner(Generic[T, B]):
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         tbc: type[T],
         *,
         b: B | None = None,
-        cache: bool | None = None,
+        cache: bool | McpCache | None = None,
+        max_tool_workers: int = 8,
+        prompt_cfg: BamlToolPromptConfig | None = None,
+        result_limits: ResultLimits | None = None,
+        verify_mcptools: bool | None = None,
     ):
         self._original_baml_client = b
         self._baml_client = (
@@ -69,16 +98,35 @@ class ActionRunner(Generic[T, B]):
         )
         self._actions = []
         self._tool_to_function = {}
-        self._cache = False if cache is None else cache
+        self._async_tools: set[str] = set()
+        self._tool_timeouts_s: dict[str, float] = {}
+        self._cache = _resolve_cache(cache)
         self._tb_cls = tbc
-
-        self._teleport_baml_class = None
-        self._teleport_tb = None
-        self._teleport_include = None
+        self._sessions: dict[str, McpStdioSession] = {}
+        self._max_tool_workers = max_tool_workers
+        self._executor: ThreadPoolExecutor | None = None
+        # Tools of slow MCP servers are registered from a background thread
+        self._register_lock = threading.Lock()
+        # Bumped whenever the tool set changes, invalidating the tool index
+        self._tool_set_version = 0
+        # Converts each tool once, see `tb`
+        self._prompt_cfg = prompt_cfg or BamlToolPromptConfig()
+        self._tbo = incremental_orchestrator(self._prompt_cfg)
+        self._tool_index: tuple[int, ToolIndex] | None = None
+        # Applied to every tool result returned by `run`/`arun`
+        self._result_limits = result_limits or ResultLimits()
+        # None leaves it to BAML_AGENTS_MCPTOOLS_VERIFY, see find_mcptools_binary
+        self._verify_mcptools = verify_mcptools
 
     def _mutate_baml_function_args_kwargs(
-        self, args, kwargs, baml_function_return_type_name
+        self,
+        args,
+        kwargs,
+        baml_function_return_type_name,
+        *,
+        call: "_BamlCallOptions | None" = None,
     ):
+        call = call or _BamlCallOptions()
         tb = None
         baml_options = None
         baml_options_args_i = None
@@ -91,23 +139,17 @@ class ActionRunner(Generic[T, B]):
             if isinstance(v, dict) and "tb" in v and isinstance(v["tb"], TypeBuilder):
                 baml_options = v
                 tb = v["tb"]
-        if tb and self._teleport_tb:
+        if tb and call.tb:
             raise ValueError(
                 """Both baml_options={"tb": tb) and .b_(tb=tb) are set. Please use only one."""
             )
-        tb = tb or self._teleport_tb or self._tb_cls()  # type: ignore
+        tb = tb or call.tb or self._tb_cls()  # type: ignore
 
         baml_function_return_type_name = (
-            self._teleport_baml_class or baml_function_return_type_name
+            call.return_class or baml_function_return_type_name
         )
 
-        tb = self.tb(
-            baml_function_return_type_name, tb=tb, include=self._teleport_include
-        )  # type: ignore
-
-        self._teleport_baml_class = None
-        self._teleport_tb = None
-        self._teleport_include = None
+        tb = self.tb(baml_function_return_type_name, tb=tb, include=call.include)  # type: ignore
 
         baml_options = {**(baml_options or {}), "tb": tb}
         if baml_options_args_i:
@@ -146,10 +188,17 @@ class ActionRunner(Generic[T, B]):
                 "Field not set. Please pass argument `b=b` (BAML Client) to the constructor, for example: ActionRunner(..., b=b)."
             )
 
-        self._teleport_baml_class = return_class
-        self._teleport_tb = tb
-        self._teleport_include = include
-        return self._baml_client  # type: ignore
+        if return_class is None and tb is None and include is None:
+            return self._baml_client  # type: ignore
+        # The options are bound to the returned client, not stored on the
+        # runner, so concurrent tasks can share it
+        call = _BamlCallOptions(return_class=return_class, tb=tb, include=include)
+        return PassthroughWrapper(
+            self._original_baml_client,
+            mutate_args_kwargs=functools.partial(
+                self._mutate_baml_function_args_kwargs, call=call
+            ),
+        )  # type: ignore
 
     def add_from_mcp_server(
         self,
@@ -157,58 +206,361 @@ class ActionRunner(Generic[T, B]):
         *,
         include: Callable[[McpToolDefinition], bool] | None = None,
         env: dict | None = None,
+        persistent: bool = False,
+        timeout_s: float | None = None,
     ):
-        tools = list_tools(server, cache=self._cache, env=env)
-        for t in tools:
-            if include and not include(t):
-                continue
-            if t.name in self._tool_to_function:
-                raise ValueError(
-                    f"Tool {t.name} already exists in the tool to function map."
+        """
+        Registers the tools of an MCP server.
+
+        With `persistent=True` the server is started once and kept running for
+        all `list_tools`/`call_tool` requests, instead of spawning `mcptools`
+        (and with it the server) for every tool call. Call `close()` to stop it.
+        `timeout_s` limits the runtime of each tool call in `arun`.
+        """
+        session = self._session(server, env) if persistent else None
+        tools = list_tools(
+            server,
+            cache=self._cache,
+            env=env,
+            session=session,
+            verify_mcptools=self._verify_mcptools,
+        )
+        self._register_mcp_tools(
+            server,
+            tools,
+            include=include,
+            env=env,
+            session=session,
+            timeout_s=timeout_s,
+        )
+
+    def add_from_mcp_servers(  # noqa: PLR0913
+        self,
+        servers: Sequence[str],
+        *,
+        include: Callable[[McpToolDefinition], bool] | None = None,
+        env: dict | None = None,
+        persistent: bool = False,
+        timeout_s: float | None = None,
+        wait_s: float | None = None,
+    ) -> McpDiscoveryReport:
+        """
+        Registers the tools of several MCP servers, listing them concurrently
+        instead of starting one server after the other. Arguments are as for
+        `add_from_mcp_server`.
+
+        Tools are registered in the order of `servers`, so duplicate names are
+        reported like with consecutive `add_from_mcp_server` calls: the first
+        server done in time with a duplicate raises, after all servers done in
+        time are registered and reported. A server listed twice raises before
+        any is started. Servers that fail to list their tools are reported
+        rather than raised.
+
+        Servers that take longer than `wait_s` finish in the background: their
+        tools are registered once listed (their duplicates are reported, not
+        raised). The returned report has the latency of each server.
+        """
+        servers = list(servers)
+        if repeated := sorted(s for s, n in Counter(servers).items() if n > 1):
+            raise ValueError(f"MCP servers listed more than once: {repeated}")
+        report = McpDiscoveryReport(servers)
+        if not servers:
+            return report
+        executor = ThreadPoolExecutor(len(servers), thread_name_prefix="mcp-discovery")
+        futures = {
+            server: executor.submit(
+                self._discover_mcp_server, server, env=env, persistent=persistent
+            )
+            for server in servers
+        }
+        # Lets the threads exit once done, without waiting for them here
+        executor.shutdown(wait=False)
+        done, _ = wait_futures(futures.values(), timeout=wait_s)
+
+        def register(server: str, future: Future) -> ValueError | None:
+            """Registers and reports a server, returns its duplicate error."""
+            tools, session, latency_s, error = future.result()
+            logger.debug("Listed MCP server tools", server=server, latency_s=latency_s)
+            count = 0
+            duplicate = None
+            if error is None:
+                try:
+                    count = self._register_mcp_tools(
+                        server,
+                        tools,
+                        include=include,
+                        env=env,
+                        session=session,
+                        timeout_s=timeout_s,
+                    )
+                except ValueError as e:
+                    error = duplicate = e
+            if error is not None:
+                logger.warning(
+                    "MCP server discovery failed", server=server, error=error
                 )
-            # Use self._cache to control call_tool caching
-            self._tool_to_function[normalize_action_id(t.name)] = (
-                lambda params, t=t, env=env: call_tool(
-                    t.name,
-                    params,
+            report._set(  # noqa: SLF001
+                McpServerDiscovery(
                     server,
-                    cache=self._cache,
-                    env=env,
+                    "ok" if error is None else "error",
+                    latency_s=latency_s,
+                    tool_count=count,
+                    error=error,
                 )
             )
-            self._actions.append(t)
+            return duplicate
+
+        # The servers done in time are registered first, in the order of
+        # `servers`, before any late one can be registered by its callback
+        duplicates = [register(s, f) for s, f in futures.items() if f in done]
+        for server, future in futures.items():
+            if future not in done:
+                future.add_done_callback(lambda f, server=server: register(server, f))
+        if first := next((e for e in duplicates if e is not None), None):
+            raise first
+        return report
+
+    def _session(self, server: str, env: dict | None) -> McpStdioSession:
+        with self._register_lock:
+            session = self._sessions.get(server)
+            if session is None:
+                session = self._sessions[server] = McpStdioSession(server, env=env)
+            return session
+
+    def _discover_mcp_server(
+        self, server: str, *, env: dict | None, persistent: bool
+    ) -> tuple[
+        list[McpToolDefinition], McpStdioSession | None, float, Exception | None
+    ]:
+        start = time.perf_counter()
+        tools, session, error = [], None, None
+        try:
+            session = self._session(server, env) if persistent else None
+            tools = list_tools(
+                server,
+                cache=self._cache,
+                env=env,
+                session=session,
+                verify_mcptools=self._verify_mcptools,
+            )
+        except Exception as e:  # noqa: BLE001
+            error = e
+        return tools, session, time.perf_counter() - start, error
 
-    def add_action(self, action: type[Action], handler=None):
-        definition = action.get_mcp_definition()
-        definition.name = normalize_action_id(definition.name)
-        name = definition.name
-        self._actions.append(definition)
-        if name in self._tool_to_function:
-            raise ValueError(f"Tool {name} already exists in the tool to function map.")
-        self._tool_to_function[name] = handler or (
-            lambda params: action(**params).run()
+    def _register_mcp_tools(  # noqa: PLR0913
+        self,
+        server: str,
+        tools: list[McpToolDefinition],
+        *,
+        include: Callable[[McpToolDefinition], bool] | None,
+        env: dict | None,
+        session: McpStdioSession | None,
+        timeout_s: float | None,
+    ) -> int:
+        if include is not None:
+            tools = [t for t in tools if include(t)]
+        names = [normalize_action_id(t.name) for t in tools]
+        with self._register_lock:
+            # Checked before registering any, so a duplicate changes nothing
+            seen = set(self._tool_to_function)
+            for t, name in zip(tools, names, strict=True):
+                if name in seen:
+                    raise ValueError(
+                        f"Tool {t.name} already exists in the tool to function map."
+                    )
+                seen.add(name)
+            for t, name in zip(tools, names, strict=True):
+                # Use self._cache to control call_tool caching
+                self._tool_to_function[name] = lambda params, t=t, env=env: (
+                    self._call_mcp_tool(
+                        t.name, params, server, env=env, session=session
+                    )
+                )
+                if timeout_s is not None:
+                    self._tool_timeouts_s[name] = timeout_s
+                self._actions.append(t)
+                self._tool_set_version += 1
+        return len(tools)
+
+    def _call_mcp_tool(
+        self,
+        tool: str,
+        params: dict[str, object],
+        server: str,
+        *,
+        env: dict | None,
+        session: McpStdioSession | None,
+    ) -> object:
+        return call_tool(
+            tool,
+            params,
+            server,
+            cache=self._cache,
+            env=env,
+            session=session,
+            max_output_bytes=self._result_limits.max_response_bytes,
+            verify_mcptools=self._verify_mcptools,
         )
 
+    def add_action(
+        self, action: type[Action], handler=None, *, timeout_s: float | None = None
+    ):
+        """
+        Registers a local action. `action.run` (or `handler`) may be async, it
+        is then awaited by `arun`. `timeout_s` limits its runtime in `arun`.
+        """
+        definition = action.get_mcp_definition()
+        name = normalize_action_id(definition.name)
+        if name != definition.name:
+            definition = definition.model_copy(update={"name": name})
+        with self._register_lock:
+            if name in self._tool_to_function:
+                raise ValueError(
+                    f"Tool {name} already exists in the tool to function map."
+                )
+            if inspect.iscoroutinefunction(handler or action.run):
+                self._async_tools.add(name)
+            if timeout_s is not None:
+                self._tool_timeouts_s[name] = timeout_s
+            self._tool_to_function[name] = handler or (
+                lambda params: action(**params).run()
+            )
+            self._actions.append(definition)
+            self._tool_set_version += 1
+
     def state(self) -> dict[str, Any]: ...
 
+    def close(self) -> None:
+        """
+        Stops the MCP servers started with `persistent=True` and the worker
+        threads of `arun`.
+        """
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
     def run(self, result: Any) -> Any:
         result = cast("BaseModel", result)
         action = result.model_dump()["chosen_action"]
+        action_id, action_params = self._parse_action(action)
+        if action_id in self._async_tools:
+            raise TypeError(
+                f"Action {action_id} is async, use `await ActionRunner.arun(...)`."
+            )
+
+        return _to_result(
+            self._tool_to_function[action_id](action_params), self._result_limits
+        )
+
+    async def arun(
+        self, result: Any, *, timeout_s: float | None = None
+    ) -> Result | list[Result]:
+        """
+        Async version of `run`. Async actions are awaited, blocking ones (like
+        MCP tool calls) run in a thread pool of `max_tool_workers` threads, so
+        they don't block the event loop.
+
+        If `chosen_action` is a list, the actions run concurrently and their
+        results are returned in the same order; an action that raises yields an
+        error Result instead of failing the others. An action that runs longer
+        than its timeout (`timeout_s` of `add_action`, else `timeout_s`) yields
+        an error Result. Its thread is not interrupted, only no longer awaited.
+        """
+        result = cast("BaseModel", result)
+        chosen = result.model_dump()["chosen_action"]
+        if not isinstance(chosen, list):
+            return await self._arun_action(
+                *self._parse_action(chosen), timeout_s=timeout_s
+            )
+        actions = [self._parse_action(a) for a in chosen]
+        outputs = await asyncio.gather(
+            *(self._arun_action(*a, timeout_s=timeout_s) for a in actions),
+            return_exceptions=True,
+        )
+        results = []
+        for (action_id, _), output in zip(actions, outputs, strict=True):
+            if isinstance(output, Exception):
+                logger.warning("Action failed", action_id=action_id, error=output)
+                results.append(
+                    Result(content=f"Action {action_id} failed: {output!r}", error=True)
+                )
+            elif isinstance(output, BaseException):
+                raise output
+            else:
+                results.append(output)
+        return results
+
+    async def _arun_action(
+        self,
+        action_id: str,
+        action_params: dict[str, Any],
+        *,
+        timeout_s: float | None,
+    ) -> Result:
+        handler = self._tool_to_function[action_id]
+        if action_id in self._async_tools:
+            call = handler(action_params)
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self._max_tool_workers, thread_name_prefix="baml-agents-tool"
+                )
+            call = asyncio.get_running_loop().run_in_executor(
+                self._executor, handler, action_params
+            )
+        timeout_s = self._tool_timeouts_s.get(action_id, timeout_s)
+        try:
+            output = await asyncio.wait_for(call, timeout_s)
+        except TimeoutError:
+            return Result(
+                content=f"Action {action_id} timed out after {timeout_s}s",
+                error=True,
+            )
+        return _to_result(output, self._result_limits)
+
+    def _parse_action(self, action: dict[str, Any]) -> tuple[str, dict[str, Any]]:
         action_id = action["action_id"]
         action_params = {k: v for k, v in action.items() if k != "action_id"}
         if action_id not in self._tool_to_function:
             raise ValueError(
                 f"Action {action_id} not found in the tool to function map."
             )
-
-        result = self._tool_to_function[action_id](action_params)
-        if isinstance(result, Result):
-            return result
-        return Result.from_mcp_schema(result)
+        return action_id, action_params
 
     @property
-    def actions(self):
-        return deepcopy(self._actions)
+    def actions(self) -> SequenceView[McpToolDefinition]:
+        """The registered definitions, a read-only view (they're read-only too)."""
+        return SequenceView(self._actions)
+
+    def relevant_actions(
+        self,
+        query: str,
+        *,
+        top_k: int = 10,
+        always_include: Sequence[str] = (),
+    ) -> Callable[[McpToolDefinition], bool]:
+        """
+        Returns an `include` filter that keeps the `top_k` actions most relevant
+        to `query` (e.g. the goal and recent interactions), ranked by a local
+        BM25 `ToolIndex`, plus the actions named in `always_include`:
+
+            runner.b_(include=runner.relevant_actions(goal, always_include=["stop"]))
+        """
+        version = self._tool_set_version
+        if self._tool_index is None or self._tool_index[0] != version:
+            self._tool_index = (version, ToolIndex(self._actions))
+        return self._tool_index[1].include(
+            query, top_k=top_k, always_include=always_include
+        )
 
     def tb(
         self,
@@ -227,57 +579,257 @@ class ActionRunner(Generic[T, B]):
         actions = self._actions
         if include is not None:
             actions = [a for a in actions if include(a)]
-        return add_available_actions(field_name, actions, tb)
+        # Converting the tool schemas is the expensive part, so it's done once
+        # per tool and only replayed onto the TypeBuilder of each call
+        return add_available_actions(field_name, actions, tb, tbo=self._tbo)
+
+    def estimate_prompt_tokens(
+        self,
+        *,
+        include: Callable[[McpToolDefinition], bool] | None = None,
+    ) -> dict[str, int]:
+        """
+        Estimated prompt tokens per action, to see which ones are worth a
+        `BamlToolPromptConfig(compaction=...)` or leaving out via `include`.
+        """
+        actions = self._actions
+        if include is not None:
+            actions = [a for a in actions if include(a)]
+        return estimate_prompt_tokens(actions, self._prompt_cfg)
+
+
+def _to_result(output: Any, limits: ResultLimits) -> Result:
+    if isinstance(output, Result):
+        return limits.apply(output)
+    return Result.from_mcp_schema(output, limits=limits)
 
 
 def list_tools(
-    server: str, *, cache: bool = False, env: dict | None = None
+    server: str,
+    *,
+    cache: bool | McpCache | None = False,
+    env: dict | None = None,
+    session: McpStdioSession | None = None,
+    verify_mcptools: bool | None = None,
 ) -> list[McpToolDefinition]:
-    cache_key = _make_cache_key("list_tools", server)
-    mcpt_binpath = find_mcptools_binary()
-    if cache:
-        with _shelve_lock, shelve.open(get_cache_path()) as cache_db:  # noqa: S301
-            if cache_key in cache_db:
-                mcp_schema = cache_db[cache_key]
-            else:
-                command = f"{mcpt_binpath} tools {server} --format json"
-                mcp_schema = _run_cli_command(command, env=env)
-                cache_db[cache_key] = mcp_schema
+    """
+    Lists the tools of an MCP server. `cache=True` uses the default on-disk
+    cache shared by all processes in the working dir, or pass an `McpCache`.
+    `verify_mcptools` is passed to `find_mcptools_binary(verify=...)`.
+    """
+
+    def compute() -> str:
+        return _list_tools(
+            server, env=env, session=session, verify_mcptools=verify_mcptools
+        )
+
+    if (mcp_cache := _resolve_cache(cache)) is not None:
+        mcp_schema = mcp_cache.get_or_compute(server, "list_tools", {}, compute)
     else:
-        command = f"{mcpt_binpath} tools {server} --format json"
-        mcp_schema = _run_cli_command(command, env=env)
+        mcp_schema = compute()
     return McpToolDefinition.from_mcp_schema(mcp_schema)
 
 
-def call_tool(
+def _list_tools(
+    server: str,
+    *,
+    env: dict | None,
+    session: McpStdioSession | None,
+    verify_mcptools: bool | None,
+) -> str:
+    if session is not None:
+        return json.dumps(session.list_tools())
+    mcpt_binpath = find_mcptools_binary(verify=verify_mcptools)
+    command = f"{mcpt_binpath} tools {server} --format json"
+    return _run_cli_command(command, env=env)
+
+
+def call_tool(  # noqa: PLR0913
     tool: str,
     params: dict[str, object],
     server: str,
     *,
-    cache: bool = False,
+    cache: bool | McpCache | None = False,
     env: dict | None = None,
+    session: McpStdioSession | None = None,
+    max_output_bytes: int | None = None,
+    verify_mcptools: bool | None = None,
 ) -> object:
+    """
+    Calls a tool of an MCP server and returns its MCP result. The text items of
+    the result are cut to `max_output_bytes` in total, noted by
+    `Result.from_mcp_schema`. `verify_mcptools` is passed to
+    `find_mcptools_binary(verify=...)`.
+
+    The raw `mcptools` output is read no further than a multiple of
+    `max_output_bytes` (JSON escaping makes it longer than the text it holds);
+    the text items are then recovered from the part read. A persistent
+    `session` reads the whole response before it is cut.
+    """
     params_json = json.dumps(params, sort_keys=True)
-    cache_key = _make_cache_key("call_tool", tool, params_json, server)
-    mcpt_binpath = find_mcptools_binary()
-    if cache:
-        with _shelve_lock, shelve.open(get_cache_path()) as cache_db:  # noqa: S301
-            if cache_key in cache_db:
-                output = cache_db[cache_key]
-            else:
-                params_suffix = f" -p '{params_json}'" if params_json else ""
-                command = (
-                    f"{mcpt_binpath} call {tool}{params_suffix} {server} --format json"
-                )
-                output = _run_cli_command(command, env=env)
-                cache_db[cache_key] = output
+
+    def compute() -> str:
+        output = _call_tool(
+            tool,
+            params,
+            params_json,
+            server,
+            env=env,
+            session=session,
+            max_output_bytes=max_output_bytes,
+            verify_mcptools=verify_mcptools,
+        )
+        return _cap_output(output, max_output_bytes)
+
+    if (mcp_cache := _resolve_cache(cache)) is not None:
+        key: dict[str, object] = {"tool": tool, "params": params}
+        if max_output_bytes is not None:
+            # A result cut under one cap can't be served under another
+            key["max_output_bytes"] = max_output_bytes
+        output = mcp_cache.get_or_compute(server, "call_tool", key, compute)
     else:
-        params_suffix = f" -p '{params_json}'" if params_json else ""
-        command = f"{mcpt_binpath} call {tool}{params_suffix} {server} --format json"
-        output = _run_cli_command(command, env=env)
+        output = compute()
     return json.loads(output)
 
 
+def _call_tool(  # noqa: PLR0913
+    tool: str,
+    params: dict[str, object],
+    params_json: str,
+    server: str,
+    *,
+    env: dict | None,
+    session: McpStdioSession | None,
+    max_output_bytes: int | None,
+    verify_mcptools: bool | None,
+) -> str:
+    if session is not None:
+        return json.dumps(session.call_tool(tool, params))
+    mcpt_binpath = find_mcptools_binary(verify=verify_mcptools)
+    params_suffix = f" -p '{params_json}'" if params_json else ""
+    command = f"{mcpt_binpath} call {tool}{params_suffix} {server} --format json"
+    if max_output_bytes is not None:
+        return _stream_cli_command(
+            command, env=env, max_output_bytes=_raw_output_limit(max_output_bytes)
+        )
+    return _run_cli_command(command, env=env)
+
+
+def _raw_output_limit(max_output_bytes: int) -> int:
+    """How much raw JSON output is read for `max_output_bytes` of text."""
+    return _RAW_OUTPUT_FACTOR * max_output_bytes + _STREAM_CHUNK_BYTES
+
+
+def _cap_output(output: str, max_output_bytes: int | None) -> str:
+    if max_output_bytes is None:
+        return output
+    try:
+        result = json.loads(output)
+    except json.JSONDecodeError:
+        if len(output.encode()) <= _raw_output_limit(max_output_bytes):
+            raise
+        # Only the streaming path cuts the raw output, mid-document
+        content = [{"type": "text", "text": t} for t in _text_items(output)]
+        result = _cap_result({"content": content, "isError": False}, max_output_bytes)
+        return json.dumps({**result, TRUNCATED_AT_BYTES: max_output_bytes})
+    return json.dumps(_cap_result(result, max_output_bytes))
+
+
+def _text_items(output: str) -> list[str]:
+    """The text items of an MCP result cut off mid-document, the last one cut."""
+    texts = []
+    for match in _TEXT_FIELD.finditer(output):
+        try:
+            text, _ = json.decoder.scanstring(output, match.end())
+        except json.JSONDecodeError:
+            texts.append(_cut_json_string(output[match.end() :]))
+            break
+        texts.append(text)
+    return texts
+
+
+def _cut_json_string(fragment: str) -> str:
+    # Closes the string, dropping an escape sequence cut in half
+    for end in range(len(fragment), max(-1, len(fragment) - 6), -1):
+        try:
+            return json.decoder.scanstring(fragment[:end] + '"', 0)[0]
+        except json.JSONDecodeError:
+            continue
+    return ""
+
+
+def _cap_result(result: Any, max_output_bytes: int) -> Any:
+    """
+    Truncates the text items of a parsed MCP result to `max_output_bytes` in
+    total, in order. Other content items are kept as they are.
+    """
+    if not isinstance(result, dict) or not isinstance(result.get("content"), list):
+        return result
+    remaining = max_output_bytes
+    content = []
+    truncated = False
+    for item in result["content"]:
+        if not isinstance(item, dict) or item.get("type") != "text":
+            content.append(item)
+            continue
+        encoded = item["text"].encode()
+        if len(encoded) > remaining:
+            truncated = True
+            if remaining == 0:
+                continue
+            text = encoded[:remaining].decode(errors="ignore")
+            item = {**item, "text": text}  # noqa: PLW2901
+            encoded = encoded[:remaining]
+        remaining -= len(encoded)
+        content.append(item)
+    if not truncated:
+        return result
+    return {**result, "content": content, TRUNCATED_AT_BYTES: max_output_bytes}
+
+
+def _stream_cli_command(
+    command: str | Sequence[str], *, env: dict | None, max_output_bytes: int
+) -> str:
+    """
+    Like `_run_cli_command`, but reads stdout as it is written and stops the
+    process once it exceeds `max_output_bytes`, instead of buffering it all.
+    The output read until then is returned, see `_cap_output`.
+    """
+    if isinstance(command, str):
+        command = shlex.split(command)
+    logger.debug("Streaming CLI command", command=command)
+    stdout = bytearray()
+    stderr: list[bytes] = []
+    with subprocess.Popen(  # noqa: S603
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env={**(env or {}), **os.environ},
+    ) as process:
+        # Drained concurrently so a chatty stderr can't block the process
+        stderr_reader = threading.Thread(
+            target=lambda: stderr.append(process.stderr.read()),  # type: ignore[union-attr]
+            name="cli-stderr",
+            daemon=True,
+        )
+        stderr_reader.start()
+        while chunk := process.stdout.read1(_STREAM_CHUNK_BYTES):  # type: ignore[union-attr]
+            stdout += chunk
+            if len(stdout) > max_output_bytes:
+                process.kill()
+                break
+        stderr_reader.join()
+        returncode = process.wait()
+    if len(stdout) > max_output_bytes:
+        # Killed, its exit code and stderr don't tell whether the tool failed
+        return stdout.decode(errors="ignore")
+    if stderr_text := b"".join(stderr).decode(errors="replace").strip():
+        raise RuntimeError(f"[stderr] (exit code {returncode})\n{stderr_text}")
+    if returncode != 0:
+        raise RuntimeError(f"Command failed with exit code {returncode}")
+    return stdout.decode().strip()
+
+
 def _run_cli_command(command: str | Sequence[str], *, env: dict | None = None) -> str:
     if isinstance(command, str):
         command = shlex.split(command)
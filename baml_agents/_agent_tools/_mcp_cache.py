@@ -0,0 +1,117 @@
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from baml_agents._utils._cache_store import (
+    CacheStore,
+    MemoryCacheStore,
+    SqliteCacheStore,
+    TieredCacheStore,
+)
+from baml_agents._utils._canonical_key import canonical_params_key
+
+
+@dataclass(frozen=True, slots=True)
+class McpCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class McpCache:
+    """
+    Caches the raw results of MCP `list_tools`/`call_tool` requests.
+
+    Entries are namespaced per server (the server command line unless
+    `namespace` is given), and hits/misses are counted per namespace. The store
+    is only touched for the lookup and the write: the MCP request itself runs
+    without holding any lock, so concurrent tool calls don't wait for each
+    other. Two concurrent misses for the same key both run the request.
+    """
+
+    def __init__(self, store: CacheStore | None = None, *, ttl_s: float | None = None):
+        self._store = store if store is not None else MemoryCacheStore()
+        self._ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._stats: dict[str, McpCacheStats] = {}
+
+    @classmethod
+    def on_disk(
+        cls,
+        path: str | Path,
+        *,
+        ttl_s: float | None = None,
+        max_entries: int = 10_000,
+        max_memory_entries: int = 1024,
+    ) -> "McpCache":
+        """
+        An in-memory LRU in front of a SQLite file, which can be shared by
+        several processes.
+        """
+        return cls(
+            TieredCacheStore(
+                MemoryCacheStore(max_entries=max_memory_entries, ttl_s=ttl_s),
+                SqliteCacheStore(path, max_entries=max_entries, ttl_s=ttl_s),
+            ),
+            ttl_s=ttl_s,
+        )
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        request: str,
+        params: dict[str, object],
+        compute: Callable[[], str],
+    ) -> str:
+        key = canonical_params_key(
+            request, {"namespace": namespace, "params": params}, exclude=frozenset()
+        )
+        hit, value = self._store.get(key)
+        self._count(namespace, hit=hit)
+        if hit:
+            return value
+        value = compute()
+        self._store.set(key, value, ttl_s=self._ttl_s)
+        return value
+
+    def stats(self, namespace: str | None = None) -> McpCacheStats:
+        """The hits and misses of one namespace, or of all if none is given."""
+        with self._lock:
+            if namespace is not None:
+                return self._stats.get(namespace, McpCacheStats())
+            return McpCacheStats(
+                hits=sum(s.hits for s in self._stats.values()),
+                misses=sum(s.misses for s in self._stats.values()),
+            )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def _count(self, namespace: str, *, hit: bool) -> None:
+        with self._lock:
+            stats = self._stats.get(namespace, McpCacheStats())
+            self._stats[namespace] = McpCacheStats(
+                hits=stats.hits + hit, misses=stats.misses + (not hit)
+            )
+
+
+_default_cache: McpCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_mcp_cache() -> McpCache:
+    """The cache used for `cache=True`, stored under `.cache/` of the working dir."""
+    global _default_cache  # noqa: PLW0603
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = McpCache.on_disk(Path(".cache") / "mcp_cache.sqlite")
+        return _default_cache
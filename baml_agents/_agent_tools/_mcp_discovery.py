@@ -0,0 +1,62 @@
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Literal
+
+
+@dataclass(frozen=True, slots=True)
+class McpServerDiscovery:
+    server: str
+    status: Literal["pending", "ok", "error"] = "pending"
+    latency_s: float | None = None
+    tool_count: int = 0
+    error: Exception | None = None
+
+
+class McpDiscoveryReport:
+    """
+    Outcome of `ActionRunner.add_from_mcp_servers` per server: how long its
+    tools took to list and how many were registered.
+
+    Servers that were still starting when the call returned are "pending";
+    they finish in the background and are updated here once their tools are
+    registered.
+    """
+
+    def __init__(self, servers: Iterable[str]):
+        self._changed = threading.Condition()
+        self._results = {s: McpServerDiscovery(s) for s in servers}
+
+    @property
+    def servers(self) -> dict[str, McpServerDiscovery]:
+        with self._changed:
+            return dict(self._results)
+
+    @property
+    def pending(self) -> list[str]:
+        return [s for s, r in self.servers.items() if r.status == "pending"]
+
+    @property
+    def errors(self) -> dict[str, Exception]:
+        return {s: r.error for s, r in self.servers.items() if r.error is not None}
+
+    def wait(self, timeout_s: float | None = None) -> bool:
+        """Waits for the pending servers, returns False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: all(r.status != "pending" for r in self._results.values()),
+                timeout=timeout_s,
+            )
+
+    def _set(self, result: McpServerDiscovery) -> None:
+        with self._changed:
+            self._results[result.server] = result
+            self._changed.notify_all()
+
+    def __str__(self) -> str:
+        lines = []
+        for r in self.servers.values():
+            latency = "-" if r.latency_s is None else f"{r.latency_s:.2f}s"
+            detail = f"{r.tool_count} tools" if r.error is None else repr(r.error)
+            lines.append(f"{r.status:<8} {latency:>8}  {r.server}  ({detail})")
+        return "\n".join(lines)
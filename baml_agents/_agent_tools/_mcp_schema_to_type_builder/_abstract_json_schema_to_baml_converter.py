@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Any
 
 from baml_py.baml_py import FieldType
@@ -17,3 +18,11 @@ class AbstractJsonSchemaToBamlConverter(ABC):
     ) -> FieldType:
         """Parse the entire root schema into a FieldType."""
 
+    def convert_many(
+        self,
+        schemas: Sequence[dict[str, Any]],
+        tb: TypeBuilder,
+    ) -> list[FieldType]:
+        """Parse several root schemas into the same TypeBuilder."""
+        return [self.convert(schema, tb) for schema in schemas]
+
@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 
+from ._schema_compaction import SchemaCompaction
+
 
 @dataclass(frozen=True)
 class BamlToolPromptConfig:
@@ -11,4 +13,7 @@ class BamlToolPromptConfig:
         default="chosen_action",
         metadata={"description": "Field name for tools collection"},
     )
-
+    compaction: SchemaCompaction | None = field(
+        default=None,
+        metadata={"description": "Shortens the tool schemas put into the prompt"},
+    )
@@ -1,16 +1,29 @@
 from ._baml_tool_prompt_config import BamlToolPromptConfig
+from ._incremental_type_builder_orchestrator import IncrementalTypeBuilderOrchestrator
 from ._json_schema_to_baml_converter import JsonSchemaToBamlConverter
+from ._prompt_size import estimate_tokens, render_output_format
 from ._tool_to_baml_type import ToolToBamlType
 from ._type_builder_orchestrator import TypeBuilderOrchestrator
+from ._type_builder_recipe import RecordingTypeBuilder
 
 
-def add_available_actions(output_class: str, tools, tb, cfg=None):
-    prompt_cfg = cfg or BamlToolPromptConfig()
+def _tool_converter():
     schema_converter = JsonSchemaToBamlConverter()
-    tool_converter = ToolToBamlType(schema_converter=schema_converter)
-    tbo = TypeBuilderOrchestrator(
-        tool_converter=tool_converter,
-        prompt_cfg=prompt_cfg,
+    return ToolToBamlType(schema_converter=schema_converter)
+
+
+def incremental_orchestrator(cfg=None) -> IncrementalTypeBuilderOrchestrator:
+    """An orchestrator to reuse across `add_available_actions` calls."""
+    return IncrementalTypeBuilderOrchestrator(
+        tool_converter=_tool_converter(),
+        prompt_cfg=cfg or BamlToolPromptConfig(),
+    )
+
+
+def add_available_actions(output_class: str, tools, tb, cfg=None, *, tbo=None):
+    tbo = tbo or TypeBuilderOrchestrator(
+        tool_converter=_tool_converter(),
+        prompt_cfg=cfg or BamlToolPromptConfig(),
     )
     field = getattr(tb, output_class, None)
     if field is None:
@@ -22,3 +35,24 @@ def add_available_actions(output_class: str, tools, tb, cfg=None):
     )
     return tb
 
+
+def estimate_prompt_tokens(tools, cfg=None) -> dict[str, int]:
+    """
+    Estimates the prompt tokens each tool adds to the output format, after
+    `cfg.compaction`. Definitions shared by several tools are counted for
+    each of them.
+    """
+    cfg = cfg or BamlToolPromptConfig()
+    converter = _tool_converter()
+    estimates = {}
+    for tool in tools:
+        compacted = (
+            tool if cfg.compaction is None else cfg.compaction.compact_tool(tool)
+        )
+        root = converter.convert(
+            tool=compacted,
+            tb=RecordingTypeBuilder(),  # type: ignore[arg-type]
+            baml_tool_id_field=cfg.id_field,
+        )
+        estimates[tool.name] = estimate_tokens(render_output_format(root))
+    return estimates
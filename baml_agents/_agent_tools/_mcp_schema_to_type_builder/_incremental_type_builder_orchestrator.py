@@ -0,0 +1,94 @@
+import json
+from collections.abc import Iterable
+from typing import TypeVar
+
+from baml_py.baml_py import FieldType
+from baml_py.type_builder import TypeBuilder
+
+from baml_agents._agent_tools._tool_definition import McpToolDefinition
+from baml_agents._utils._freeze import thaw
+from baml_agents._utils._lru_cache import LruCache
+
+from ._baml_tool_prompt_config import BamlToolPromptConfig
+from ._tool_to_baml_type import AbstractToolToBamlType
+from ._type_builder_recipe import RecordingTypeBuilder, TypeBuilderRecipe
+
+T = TypeVar("T", bound=TypeBuilder)
+
+
+class IncrementalTypeBuilderOrchestrator:
+    """
+    Builds the same types as `TypeBuilderOrchestrator`, but converts each tool
+    only once and replays the recorded result onto every following TypeBuilder.
+
+    Adding or removing a tool between calls only converts the added tool. The
+    remaining cost per build is the TypeBuilder calls themselves, which have to
+    be made on every new TypeBuilder.
+
+    Tools are recognized by their name, description and schema, so equal
+    definitions (e.g. listed again from an MCP server) share one conversion.
+    """
+
+    def __init__(
+        self,
+        *,
+        tool_converter: AbstractToolToBamlType,
+        prompt_cfg: BamlToolPromptConfig,
+        max_cached_tools: int = 4096,
+    ):
+        self._converter = tool_converter
+        self._prompt_cfg = prompt_cfg
+        self._recipes: LruCache[str, TypeBuilderRecipe] = LruCache(max_cached_tools)
+        # Spares serializing the schema of the same definition on every build.
+        # The entry keeps the tool alive, so its id isn't reused.
+        self._keys: LruCache[int, tuple[McpToolDefinition, str]] = LruCache(
+            max_cached_tools
+        )
+
+    def build_types(
+        self,
+        tb: T,
+        output_class,
+        *,
+        tools: Iterable[McpToolDefinition],
+    ) -> T:
+        union = self.build_union(tb, tools=tools)
+        output_class.add_property(self._prompt_cfg.tools_field, union)
+        return tb
+
+    def build_union(
+        self,
+        tb: TypeBuilder,
+        *,
+        tools: Iterable[McpToolDefinition],
+    ) -> FieldType:
+        # Shared, so that definitions used by several tools are added once
+        declared: dict = {}
+        return tb.union([self._recipe(t).replay(tb, declared)[0] for t in tools])
+
+    def _recipe(self, tool: McpToolDefinition) -> TypeBuilderRecipe:
+        key = self._key(tool)
+        if (recipe := self._recipes.get(key)) is not None:
+            return recipe
+        recorder = RecordingTypeBuilder()
+        compaction = self._prompt_cfg.compaction
+        root = self._converter.convert(
+            tool=tool if compaction is None else compaction.compact_tool(tool),
+            tb=recorder,  # type: ignore[arg-type]
+            baml_tool_id_field=self._prompt_cfg.id_field,
+        )
+        recipe = recorder.to_recipe([root])  # type: ignore[list-item]
+        self._recipes.set(key, recipe)
+        return recipe
+
+    def _key(self, tool: McpToolDefinition) -> str:
+        entry = self._keys.get(id(tool))
+        if entry is not None and entry[0] is tool:
+            return entry[1]
+        key = json.dumps(
+            [tool.name, tool.description, thaw(tool.parameters_json_schema)],
+            sort_keys=True,
+            default=repr,
+        )
+        self._keys.set(id(tool), (tool, key))
+        return key
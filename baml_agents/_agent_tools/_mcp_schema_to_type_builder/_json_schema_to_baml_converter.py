@@ -1,4 +1,7 @@
+import hashlib
+import json
 import warnings
+from collections.abc import Sequence
 from typing import Any
 
 from baml_py.baml_py import FieldType
@@ -7,6 +10,7 @@ from baml_py.type_builder import TypeBuilder
 from baml_agents._agent_tools._utils._snake_to_pascal import snake_to_pascal
 
 from ._abstract_json_schema_to_baml_converter import AbstractJsonSchemaToBamlConverter
+from ._type_builder_recipe import RecordedType, RecordingTypeBuilder
 
 
 class _RefPlaceholder:
@@ -27,14 +31,39 @@ class JsonSchemaToBamlConverter(AbstractJsonSchemaToBamlConverter):
     ) -> FieldType:
         """Public entry: parses the entire root schema into a FieldType."""
         cache: dict[str, FieldType | _RefPlaceholder] = {}
-        return self._parse(schema, tb, cache, schema)
+        return self._parse(schema, tb, cache, schema, None)
 
-    def _parse(
+    def convert_many(
+        self,
+        schemas: Sequence[dict[str, Any]],
+        tb: TypeBuilder,
+    ) -> list[FieldType]:
+        """
+        Parses several root schemas (e.g. all tools of a server) into the same
+        TypeBuilder.
+
+        Definitions that are structurally identical across the schemas, like a
+        `$defs` entry shared by many tools, are parsed once. Each class and
+        enum is added to the TypeBuilder once, which also keeps them from
+        being repeated in the prompt. If different definitions share a name,
+        the later ones are renamed (`Color2`, ...).
+        """
+        recorder = RecordingTypeBuilder()
+        shared: dict[str, Any] = {}
+        roots = [
+            self._parse(schema, recorder, {}, schema, shared)  # type: ignore[arg-type]
+            for schema in schemas
+        ]
+        return recorder.to_recipe(roots).replay(tb)
+
+    def _parse(  # noqa: PLR0913, PLR0917
         self,
         schema: dict[str, Any],
         tb: TypeBuilder,
         cache: dict[str, FieldType | _RefPlaceholder],
         root_schema: dict[str, Any],
+        shared: dict[str, Any] | None,
+        name_hint: str | None = None,
     ) -> FieldType:
         if "$ref" not in schema and "anyOf" not in schema and "type" not in schema:
             msg = (
@@ -48,21 +77,26 @@ class JsonSchemaToBamlConverter(AbstractJsonSchemaToBamlConverter):
             return tb.string()
 
         if ref := schema.get("$ref"):
-            return self._resolve_ref(ref, tb, cache, root_schema)
+            return self._resolve_ref(ref, tb, cache, root_schema, shared)
 
         if any_of := schema.get("anyOf"):
             return tb.union(
-                [self._parse(sub, tb, cache, root_schema) for sub in any_of],
+                [
+                    self._parse(sub, tb, cache, root_schema, shared, name_hint)
+                    for sub in any_of
+                ],
             )
 
         t = schema.get("type")
-        if isinstance(t, FieldType):
+        if isinstance(t, FieldType | RecordedType):
             return t
         match t:
             case "object":
-                return self._object(schema, tb, cache, root_schema)
+                return self._object(schema, tb, cache, root_schema, shared, name_hint)
             case "array":
-                item_type = self._parse(schema["items"], tb, cache, root_schema)
+                item_type = self._parse(
+                    schema["items"], tb, cache, root_schema, shared, name_hint
+                )
                 return item_type.list()
             case "string":
                 return self._string(schema, tb)
@@ -87,12 +121,14 @@ class JsonSchemaToBamlConverter(AbstractJsonSchemaToBamlConverter):
                 # Improved error message: include the schema snippet for debugging
                 raise ValueError(f"Unsupported type: {other!r} in schema: {schema!r}")
 
-    def _object(
+    def _object(  # noqa: PLR0913, PLR0917
         self,
         schema: dict[str, Any],
         tb: TypeBuilder,
         cache: dict[str, FieldType | _RefPlaceholder],
         root_schema: dict[str, Any],
+        shared: dict[str, Any] | None,
+        name_hint: str | None,
     ) -> FieldType:
         # Warn if additionalProperties is present, since we ignore it
         if "additionalProperties" in schema:
@@ -100,10 +136,23 @@ class JsonSchemaToBamlConverter(AbstractJsonSchemaToBamlConverter):
                 f"JSON Schema 'additionalProperties' is present in object schema but will be ignored: {schema['additionalProperties']!r} (schema title: {schema.get('title')!r})",
                 stacklevel=2,
             )
-        cls = tb.add_class(snake_to_pascal(schema["properties"]["action_id"]["title"]))
+        properties = schema.get("properties", {})
+        if "action_id" in properties:
+            class_name = snake_to_pascal(properties["action_id"]["title"])
+        else:
+            # Nested object: named by its title, $ref or the property holding it
+            class_name = snake_to_pascal(schema.get("title") or name_hint or "Object")
+        cls = tb.add_class(class_name)
         required = set(schema.get("required", []))
-        for name, prop in schema.get("properties", {}).items():
-            field = self._parse(prop, tb, cache, root_schema)
+        for name, prop in properties.items():
+            field = self._parse(
+                prop,
+                tb,
+                cache,
+                root_schema,
+                shared,
+                f"{class_name}{snake_to_pascal(name)}",
+            )
             if name not in required:
                 field = field.optional()
             p = cls.add_property(name, field)
@@ -133,6 +182,7 @@ class JsonSchemaToBamlConverter(AbstractJsonSchemaToBamlConverter):
         tb: TypeBuilder,
         cache: dict[str, FieldType | _RefPlaceholder],
         root_schema: dict[str, Any],
+        shared: dict[str, Any] | None,
     ) -> FieldType:
         if not ref.startswith("#/"):
             raise ValueError(
@@ -146,16 +196,48 @@ class JsonSchemaToBamlConverter(AbstractJsonSchemaToBamlConverter):
                 raise ValueError(f"Circular $ref detected for {ref!r}")
             return val
 
-        # split "#/definitions/Foo" → ["definitions", "Foo"]
-        section, *path = ref.lstrip("#/").split("/")
-        node = root_schema.get(section, {})
-        for key in path:
-            node = node[key]
+        node = _lookup_ref(ref, root_schema)
 
         # Insert a private sentinel into the cache before recursing to prevent infinite recursion on circular refs.
         cache[ref] = _RefPlaceholder()
 
-        ft = self._parse(node, tb, cache, root_schema)
+        name_hint = ref.rsplit("/", 1)[-1]
+        if shared is None:
+            ft = self._parse(node, tb, cache, root_schema, shared, name_hint)
+        else:
+            # Definitions shared between the schemas of a batch are parsed once
+            key = f"{name_hint}:{_structural_key(node, root_schema)}"
+            if (ft := shared.get(key)) is None:
+                ft = self._parse(node, tb, cache, root_schema, shared, name_hint)
+                shared[key] = ft
         cache[ref] = ft
         return ft
 
+
+def _lookup_ref(ref: str, root_schema: dict[str, Any]) -> Any:
+    # split "#/definitions/Foo" → ["definitions", "Foo"]
+    section, *path = ref.lstrip("#/").split("/")
+    node = root_schema.get(section, {})
+    for key in path:
+        node = node[key]
+    return node
+
+
+def _structural_key(node: Any, root_schema: dict[str, Any]) -> str:
+    """Hashes a definition with the definitions it refers to inlined."""
+
+    def inline(value: Any, refs: tuple[str, ...]) -> Any:
+        if isinstance(value, dict):
+            ref = value.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/"):
+                if ref in refs:
+                    raise ValueError(f"Circular $ref detected for {ref!r}")
+                return {"$ref": inline(_lookup_ref(ref, root_schema), (*refs, ref))}
+            return {k: inline(v, refs) for k, v in value.items()}
+        if isinstance(value, list):
+            return [inline(v, refs) for v in value]
+        return value
+
+    canonical = json.dumps(inline(node, ()), sort_keys=True, default=repr)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
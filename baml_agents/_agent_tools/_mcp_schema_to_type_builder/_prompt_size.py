@@ -0,0 +1,61 @@
+import math
+from typing import TYPE_CHECKING
+
+from ._type_builder_recipe import RecordedType, _RecordedClass, _RecordedEnum
+
+if TYPE_CHECKING:
+    from baml_py.baml_py import FieldType
+
+# A common rule of thumb for English text and JSON-like schemas
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def render_output_format(root: "RecordedType | FieldType") -> str:
+    """
+    Approximates how `ctx.output_format` renders a recorded type: the type
+    inline, followed by the enums it uses.
+    """
+    enums: dict[int, _RecordedEnum] = {}
+    text = _render(root, enums, 0)
+    for enum in enums.values():
+        values = "\n".join(f"- {v}" for v in enum.values)
+        text += f"\n\n{enum.name}\n----\n{values}"
+    return text
+
+
+def _render(t: "RecordedType | FieldType", enums: dict, depth: int) -> str:
+    if not isinstance(t, RecordedType):
+        return str(t)
+    match t.kind:
+        case "class":
+            return _render_class(t.args[0], enums, depth)
+        case "enum":
+            enums[id(t.args[0])] = t.args[0]
+            return t.args[0].name
+        case "list":
+            return f"{_render(t.args[0], enums, depth)}[]"
+        case "optional":
+            return f"{_render(t.args[0], enums, depth)} or null"
+        case "union":
+            return " or ".join(_render(a, enums, depth) for a in t.args)
+        case "literal_string":
+            return f'"{t.args[0]}"'
+        case kind:
+            return kind
+
+
+def _render_class(cls: _RecordedClass, enums: dict, depth: int) -> str:
+    indent = "  " * (depth + 1)
+    lines = ["{"]
+    for p in cls.properties:
+        if p.description:
+            lines.extend(f"{indent}// {line}" for line in p.description.splitlines())
+        lines.append(
+            f"{indent}{p.alias or p.name}: {_render(p.type, enums, depth + 1)},"
+        )
+    lines.append("  " * depth + "}")
+    return "\n".join(lines)
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from baml_agents._agent_tools._tool_definition import McpToolDefinition
+from baml_agents._utils._freeze import freeze, thaw
+
+
+@dataclass(frozen=True)
+class SchemaCompaction:
+    """
+    Trades detail of the tool schemas for a shorter prompt. The defaults
+    change nothing.
+    """
+
+    max_description_chars: int | None = field(
+        default=None,
+        metadata={"description": "Longer descriptions are truncated (or dropped)"},
+    )
+    drop_long_descriptions: bool = field(
+        default=False,
+        metadata={"description": "Drop descriptions over the budget, don't truncate"},
+    )
+    collapse_single_value_enums: bool = field(
+        default=False,
+        metadata={"description": "Render one-value enums as a literal, not an enum"},
+    )
+    max_optional_fields: int | None = field(
+        default=None,
+        metadata={"description": "Optional properties kept per object, in order"},
+    )
+
+    def compact_tool(self, tool: McpToolDefinition) -> McpToolDefinition:
+        """Returns `tool` with its description and parameters schema compacted."""
+        description = self._description(tool.description) or ""
+        original = thaw(tool.parameters_json_schema)
+        schema = self.compact_schema(original)
+        if description == tool.description and schema == original:
+            return tool
+        return tool.model_copy(
+            update={
+                "description": description,
+                "parameters_json_schema": freeze(schema),
+            }
+        )
+
+    def compact_schema(self, schema: Any) -> Any:
+        """Returns a compacted copy of a JSON schema, `schema` is left unchanged."""
+        if not isinstance(schema, dict):
+            return schema
+        schema = dict(schema)
+        for key in ("properties", "$defs", "definitions"):
+            if isinstance(sub := schema.get(key), dict):
+                schema[key] = {n: self.compact_schema(s) for n, s in sub.items()}
+        for key in ("anyOf", "oneOf", "allOf"):
+            if isinstance(sub := schema.get(key), list):
+                schema[key] = [self.compact_schema(s) for s in sub]
+        if "items" in schema:
+            schema["items"] = self.compact_schema(schema["items"])
+
+        if "description" in schema:
+            if (description := self._description(schema["description"])) is None:
+                del schema["description"]
+            else:
+                schema["description"] = description
+        enum = schema.get("enum")
+        if (
+            self.collapse_single_value_enums
+            and isinstance(enum, list)
+            and len(enum) == 1
+        ):
+            # Without a title, the converter emits a literal instead of an enum
+            schema.pop("title", None)
+        properties = schema.get("properties")
+        if self.max_optional_fields is not None and isinstance(properties, dict):
+            required = set(schema.get("required", ()))
+            optional = [n for n in properties if n not in required]
+            dropped = set(optional[self.max_optional_fields :])
+            schema["properties"] = {
+                n: p for n, p in properties.items() if n not in dropped
+            }
+        return schema
+
+    def _description(self, description: Any) -> Any:
+        limit = self.max_description_chars
+        if limit is None or not isinstance(description, str):
+            return description
+        description = description.strip()
+        if len(description) <= limit:
+            return description
+        if self.drop_long_descriptions or limit < 1:
+            return None
+        return description[: limit - 1].rstrip() + "…"
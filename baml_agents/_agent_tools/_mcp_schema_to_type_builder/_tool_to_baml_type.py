@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 from baml_py.baml_py import FieldType
 from baml_py.type_builder import TypeBuilder
@@ -22,6 +23,18 @@ class AbstractToolToBamlType(ABC):
     ) -> FieldType:
         pass
 
+    def convert_many(
+        self,
+        *,
+        tools: Sequence[McpToolDefinition],
+        tb: TypeBuilder,
+        baml_tool_id_field: str,
+    ) -> list[FieldType]:
+        return [
+            self.convert(tool=t, tb=tb, baml_tool_id_field=baml_tool_id_field)
+            for t in tools
+        ]
+
 
 class ToolToBamlType(AbstractToolToBamlType):
     def __init__(
@@ -41,3 +54,13 @@ class ToolToBamlType(AbstractToolToBamlType):
         schema = mcp_tool_to_json_schema(tool, tb, baml_tool_id_field)
         return self._converter.convert(schema, tb)
 
+    def convert_many(
+        self,
+        *,
+        tools: Sequence[McpToolDefinition],
+        tb: TypeBuilder,
+        baml_tool_id_field: str,
+    ) -> list[FieldType]:
+        schemas = [mcp_tool_to_json_schema(t, tb, baml_tool_id_field) for t in tools]
+        return self._converter.convert_many(schemas, tb)
+
@@ -1,6 +1,7 @@
 from collections.abc import Iterable
 from typing import TypeVar
 
+from baml_py.baml_py import FieldType
 from baml_py.type_builder import TypeBuilder
 
 from baml_agents._agent_tools._tool_definition import McpToolDefinition
@@ -30,15 +31,23 @@ class TypeBuilderOrchestrator:
         *,
         tools: Iterable[McpToolDefinition],
     ) -> T:
-        baml_types = [
-            self._converter.convert(
-                tool=t,
-                tb=tb,
-                baml_tool_id_field=self._prompt_cfg.id_field,
-            )
-            for t in tools
-        ]
-        union = tb.union(baml_types)
+        union = self.build_union(tb, tools=tools)
         output_class.add_property(self._prompt_cfg.tools_field, union)
         return tb
 
+    def build_union(
+        self,
+        tb: TypeBuilder,
+        *,
+        tools: Iterable[McpToolDefinition],
+    ) -> FieldType:
+        """Builds the union of the tool types without attaching it anywhere."""
+        if (compaction := self._prompt_cfg.compaction) is not None:
+            tools = [compaction.compact_tool(t) for t in tools]
+        baml_types = self._converter.convert_many(
+            tools=list(tools),
+            tb=tb,
+            baml_tool_id_field=self._prompt_cfg.id_field,
+        )
+        return tb.union(baml_types)
+
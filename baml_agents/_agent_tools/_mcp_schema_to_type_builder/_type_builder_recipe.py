@@ -0,0 +1,238 @@
+import itertools
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from baml_py.baml_py import FieldType
+from baml_py.type_builder import TypeBuilder
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RecordedType:
+    """A type created on a `RecordingTypeBuilder`, mirrors `FieldType`."""
+
+    kind: str
+    args: tuple[Any, ...] = ()
+
+    def list(self) -> "RecordedType":
+        return RecordedType("list", (self,))
+
+    def optional(self) -> "RecordedType":
+        return RecordedType("optional", (self,))
+
+
+@dataclass(slots=True)
+class _RecordedProperty:
+    name: str
+    type: "RecordedType | FieldType"
+    description: str | None = None
+    alias: str | None = None
+
+
+class _PropertyRecorder:
+    """Mirrors ClassPropertyBuilder."""
+
+    __slots__ = ("_prop",)
+
+    def __init__(self, prop: _RecordedProperty):
+        self._prop = prop
+
+    def description(self, description: str | None) -> "_PropertyRecorder":
+        self._prop.description = description
+        return self
+
+    def alias(self, alias: str | None) -> "_PropertyRecorder":
+        self._prop.alias = alias
+        return self
+
+
+@dataclass(slots=True, eq=False)
+class _RecordedClass:
+    name: str
+    properties: list[_RecordedProperty] = field(default_factory=list)
+
+    def add_property(self, name: str, type_: RecordedType) -> _PropertyRecorder:
+        prop = _RecordedProperty(name, type_)
+        self.properties.append(prop)
+        return _PropertyRecorder(prop)
+
+    def type(self) -> RecordedType:
+        return RecordedType("class", (self,))
+
+
+@dataclass(slots=True, eq=False)
+class _RecordedEnum:
+    name: str
+    values: list[str] = field(default_factory=list)
+
+    def add_value(self, value: str) -> None:
+        self.values.append(value)
+
+    def type(self) -> RecordedType:
+        return RecordedType("enum", (self,))
+
+
+class RecordingTypeBuilder:
+    """
+    Stands in for a `TypeBuilder` and records the calls made on it, so that
+    they can be replayed onto any number of real TypeBuilders later.
+
+    Only supports the subset of the TypeBuilder API used by the converters.
+    Class and enum names don't have to be unique, see `TypeBuilderRecipe`.
+    """
+
+    def string(self) -> RecordedType:
+        return RecordedType("string")
+
+    def int(self) -> RecordedType:
+        return RecordedType("int")
+
+    def float(self) -> RecordedType:
+        return RecordedType("float")
+
+    def bool(self) -> RecordedType:
+        return RecordedType("bool")
+
+    def null(self) -> RecordedType:
+        return RecordedType("null")
+
+    def literal_string(self, value: str) -> RecordedType:
+        return RecordedType("literal_string", (value,))
+
+    def list(self, inner: RecordedType) -> RecordedType:
+        return inner.list()
+
+    def union(self, types: Sequence[RecordedType]) -> RecordedType:
+        return RecordedType("union", tuple(types))
+
+    def add_class(self, name: str) -> _RecordedClass:
+        return _RecordedClass(name)
+
+    def add_enum(self, name: str) -> _RecordedEnum:
+        return _RecordedEnum(name)
+
+    def to_recipe(
+        self, roots: Sequence["RecordedType | FieldType"]
+    ) -> "TypeBuilderRecipe":
+        # The recorded types reference their classes and enums directly
+        return TypeBuilderRecipe(roots=tuple(roots))
+
+
+@dataclass(frozen=True, slots=True)
+class TypeBuilderRecipe:
+    """
+    Root types recorded by a `RecordingTypeBuilder`, together with the classes
+    and enums they refer to.
+
+    Replaying it only makes the TypeBuilder calls, none of the JSON schema
+    processing that produced them. Each class and enum is emitted once per
+    name and structure: if one with the same structure was already declared
+    (in this replay or an earlier one sharing `declared`), it is reused. If
+    the name is taken by a different structure, a counter is appended to the
+    name (`Color`, `Color2`, ...).
+
+    The recording may also contain `FieldType`s created on a real
+    TypeBuilder. These are passed through unchanged.
+    """
+
+    roots: tuple["RecordedType | FieldType", ...]
+
+    def replay(
+        self,
+        tb: TypeBuilder,
+        declared: dict[str, tuple[tuple, Any]] | None = None,
+    ) -> list[FieldType]:
+        """
+        Adds the recorded classes and enums to `tb` and returns the root types.
+
+        Pass the same `declared` to every replay onto the same TypeBuilder.
+        """
+        replay = _Replay(tb, {} if declared is None else declared)
+        return [replay.field_type(root) for root in self.roots]
+
+
+class _Replay:
+    def __init__(self, tb: TypeBuilder, declared: dict[str, tuple[tuple, Any]]):
+        self._tb = tb
+        self._declared = declared
+        # id(recorded class or enum) -> (declared name, type)
+        self._resolved: dict[int, tuple[str, Any]] = {}
+
+    def field_type(self, t: "RecordedType | FieldType") -> Any:
+        if not isinstance(t, RecordedType):
+            return t
+        tb = self._tb
+        match t.kind:
+            case "class" | "enum":
+                return self._resolve(t.args[0])[1]
+            case "list":
+                return self.field_type(t.args[0]).list()
+            case "optional":
+                return self.field_type(t.args[0]).optional()
+            case "union":
+                return tb.union([self.field_type(a) for a in t.args])
+            case "literal_string":
+                return tb.literal_string(t.args[0])
+            case "string":
+                return tb.string()
+            case "int":
+                return tb.int()
+            case "float":
+                return tb.float()
+            case "bool":
+                return tb.bool()
+            case "null":
+                return tb.null()
+            case other:
+                raise ValueError(f"Unknown recorded type: {other!r}")
+
+    def _signature(self, t: "RecordedType | FieldType") -> tuple:
+        if not isinstance(t, RecordedType):
+            return ("field_type", id(t))
+        if t.kind in ("class", "enum"):
+            return (t.kind, self._resolve(t.args[0])[0])
+        return (
+            t.kind,
+            *(self._signature(a) if isinstance(a, RecordedType) else a for a in t.args),
+        )
+
+    def _resolve(self, decl: _RecordedClass | _RecordedEnum) -> tuple[str, Any]:
+        if (resolved := self._resolved.get(id(decl))) is not None:
+            return resolved
+        if isinstance(decl, _RecordedEnum):
+            signature: tuple = ("enum", tuple(decl.values))
+        else:
+            # Resolves (and declares) the referenced classes and enums first
+            signature = (
+                "class",
+                tuple(
+                    (p.name, self._signature(p.type), p.description, p.alias)
+                    for p in decl.properties
+                ),
+            )
+        for i in itertools.count(1):
+            name = decl.name if i == 1 else f"{decl.name}{i}"
+            if (existing := self._declared.get(name)) is None:
+                resolved = name, self._declare(name, decl)
+                self._declared[name] = (signature, resolved[1])
+                break
+            if existing[0] == signature:
+                resolved = name, existing[1]
+                break
+        self._resolved[id(decl)] = resolved
+        return resolved
+
+    def _declare(self, name: str, decl: _RecordedClass | _RecordedEnum) -> Any:
+        if isinstance(decl, _RecordedEnum):
+            enum = self._tb.add_enum(name)
+            for value in decl.values:
+                enum.add_value(value)
+            return enum.type()
+        cls = self._tb.add_class(name)
+        for prop in decl.properties:
+            p = cls.add_property(prop.name, self.field_type(prop.type))
+            if prop.description is not None:
+                p.description(prop.description)
+            if prop.alias is not None:
+                p.alias(prop.alias)
+        return cls.type()
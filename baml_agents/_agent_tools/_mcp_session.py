@@ -0,0 +1,351 @@
+import contextlib
+import itertools
+import json
+import os
+import shlex
+import subprocess
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Self
+
+from loguru import logger
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+
+
+class McpSessionError(RuntimeError):
+    """Raised when the MCP server returns an error or the session breaks."""
+
+
+class McpServerCrashedError(McpSessionError):
+    """Raised for requests that were in flight when the server process exited."""
+
+
+def _lines(stream: Any) -> Iterator[str]:
+    # The stream is closed from another thread when the session stops
+    with contextlib.suppress(OSError, ValueError):
+        yield from stream
+
+
+class _ServerProcess:
+    """A running server process and the requests waiting for its responses."""
+
+    def __init__(self, popen: subprocess.Popen):
+        self.popen = popen
+        self._pending: dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._exited = False
+
+    @property
+    def alive(self) -> bool:
+        return not self._exited and self.popen.poll() is None
+
+    def register(self, request_id: int) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._exited:
+                raise McpServerCrashedError("The MCP server process has exited")
+            self._pending[request_id] = future
+        return future
+
+    def unregister(self, request_id: int) -> None:
+        with self._lock:
+            self._pending.pop(request_id, None)
+
+    def resolve(self, message: dict[str, Any]) -> None:
+        with self._lock:
+            future = self._pending.pop(message.get("id"), None)  # type: ignore[arg-type]
+        if future is not None:
+            future.set_result(message)
+
+    def fail_all(self, error: Exception) -> None:
+        with self._lock:
+            self._exited = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(error)
+
+    def stop(self) -> None:
+        """Fails the pending requests, then terminates the process and waits for it."""
+        self.fail_all(McpServerCrashedError("The MCP session was stopped"))
+        popen = self.popen
+        for stream in (popen.stdin, popen.stdout, popen.stderr):
+            if stream is not None:
+                with contextlib.suppress(OSError):
+                    stream.close()
+        try:
+            popen.terminate()
+            popen.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            popen.kill()
+        except OSError:
+            pass
+
+
+def _stop_all(processes: list[_ServerProcess]) -> None:
+    for process in processes:
+        process.stop()
+
+
+class McpStdioSession:
+    """
+    A long-lived MCP client session with one server process, speaking
+    newline-delimited JSON-RPC 2.0 over the server's stdin/stdout.
+
+    The server is started on the first request and reused for all following
+    ones, which avoids paying process startup and the MCP handshake per tool
+    call. If the server process exits, it is restarted before the next request.
+    Requests that were in flight when it exited fail with
+    `McpServerCrashedError`. `list_tools` is retried once, `call_tool` is not
+    because tools may have side effects.
+
+    The session is thread-safe: concurrent requests are multiplexed over the
+    same process and matched to their responses by id.
+    """
+
+    def __init__(
+        self,
+        server: str | Sequence[str],
+        *,
+        env: dict | None = None,
+        timeout_s: float = 60.0,
+        max_restarts: int = 3,
+    ):
+        self._command = shlex.split(server) if isinstance(server, str) else list(server)
+        self._env = env
+        self._timeout_s = timeout_s
+        self._max_restarts = max_restarts
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._process: _ServerProcess | None = None
+        self._restarts = 0
+        self._closed = False
+        self.server_info: dict[str, Any] = {}
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.alive
+
+    def start(self) -> None:
+        stopped: list[_ServerProcess] = []
+        try:
+            with self._lock:
+                self._ensure_started(stopped)
+        finally:
+            _stop_all(stopped)
+
+    def list_tools(self) -> dict[str, Any]:
+        """Returns all tools of the server as `{"tools": [...]}`, following pagination."""
+        try:
+            return self._list_tools()
+        except McpServerCrashedError:
+            logger.warning("MCP server crashed during tools/list, retrying once")
+            return self._list_tools()
+
+    def _list_tools(self) -> dict[str, Any]:
+        tools: list[dict[str, Any]] = []
+        cursor = None
+        while True:
+            result = self._request("tools/list", {"cursor": cursor} if cursor else {})
+            tools.extend(result.get("tools", []))
+            if not (cursor := result.get("nextCursor")):
+                return {"tools": tools}
+
+    def call_tool(
+        self,
+        name: str,
+        arguments: dict[str, Any],
+        *,
+        timeout_s: float | None = None,
+    ) -> dict[str, Any]:
+        """Calls a tool and returns the MCP result (`{"content": [...], "isError": ...}`)."""
+        return self._request(
+            "tools/call", {"name": name, "arguments": arguments}, timeout_s=timeout_s
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            process, self._process = self._process, None
+        if process is not None:
+            process.stop()
+
+    def _ensure_started(self, stopped: list[_ServerProcess]) -> None:
+        # Caller holds self._lock. Replaced processes are added to `stopped`,
+        # for the caller to stop once it released the lock: that waits for them
+        if self._closed:
+            raise McpSessionError("The MCP session was closed")
+        if self.is_running:
+            return
+        if self._process is not None:
+            if self._restarts >= self._max_restarts:
+                raise McpSessionError(
+                    f"MCP server {self._command} exited {self._restarts + 1} times, "
+                    "giving up"
+                )
+            self._restarts += 1
+            logger.warning(
+                "MCP server exited, restarting",
+                command=self._command,
+                restarts=self._restarts,
+            )
+            stopped.append(self._process)
+            self._process = None
+
+        logger.debug("Starting MCP server", command=self._command)
+        popen = subprocess.Popen(  # noqa: S603
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            env={**(self._env or {}), **os.environ},
+        )
+        process = self._process = _ServerProcess(popen)
+        threading.Thread(
+            target=self._read_stdout, args=(process,), name="mcp-reader", daemon=True
+        ).start()
+        threading.Thread(
+            target=self._read_stderr, args=(process,), name="mcp-stderr", daemon=True
+        ).start()
+
+        try:
+            result = self._send_request(
+                process,
+                "initialize",
+                {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "baml-agents", "version": "0"},
+                },
+                timeout_s=self._timeout_s,
+            )
+            self._send(
+                process, {"jsonrpc": "2.0", "method": "notifications/initialized"}
+            )
+        except Exception:
+            stopped.append(process)
+            self._process = None
+            raise
+        self.server_info = result.get("serverInfo", {})
+
+    def _request(
+        self,
+        method: str,
+        params: dict[str, Any],
+        *,
+        timeout_s: float | None = None,
+    ) -> dict[str, Any]:
+        stopped: list[_ServerProcess] = []
+        try:
+            with self._lock:
+                self._ensure_started(stopped)
+                process = self._process
+        finally:
+            _stop_all(stopped)
+        assert process is not None  # noqa: S101
+        result = self._send_request(
+            process, method, params, timeout_s=timeout_s or self._timeout_s
+        )
+        with self._lock:
+            # A successful request means the (re)started server is healthy
+            # again, unless it has been replaced while the request ran
+            if self._process is process:
+                self._restarts = 0
+        return result
+
+    def _send_request(
+        self,
+        process: _ServerProcess,
+        method: str,
+        params: dict[str, Any],
+        *,
+        timeout_s: float,
+    ) -> dict[str, Any]:
+        request_id = next(self._ids)
+        future = process.register(request_id)
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params:
+            message["params"] = params
+        try:
+            self._send(process, message)
+            response = future.result(timeout=timeout_s)
+        except FutureTimeoutError:
+            raise TimeoutError(
+                f"MCP request {method} timed out after {timeout_s}s"
+            ) from None
+        finally:
+            process.unregister(request_id)
+
+        if "error" in response:
+            error = response["error"]
+            raise McpSessionError(
+                f"MCP request {method} failed: {error.get('message')} "
+                f"(code {error.get('code')})"
+            )
+        return response.get("result", {})
+
+    def _send(self, process: _ServerProcess, message: dict[str, Any]) -> None:
+        line = json.dumps(message, separators=(",", ":")) + "\n"
+        with self._write_lock:
+            try:
+                process.popen.stdin.write(line)  # type: ignore[union-attr]
+                process.popen.stdin.flush()  # type: ignore[union-attr]
+            except (BrokenPipeError, OSError, ValueError) as e:
+                raise McpServerCrashedError(
+                    f"Could not write to MCP server {self._command}: {e}"
+                ) from e
+
+    def _read_stdout(self, process: _ServerProcess) -> None:
+        for line in _lines(process.popen.stdout):
+            if not (line := line.strip()):
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                message = None
+            if not isinstance(message, dict):
+                logger.debug("Ignoring non JSON-RPC output of MCP server", line=line)
+                continue
+            if "method" in message:
+                self._handle_server_message(process, message)
+            else:
+                process.resolve(message)
+        process.fail_all(
+            McpServerCrashedError(
+                f"MCP server {self._command} exited with code {process.popen.poll()}"
+            )
+        )
+
+    def _read_stderr(self, process: _ServerProcess) -> None:
+        for line in _lines(process.popen.stderr):
+            logger.debug("MCP server stderr", line=line.rstrip())
+
+    def _handle_server_message(
+        self, process: _ServerProcess, message: dict[str, Any]
+    ) -> None:
+        if "id" not in message:
+            return  # Notifications (logging, progress, ...) are not used
+        if message["method"] == "ping":
+            response = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        else:
+            response = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": "Method not found"},
+            }
+        with contextlib.suppress(McpServerCrashedError):
+            self._send(process, response)
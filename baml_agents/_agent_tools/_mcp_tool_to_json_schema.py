@@ -1,6 +1,7 @@
 from baml_py.type_builder import TypeBuilder
 
 from baml_agents._agent_tools._utils._snake_to_pascal import snake_to_pascal
+from baml_agents._utils._freeze import thaw
 from baml_agents._utils._merge_dicts_no_overlap import merge_dicts_no_overlap
 
 from ._tool_definition import McpToolDefinition
@@ -11,7 +12,8 @@ def mcp_tool_to_json_schema(
     tb: TypeBuilder,
     baml_tool_id_field: str,
 ):
-    schema = tool.parameters_json_schema.copy()
+    # The converters work on plain dicts, definitions hold read-only ones
+    schema = thaw(tool.parameters_json_schema)
     props = merge_dicts_no_overlap(
         {
             "action_id": {
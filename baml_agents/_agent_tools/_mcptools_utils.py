@@ -1,15 +1,108 @@
 import os
 import shutil
 import subprocess
+import threading
 from pathlib import Path
 
+# Path (or name on PATH) of the mcptools binary, skips the discovery
+MCPTOOLS_BINARY_ENV_VAR = "BAML_AGENTS_MCPTOOLS_BINARY"
+# Set to 0/false/no to skip running the binary to check that it is mcptools
+MCPTOOLS_VERIFY_ENV_VAR = "BAML_AGENTS_MCPTOOLS_VERIFY"
+
+_binary_lock = threading.Lock()
+_binary_override: str | None = None
+# (override the binary was resolved for, path, whether it was verified)
+_resolved_binary: tuple[str | None, str, bool] | None = None
+
 
 class McpToolsNotFoundError(Exception):
     """Raised when mcptools binary cannot be found on the system."""
 
 
 
-def find_mcptools_binary() -> str:
+def set_mcptools_binary(path: str | None) -> None:
+    """
+    Use the mcptools binary at `path` (or the name of a binary on PATH)
+    instead of discovering it. Takes precedence over the environment variable
+    BAML_AGENTS_MCPTOOLS_BINARY. Pass None to go back to discovery.
+    """
+    global _binary_override  # noqa: PLW0603
+    with _binary_lock:
+        _binary_override = path
+
+
+def clear_mcptools_binary_cache() -> None:
+    """Forgets the resolved binary, the next lookup searches again."""
+    global _resolved_binary  # noqa: PLW0603
+    with _binary_lock:
+        _resolved_binary = None
+
+
+def find_mcptools_binary(*, verify: bool | None = None) -> str:
+    """
+    Return the path to the mcptools binary, resolved once per process.
+
+    The result is cached and re-resolved only if the file disappears or the
+    override changes. The override is set with `set_mcptools_binary` or the
+    environment variable BAML_AGENTS_MCPTOOLS_BINARY. With `verify=False` the
+    binary is not executed to check that it is mcptools, which saves up to two
+    process spawns on the first call. `verify=None` reads the environment
+    variable BAML_AGENTS_MCPTOOLS_VERIFY, verifying unless it is 0/false/no.
+    """
+    global _resolved_binary  # noqa: PLW0603
+    if verify is None:
+        verify = os.environ.get(MCPTOOLS_VERIFY_ENV_VAR, "").strip().lower() not in {
+            "0",
+            "false",
+            "no",
+        }
+    override = _binary_override or os.environ.get(MCPTOOLS_BINARY_ENV_VAR) or None
+
+    resolved = _resolved_binary
+    if _is_usable(resolved, override=override, verify=verify):
+        return resolved[1]  # type: ignore[index]
+
+    with _binary_lock:
+        resolved = _resolved_binary
+        if not _is_usable(resolved, override=override, verify=verify):
+            if override is not None:
+                path = _resolve_override(override, verify=verify)
+            else:
+                path = _discover_mcptools_binary(verify=verify)
+            _resolved_binary = resolved = (override, path, verify)
+        return resolved[1]  # type: ignore[index]
+
+
+def _is_usable(
+    resolved: tuple[str | None, str, bool] | None,
+    *,
+    override: str | None,
+    verify: bool,
+) -> bool:
+    if resolved is None:
+        return False
+    resolved_for, path, verified = resolved
+    return (
+        resolved_for == override and (verified or not verify) and Path(path).is_file()
+    )
+
+
+def _resolve_override(override: str, *, verify: bool) -> str:
+    path = override if Path(override).is_file() else shutil.which(override)
+    if path is None or not os.access(path, os.X_OK):
+        raise McpToolsNotFoundError(
+            f"mcptools binary {override!r} (set via set_mcptools_binary or "
+            f"{MCPTOOLS_BINARY_ENV_VAR}) does not exist or is not executable"
+        )
+    if verify and not _verify_mcptools_binary(path):
+        raise McpToolsNotFoundError(
+            f"{path!r} (set via set_mcptools_binary or {MCPTOOLS_BINARY_ENV_VAR}) "
+            "does not look like a working mcptools binary"
+        )
+    return path
+
+
+def _discover_mcptools_binary(*, verify: bool) -> str:
     """
     Detect and return the path to the mcptools binary.
 
@@ -17,7 +110,7 @@ def find_mcptools_binary() -> str:
     1. Uses shutil.which() to check if 'mcptools' or 'mcpt' is in PATH
     2. Checks common installation paths for Homebrew on macOS
     3. Checks common Go binary locations
-    4. Verifies the binary is executable and working
+    4. Verifies the binary is executable and working (if `verify`)
 
     Returns:
         str: Full path to the mcptools binary
@@ -32,7 +125,7 @@ def find_mcptools_binary() -> str:
     # First, try to find it in PATH
     for binary_name in binary_names:
         binary_path = shutil.which(binary_name)
-        if binary_path and _verify_mcptools_binary(binary_path):
+        if binary_path and (not verify or _verify_mcptools_binary(binary_path)):
             return binary_path
 
     # Common installation paths to check
@@ -57,7 +150,7 @@ def find_mcptools_binary() -> str:
     for path in common_paths:
         path_str = str(path)
         if os.path.isfile(path_str) and os.access(path_str, os.X_OK):
-            if _verify_mcptools_binary(path_str):
+            if not verify or _verify_mcptools_binary(path_str):
                 return path_str
 
     # If we get here, mcptools was not found
@@ -0,0 +1,73 @@
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from baml_agents._agent_tools._mcp_schema_to_type_builder._prompt_size import (
+    CHARS_PER_TOKEN,
+)
+
+if TYPE_CHECKING:
+    from baml_agents._agent_tools._str_result import Result
+
+
+@dataclass(frozen=True)
+class ResultLimits:
+    """
+    Caps the size of tool results before they are added to the interactions
+    of an agent. The defaults change nothing.
+
+    Content over `max_chars`/`max_tokens` is passed to `summarize` if given,
+    else truncated with a note of how much was cut.
+    """
+
+    max_chars: int | None = field(
+        default=None,
+        metadata={"description": "Longer content is summarized or truncated"},
+    )
+    max_tokens: int | None = field(
+        default=None,
+        metadata={"description": "Like max_chars, in estimated tokens"},
+    )
+    max_items: int | None = field(
+        default=None,
+        metadata={"description": "Content items of an MCP result kept, in order"},
+    )
+    max_response_bytes: int | None = field(
+        default=None,
+        metadata={"description": "Text of MCP tool results is cut here, in bytes"},
+    )
+    summarize: Callable[[str, int], str] | None = field(
+        default=None,
+        metadata={"description": "Shortens content to the given number of chars"},
+    )
+
+    @property
+    def char_budget(self) -> int | None:
+        budgets = [b for b in (self.max_chars, self._token_chars) if b is not None]
+        return min(budgets, default=None)
+
+    @property
+    def _token_chars(self) -> int | None:
+        if self.max_tokens is None:
+            return None
+        return self.max_tokens * CHARS_PER_TOKEN
+
+    def apply(self, result: "Result") -> "Result":
+        """Returns `result` with its content within the budget."""
+        content = self.limit_text(result.content)
+        if content == result.content:
+            return result
+        return result.model_copy(update={"content": content})
+
+    def limit_text(self, text: str) -> str:
+        budget = self.char_budget
+        if budget is None or len(text) <= budget:
+            return text
+        if self.summarize is not None:
+            summary = self.summarize(text, budget)
+            if len(summary) <= budget:
+                return summary
+            text = summary
+        return (
+            f"{text[:budget]}\n… [truncated {len(text) - budget} of {len(text)} chars]"
+        )
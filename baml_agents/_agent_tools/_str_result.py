@@ -1,8 +1,12 @@
-from typing import Any, Self
+from typing import TYPE_CHECKING, Any, Self
 
 from pydantic import BaseModel, ConfigDict
 
-from baml_agents._utils._sole import sole
+if TYPE_CHECKING:
+    from baml_agents._agent_tools._result_limits import ResultLimits
+
+# Set by `call_tool` on MCP results whose text it cut to this many bytes
+TRUNCATED_AT_BYTES = "truncatedAtBytes"
 
 
 class Result(BaseModel):
@@ -12,8 +16,48 @@ class Result(BaseModel):
     model_config = ConfigDict(frozen=True)
 
     @classmethod
-    def from_mcp_schema(cls, mcp_result_schema: dict[str, Any]) -> Self:
-        item = sole(mcp_result_schema["content"])
-        if item["type"] != "text":
-            raise ValueError(f"Expected text type, got {item['type']}")
-        return cls(content=item["text"], error=mcp_result_schema.get("isError", False))
+    def from_mcp_schema(
+        cls,
+        mcp_result_schema: dict[str, Any],
+        *,
+        limits: "ResultLimits | None" = None,
+    ) -> Self:
+        """
+        Joins the content items of an MCP tool result. Non-text items (images,
+        audio, binary resources) are described by a placeholder, their data is
+        not included.
+        """
+        items = mcp_result_schema.get("content") or []
+        omitted = 0
+        if limits is not None and limits.max_items is not None:
+            omitted = max(0, len(items) - limits.max_items)
+            items = items[: limits.max_items]
+        parts = [_content_text(item) for item in items]
+        if omitted:
+            parts.append(f"[{omitted} more content items omitted]")
+        if (cut_at := mcp_result_schema.get(TRUNCATED_AT_BYTES)) is not None:
+            parts.append(f"[tool output cut at {cut_at} bytes]")
+        result = cls(
+            content="\n\n".join(parts),
+            error=mcp_result_schema.get("isError", False),
+        )
+        return limits.apply(result) if limits is not None else result
+
+
+def _content_text(item: dict[str, Any]) -> str:
+    kind = item.get("type")
+    if kind == "text":
+        return item["text"]
+    if kind in {"image", "audio"}:
+        data = item.get("data", "")
+        # Decoded size of the base64 data, without decoding it
+        size = len(data) * 3 // 4 - data[-2:].count("=")
+        return f"[{kind}: {item.get('mimeType', 'unknown type')}, {size} bytes]"
+    if kind == "resource":
+        resource = item.get("resource", {})
+        if "text" in resource:
+            return resource["text"]
+        return f"[resource: {resource.get('uri')}, {resource.get('mimeType')}]"
+    if kind == "resource_link":
+        return f"[resource link: {item.get('uri')}]"
+    return f"[{kind} content]"
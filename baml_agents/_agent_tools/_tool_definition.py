@@ -1,14 +1,27 @@
 import json
+from collections.abc import Mapping
 from typing import Any, Self
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from baml_agents._utils._freeze import freeze
 
 
 class McpToolDefinition(BaseModel):
     name: str = Field(..., exclude=True)
     description: str
-    parameters_json_schema: dict[str, Any]
-    annotations: dict[str, Any] | None = None
+    parameters_json_schema: Mapping[str, Any]
+    annotations: Mapping[str, Any] | None = None
+
+    # Definitions are shared (e.g. by Action.get_mcp_definition and
+    # ActionRunner.actions), so they are read-only down to the nested schema:
+    # use model_copy(update=...) to change one, `thaw` for a mutable schema
+    model_config = ConfigDict(frozen=True)
+
+    @field_validator("parameters_json_schema", "annotations")
+    @classmethod
+    def _freeze(cls, value: Mapping[str, Any] | None) -> Mapping[str, Any] | None:
+        return freeze(value)
 
     @classmethod
     def from_mcp_schema(cls, mcp_schema: str | dict[str, Any]) -> list[Self]:
@@ -22,4 +35,3 @@ class McpToolDefinition(BaseModel):
             )
             for tool in tools
         ]
-
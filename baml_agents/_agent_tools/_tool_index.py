@@ -0,0 +1,128 @@
+import math
+import re
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from baml_agents._agent_tools._tool_definition import McpToolDefinition
+from baml_agents._agent_tools._utils._snake_to_pascal import pascal_to_snake
+
+_WORD = re.compile(r"[A-Z]+s?(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# How often the tokens of a field count towards the term frequency
+_NAME_WEIGHT = 3
+_PARAMETER_WEIGHT = 1
+_DESCRIPTION_WEIGHT = 1
+
+
+def _tokenize(text: str) -> list[str]:
+    """Splits snake_case, camelCase and prose into lowercase words."""
+    return [w.lower() for w in _WORD.findall(text) if len(w) > 1 or w.isdigit()]
+
+
+def _schema_text(schema: Any) -> Iterable[str]:
+    """Yields the property names, descriptions and enum values of a JSON schema."""
+    if isinstance(schema, Mapping):
+        for name, prop in schema.get("properties", {}).items():
+            yield name
+            yield from _schema_text(prop)
+        if isinstance(description := schema.get("description"), str):
+            yield description
+        for value in schema.get("enum", ()):
+            if isinstance(value, str):
+                yield value
+        for key in ("items", "anyOf", "oneOf", "allOf", "$defs", "definitions"):
+            if (sub := schema.get(key)) is not None:
+                yield from _schema_text(sub)
+    elif isinstance(schema, list | tuple):
+        for sub in schema:
+            yield from _schema_text(sub)
+
+
+class ToolIndex:
+    """
+    A BM25 index over the names, descriptions and parameter schemas of tools,
+    to put only the tools relevant to the current goal into the prompt.
+
+    Runs locally, without embeddings or network calls. Names weigh more than
+    descriptions and parameters.
+    """
+
+    def __init__(
+        self,
+        tools: Iterable[McpToolDefinition] = (),
+        *,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self._k1 = k1
+        self._b = b
+        self._tools: list[McpToolDefinition] = []
+        self._doc_lengths: list[int] = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self.add(tools)
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def add(self, tools: Iterable[McpToolDefinition]) -> None:
+        for tool in tools:
+            terms = Counter[str]()
+            for token in _tokenize(tool.name):
+                terms[token] += _NAME_WEIGHT
+            for token in _tokenize(tool.description):
+                terms[token] += _DESCRIPTION_WEIGHT
+            for text in _schema_text(tool.parameters_json_schema):
+                for token in _tokenize(text):
+                    terms[token] += _PARAMETER_WEIGHT
+            doc = len(self._tools)
+            self._tools.append(tool)
+            self._doc_lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, []).append((doc, frequency))
+
+    def search(
+        self, query: str, *, top_k: int = 10
+    ) -> list[tuple[McpToolDefinition, float]]:
+        """Returns up to `top_k` tools matching `query`, best first, with their score."""
+        if not self._tools:
+            return []
+        n_docs = len(self._tools)
+        avg_length = sum(self._doc_lengths) / n_docs or 1.0
+        scores: dict[int, float] = {}
+        for term in set(_tokenize(query)):
+            if not (postings := self._postings.get(term)):
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, frequency in postings:
+                length_norm = (
+                    1 - self._b + self._b * self._doc_lengths[doc] / avg_length
+                )
+                scores[doc] = scores.get(doc, 0.0) + idf * (
+                    frequency * (self._k1 + 1) / (frequency + self._k1 * length_norm)
+                )
+        # Ties keep the order the tools were added in
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        return [(self._tools[doc], score) for doc, score in best]
+
+    def include(
+        self,
+        query: str,
+        *,
+        top_k: int = 10,
+        always_include: Iterable[str] = (),
+    ) -> Callable[[McpToolDefinition], bool]:
+        """
+        Returns a filter for `ActionRunner.b_(include=...)`/`ActionRunner.tb`
+        that keeps the `top_k` tools matching `query` and the tools named in
+        `always_include` (e.g. a "stop" action). If no tool matches the query,
+        all tools are kept. Names are compared as action ids, so "getWeather"
+        and "get_weather" name the same tool.
+        """
+        names = {
+            pascal_to_snake(tool.name) for tool, _ in self.search(query, top_k=top_k)
+        }
+        if not names:
+            return lambda _: True
+        names.update(pascal_to_snake(name) for name in always_include)
+        return lambda tool: pascal_to_snake(tool.name) in names
@@ -3,11 +3,24 @@ import inspect
 from collections.abc import Callable, Sequence
 from typing import Any, Generic, Self, TypeVar
 
-from baml_agents._baml_client_proxy._hook_engine import HookEngineAsync, HookEngineSync
+from baml_agents._baml_client_proxy._batch import BamlBatchClientProxy
+from baml_agents._baml_client_proxy._function_binder import (
+    BamlFunctionBinder,
+    find_default_baml_options_attr,
+)
+from baml_agents._baml_client_proxy._hook_engine import (
+    DEFAULT_MAX_CALL_ATTEMPTS,
+    HookEngineAsync,
+    HookEngineSync,
+)
+from baml_agents._baml_client_proxy._hook_plan import HookPlan
 from baml_agents._baml_client_proxy._hooks._base_hook import BaseBamlHook
-from baml_agents._baml_client_proxy._hooks._types import Mutable
+from baml_agents._baml_client_proxy._streaming import (
+    BamlStreamClientProxy,
+    PartialHookPolicy,
+)
+from baml_agents._utils._lru_cache import LruCache
 from baml_agents._utils._merge_dicts_no_overlap import merge_dicts_no_overlap
-from baml_agents._utils._sole import sole
 
 T_BamlClient = TypeVar("T_BamlClient")
 
@@ -18,29 +31,86 @@ class BamlClientProxy(Generic[T_BamlClient]):
     It distinguishes between regular and async methods and returns
     a corresponding wrapper that simply calls the original method.
     Non-callable attributes are returned directly.
+
+    With `cache_wrappers=True` (the default) each BAML function is resolved
+    and wrapped once per proxy and name, and the compiled wrapper is kept in
+    a bounded LRU cache that is dropped whenever the hook list changes.
+
+    `b.stream.Fn(...)` returns a stream that runs the before-call hooks, hands
+    every parsed partial to the OnPartialResponseParsed hooks (buffered as
+    configured by `partial_hook_policy`) and runs the after-call-success hooks
+    on the final response. Errors of streams are passed to the error hooks, but
+    can't be recovered from.
+
+    A call is retried for a `RetryCall` of an error hook up to
+    `max_call_attempts` calls in total, then the error is raised.
+
+    `b.batch.Fn(items, ...)` calls the BAML function once per item with bounded
+    concurrency and optional rate limiting, see `BamlBatchClientProxy`.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         b: T_BamlClient,
         /,
         *,
         hooks: Sequence[BaseBamlHook] | None = None,
         root_target: T_BamlClient | None = None,
+        cache_wrappers: bool = True,
+        max_cached_wrappers: int = 256,
+        partial_hook_policy: PartialHookPolicy | None = None,
+        max_call_attempts: int | None = None,
     ):
         object.__setattr__(self, "_passthrough_target", b)
+        object.__setattr__(
+            self,
+            "_max_call_attempts",
+            DEFAULT_MAX_CALL_ATTEMPTS
+            if max_call_attempts is None
+            else max_call_attempts,
+        )
         object.__setattr__(self, "_hooks", hooks)
+        object.__setattr__(self, "_hook_plan", HookPlan.build(hooks) if hooks else None)
         object.__setattr__(self, "_root_target", root_target or b)
+        object.__setattr__(self, "_default_baml_options_attr", None)
+        object.__setattr__(
+            self, "_partial_hook_policy", partial_hook_policy or PartialHookPolicy()
+        )
+        object.__setattr__(
+            self,
+            "_wrapper_cache",
+            LruCache(max_cached_wrappers) if cache_wrappers else None,
+        )
 
-    def add_hooks(self, hooks: Sequence[BaseBamlHook]) -> Self:
+    def add_hooks(
+        self,
+        hooks: Sequence[BaseBamlHook],
+        *,
+        partial_hook_policy: PartialHookPolicy | None = None,
+        max_call_attempts: int | None = None,
+    ) -> Self:
+        if partial_hook_policy is not None:
+            object.__setattr__(self, "_partial_hook_policy", partial_hook_policy)
+        if max_call_attempts is not None:
+            object.__setattr__(self, "_max_call_attempts", max_call_attempts)
         current_hooks = object.__getattribute__(self, "_hooks")
         if current_hooks is None:
             object.__setattr__(self, "_hooks", hooks)
         else:
             object.__setattr__(self, "_hooks", current_hooks + hooks)
+        hooks = object.__getattribute__(self, "_hooks")
+        # Dispatch tables are derived once here, not on every call
+        object.__setattr__(self, "_hook_plan", HookPlan.build(hooks) if hooks else None)
+        if (cache := object.__getattribute__(self, "_wrapper_cache")) is not None:
+            cache.clear()
         return self
 
     def __getattribute__(self, name: str) -> Any:
+        # 0. Fast path: a wrapper compiled by an earlier access to this name.
+        cache = object.__getattribute__(self, "_wrapper_cache")
+        if cache is not None and (wrapper := cache.get(name)) is not None:
+            return wrapper
+
         # 1. Access internal attributes of the wrapper directly.
         # Use object.__getattribute__ to prevent recursion.
         if name == "request":
@@ -48,9 +118,11 @@ class BamlClientProxy(Generic[T_BamlClient]):
                 object.__getattribute__(self, "_passthrough_target").request,
                 hooks=object.__getattribute__(self, "_hooks"),
                 root_target=object.__getattribute__(self, "_passthrough_target"),
+                max_call_attempts=object.__getattribute__(self, "_max_call_attempts"),
             )
 
         if name in {
+            "batch",
             "parse_stream",
             "request",
             "stream",
@@ -96,29 +168,40 @@ class BamlClientProxy(Generic[T_BamlClient]):
         if name == "with_options" or not callable(attr):
             return attr
 
-        # 4. If the attribute is callable, determine if it's async or sync.
+        # 4. If the attribute is callable, wrap it (once, if caching is enabled).
+        wrapper = object.__getattribute__(self, "_compile_wrapper")(name, attr)
+        if cache is not None:
+            cache.set(name, wrapper)
+        return wrapper
+
+    def _compile_wrapper(self, name: str, attr: Callable) -> Callable:
+        # Analyse the signature once, not on every call.
+        binder = BamlFunctionBinder(attr)
+
+        # Determine once whether the BAML function is async or sync.
         if inspect.iscoroutinefunction(attr):
             # Create an ASYNC wrapper
             async def async_wrapper(*args, **kwargs):
                 params: dict[str, Any] = object.__getattribute__(
                     self, "_get_baml_function_params"
-                )(attr, args, kwargs)
+                )(binder, args, kwargs)
                 hook_engine = (
                     HookEngineAsync(
-                        hooks=hooks,
+                        plan=plan,
                         baml_function_name=name,
                         baml_function_params=params,
+                        max_attempts=object.__getattribute__(
+                            self, "_max_call_attempts"
+                        ),
                     )
-                    if (hooks := object.__getattribute__(self, "_hooks"))
+                    if (plan := object.__getattribute__(self, "_hook_plan"))
                     else None
                 )
 
                 if hook_engine:
                     await hook_engine.on_before_call()
 
-                    result = await attr(**hook_engine.params)
-
-                    await hook_engine.on_after_call_success(Mutable(value=result))
+                    result = await hook_engine.call(attr)
                 else:
                     result = await attr(*args, **kwargs)
 
@@ -131,25 +214,22 @@ class BamlClientProxy(Generic[T_BamlClient]):
         def sync_wrapper(*args, **kwargs):
             params: dict[str, Any] = object.__getattribute__(
                 self, "_get_baml_function_params"
-            )(attr, args, kwargs)
+            )(binder, args, kwargs)
             hook_engine = (
                 HookEngineSync(
-                    hooks=hooks,
+                    plan=plan,
                     baml_function_name=name,
                     baml_function_params=params,
+                    max_attempts=object.__getattribute__(self, "_max_call_attempts"),
                 )
-                if (hooks := object.__getattribute__(self, "_hooks"))
+                if (plan := object.__getattribute__(self, "_hook_plan"))
                 else None
             )
 
             if hook_engine:
                 hook_engine.on_before_call()
 
-                result = attr(**hook_engine.params)
-
-                mutable_result = Mutable(value=result)
-                hook_engine.on_after_call_success(mutable_result)
-                result = mutable_result.value
+                result = hook_engine.call(attr)
             else:
                 result = attr(*args, **kwargs)
 
@@ -177,29 +257,26 @@ class BamlClientProxy(Generic[T_BamlClient]):
 
     def _get_baml_function_params(
         self,
-        baml_function: Callable,
+        binder: BamlFunctionBinder,
         baml_function_args: tuple,
         baml_function_kwargs: dict,
     ) -> dict[str, Any]:
-        signature = inspect.signature(baml_function)
-        bound = signature.bind(*baml_function_args, **baml_function_kwargs)
-        bound.apply_defaults()
-
-        default_baml_options = sole(
-            getattr(object.__getattribute__(self, "_root_target"), attr)
-            for attr in dir(object.__getattribute__(self, "_root_target"))
-            if attr.endswith("__baml_options")
-        )
+        params = binder.bind(baml_function_args, baml_function_kwargs)
+
+        root_target = object.__getattribute__(self, "_root_target")
+        options_attr = object.__getattribute__(self, "_default_baml_options_attr")
+        if options_attr is None:
+            # Scanning dir() is slow, the attribute name never changes for a client
+            options_attr = find_default_baml_options_attr(root_target)
+            object.__setattr__(self, "_default_baml_options_attr", options_attr)
+
         baml_options = merge_dicts_no_overlap(
-            default_baml_options,
-            bound.arguments.get("baml_options", {}),
+            getattr(root_target, options_attr),
+            params.get("baml_options", {}),
             error_message="Overwriting baml options may lead to silently breaking behaviors from other hooks",
         )
-
-        return {
-            **bound.arguments,
-            "baml_options": baml_options,
-        }
+        params["baml_options"] = baml_options
+        return params
 
     def with_options(self, *__, **_):
         raise AttributeError(
@@ -216,7 +293,13 @@ class BamlClientProxy(Generic[T_BamlClient]):
 
     @property
     def stream(self) -> Any:
-        raise NotImplementedError("stream is not implemented in BamlClientProxy")
+        return BamlStreamClientProxy(
+            object.__getattribute__(self, "_passthrough_target").stream, proxy=self
+        )
+
+    @property
+    def batch(self) -> BamlBatchClientProxy:
+        return BamlBatchClientProxy(proxy=self)
 
     @property
     def stream_request(self) -> Any:
@@ -0,0 +1,155 @@
+import asyncio
+import inspect
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from baml_agents._utils._rate_limiter import TokenBucket, get_rate_limiter
+
+if TYPE_CHECKING:
+    from baml_agents._baml_client_proxy._baml_client_proxy import BamlClientProxy
+
+
+@dataclass(frozen=True)
+class BatchItemResult:
+    """Outcome of one item of a batch, either a `value` or an `error`."""
+
+    index: int
+    value: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _split_item(item: Any) -> tuple[tuple, dict[str, Any]]:
+    # A mapping holds keyword arguments, a tuple positional arguments and
+    # anything else is the single positional argument of the function.
+    if isinstance(item, Mapping):
+        return (), dict(item)
+    if isinstance(item, tuple):
+        return item, {}
+    return (item,), {}
+
+
+def _limiter(
+    requests_per_second: float | None, rate_limit_key: str, burst: int | None
+) -> TokenBucket | None:
+    if requests_per_second is None:
+        return None
+    return get_rate_limiter(rate_limit_key, requests_per_second, burst=burst)
+
+
+class BamlBatchClientProxy:
+    """
+    Available as `b.batch` on a proxied client. `b.batch.Fn(items, ...)` calls
+    `b.Fn` once per item, through the proxy so that hooks run per item.
+
+    At most `max_concurrency` calls are in flight, and with
+    `requests_per_second` the calls are rate limited. All batches with the same
+    `rate_limit_key` (e.g. the provider name) share one limit. Results come
+    back in the order of `items`. A failed item doesn't affect the others, its
+    error is kept in its `BatchItemResult`.
+
+    Batches of async clients are awaited, batches of sync clients run in a
+    thread pool.
+    """
+
+    def __init__(self, *, proxy: "BamlClientProxy"):
+        self._proxy = proxy
+
+    def __getattr__(self, name: str) -> Any:
+        proxy = self._proxy
+        cache = object.__getattribute__(proxy, "_wrapper_cache")
+        key = ("batch", name)
+        if cache is not None and (wrapper := cache.get(key)) is not None:
+            return wrapper
+
+        root_target = object.__getattribute__(proxy, "_root_target")
+        baml_function = getattr(root_target, name)
+        if not callable(baml_function):
+            raise TypeError(f"'{name}' is not a BAML function")
+        if inspect.iscoroutinefunction(baml_function):
+            wrapper = self._async_batch(name)
+        else:
+            wrapper = self._sync_batch(name)
+
+        if cache is not None:
+            cache.set(key, wrapper)
+        return wrapper
+
+    def _async_batch(self, name: str) -> Callable:
+        proxy = self._proxy
+
+        async def run_batch(
+            items: Sequence[Any],
+            *,
+            max_concurrency: int = 8,
+            requests_per_second: float | None = None,
+            rate_limit_key: str = "default",
+            burst: int | None = None,
+        ) -> list[BatchItemResult]:
+            fn = getattr(proxy, name)
+            semaphore = asyncio.Semaphore(max_concurrency)
+            limiter = _limiter(requests_per_second, rate_limit_key, burst)
+
+            async def run_item(index: int, item: Any) -> BatchItemResult:
+                args, kwargs = _split_item(item)
+                async with semaphore:
+                    if limiter is not None and (delay_s := limiter.reserve()) > 0:
+                        await asyncio.sleep(delay_s)
+                    try:
+                        return BatchItemResult(
+                            index=index, value=await fn(*args, **kwargs)
+                        )
+                    except Exception as e:  # noqa: BLE001
+                        return BatchItemResult(index=index, error=e)
+
+            return list(
+                await asyncio.gather(
+                    *(run_item(index, item) for index, item in enumerate(items))
+                )
+            )
+
+        return run_batch
+
+    def _sync_batch(self, name: str) -> Callable:
+        proxy = self._proxy
+
+        def run_batch(
+            items: Sequence[Any],
+            *,
+            max_concurrency: int = 8,
+            requests_per_second: float | None = None,
+            rate_limit_key: str = "default",
+            burst: int | None = None,
+        ) -> list[BatchItemResult]:
+            fn = getattr(proxy, name)
+            limiter = _limiter(requests_per_second, rate_limit_key, burst)
+
+            def run_item(index: int, item: Any) -> BatchItemResult:
+                args, kwargs = _split_item(item)
+                if limiter is not None and (delay_s := limiter.reserve()) > 0:
+                    time.sleep(delay_s)
+                try:
+                    return BatchItemResult(index=index, value=fn(*args, **kwargs))
+                except Exception as e:  # noqa: BLE001
+                    return BatchItemResult(index=index, error=e)
+
+            with ThreadPoolExecutor(
+                max_workers=max_concurrency, thread_name_prefix=f"baml-batch-{name}"
+            ) as executor:
+                return list(executor.map(run_item, range(len(items)), items))
+
+        return run_batch
+
+    def __repr__(self):
+        return f"<BamlBatchClientProxy for {self._proxy!r}>"
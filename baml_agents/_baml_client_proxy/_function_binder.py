@@ -0,0 +1,89 @@
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from baml_agents._utils._sole import sole
+
+_BINDABLE_KINDS = (
+    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+    inspect.Parameter.KEYWORD_ONLY,
+)
+
+
+class BamlFunctionBinder:
+    """
+    Binds call arguments of a generated BAML function to a params dict.
+
+    Equivalent to `inspect.signature(fn).bind(*args, **kwargs)` followed by
+    `apply_defaults()`, but the signature is analysed once (parameter order,
+    defaults, which parameters accept positional values) so that binding a
+    call is a couple of dict operations.
+    """
+
+    __slots__ = (
+        "_defaults",
+        "_max_positional",
+        "_name_set",
+        "_names",
+        "_signature",
+    )
+
+    def __init__(self, baml_function: Callable):
+        signature = inspect.signature(baml_function)
+        parameters = list(signature.parameters.values())
+
+        if any(p.kind not in _BINDABLE_KINDS for p in parameters):
+            # Positional-only, *args and **kwargs are never generated by BAML,
+            # keep the exact (slow) path for them
+            self._signature: inspect.Signature | None = signature
+        else:
+            self._signature = None
+
+        self._names: tuple[str, ...] = tuple(p.name for p in parameters)
+        self._defaults: dict[str, Any] = {
+            p.name: p.default
+            for p in parameters
+            if p.default is not inspect.Parameter.empty
+        }
+        self._name_set: frozenset[str] = frozenset(self._names)
+        self._max_positional = sum(
+            p.kind is not inspect.Parameter.KEYWORD_ONLY for p in parameters
+        )
+
+    def bind(self, args: tuple, kwargs: dict[str, Any]) -> dict[str, Any]:
+        if self._signature is not None:
+            bound = self._signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return dict(bound.arguments)
+
+        if len(args) > self._max_positional:
+            raise TypeError("too many positional arguments")
+
+        names = self._names
+        params = dict(zip(names, args, strict=False))
+        used_kwargs = 0
+        for name in names[len(args) :]:
+            if name in kwargs:
+                params[name] = kwargs[name]
+                used_kwargs += 1
+            elif name in self._defaults:
+                params[name] = self._defaults[name]
+            else:
+                raise TypeError(f"missing a required argument: {name!r}")
+
+        if used_kwargs != len(kwargs):
+            for name in kwargs:
+                if name not in self._name_set:
+                    raise TypeError(f"got an unexpected keyword argument {name!r}")
+            positional_name = next(n for n in names[: len(args)] if n in kwargs)
+            raise TypeError(f"multiple values for argument {positional_name!r}")
+
+        return params
+
+
+def find_default_baml_options_attr(baml_client: Any) -> str:
+    """
+    Returns the name of the (name-mangled) attribute where a generated BAML
+    client keeps the options set via `with_options`, e.g. `_BamlSyncClient__baml_options`.
+    """
+    return sole(attr for attr in dir(baml_client) if attr.endswith("__baml_options"))
@@ -1,107 +1,272 @@
-from collections.abc import Sequence
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
 from typing import Any
 
+from loguru import logger
+
+from baml_agents._baml_client_proxy._hook_plan import HookPlan
 from baml_agents._baml_client_proxy._hooks._base_hook import (
     BaseBamlHook,
-    BaseBamlHookAsync,
     BaseBamlHookContext,
 )
-from baml_agents._baml_client_proxy._hooks._implementations._with_options import (
-    WithOptions,
-)
 from baml_agents._baml_client_proxy._hooks._on_after_call_success_hook import (
-    OnAfterCallSuccessHookAsync,
     OnAfterCallSuccessHookContext,
-    OnAfterCallSuccessHookSync,
 )
 from baml_agents._baml_client_proxy._hooks._on_before_call_hook import (
-    OnBeforeCallHookAsync,
     OnBeforeCallHookContext,
-    OnBeforeCallHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._on_error_hook import (
+    ErrorRecovery,
+    OnErrorHookContext,
+    RetryCall,
+    ReturnValue,
+)
+from baml_agents._baml_client_proxy._hooks._on_partial_response_parsed_hook import (
+    OnPartialResponseParsedHookContext,
 )
 from baml_agents._baml_client_proxy._hooks._types import Mutable
 
+# Calls per BAML function call, the first one included, however often the
+# error hooks ask for a RetryCall
+DEFAULT_MAX_CALL_ATTEMPTS = 10
+
 
 class BaseHookEngine:
     def __init__(
         self,
         *,
-        hooks: Sequence["BaseBamlHook"],
+        hooks: Sequence["BaseBamlHook"] = (),
         baml_function_name: str,
         baml_function_params: dict,
+        plan: HookPlan | None = None,
+        max_attempts: int = DEFAULT_MAX_CALL_ATTEMPTS,
     ):
-        self._hooks: list[BaseBamlHook] = [hook() for hook in hooks]
-
-        # Move WithOptions to the start of the list
-        # Because otherwise it might overwrite baml options set by other hooks
-        # leading to silent bugs and unexpected behavior
-        self._hooks.sort(key=lambda hook: not isinstance(hook, WithOptions))
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self._max_attempts = max_attempts
+        if plan is None:
+            plan = HookPlan.build(hooks)
+        self._plan = plan.for_call()
 
+        # One context per call, the per-phase contexts are derived from it
         self._ctx = BaseBamlHookContext(
             baml_function_name=baml_function_name,
             baml_function_return_type=str,
         )
         self._mutable_params: dict[str, Any] = baml_function_params
+        self._before_call_ctx: OnBeforeCallHookContext | None = None
 
     @property
     def params(self) -> dict[str, Any]:
         return self._mutable_params
 
+    @property
+    def has_provided_result(self) -> bool:
+        """Whether a before-call hook supplied the result of the call."""
+        return self._before_call_ctx is not None and self._before_call_ctx.has_result
+
+    @property
+    def provided_result(self) -> Any:
+        if self._before_call_ctx is None:
+            raise ValueError("No result was provided by a before-call hook")
+        return self._before_call_ctx.provided_result
+
+    @property
+    def has_partial_hooks(self) -> bool:
+        return bool(self._plan.on_partial_response_parsed)
+
+    def _error_context(self, error: Exception, attempt: int) -> OnErrorHookContext:
+        return OnErrorHookContext.from_base_context(
+            ctx=self._ctx, error=error, attempt=attempt
+        )
+
+    def _check_recovery(self, recovery: Mutable, attempt: int) -> ErrorRecovery | None:
+        if recovery.value is not None and not isinstance(
+            recovery.value, RetryCall | ReturnValue
+        ):
+            raise TypeError(
+                "Error hooks must set recovery.value to None, RetryCall or "
+                f"ReturnValue, got {type(recovery.value).__name__}"
+            )
+        if isinstance(recovery.value, RetryCall) and attempt >= self._max_attempts:
+            logger.warning(
+                "Not retrying, the BAML function failed too often",
+                baml_function_name=self._ctx.baml_function_name,
+                attempts=attempt,
+            )
+            return None
+        return recovery.value
+
+    def _ignore_recovery(self, recovery: ErrorRecovery | None) -> None:
+        if recovery is not None:
+            logger.warning(
+                "Ignoring the recovery of an error hook, streams can't be recovered",
+                baml_function_name=self._ctx.baml_function_name,
+                recovery=type(recovery).__name__,
+            )
+
 
 class HookEngineSync(BaseHookEngine):
     def __init__(
         self,
         *,
-        hooks: Sequence["BaseBamlHook"],
+        hooks: Sequence["BaseBamlHook"] = (),
         baml_function_name: str,
         baml_function_params: dict,
+        plan: HookPlan | None = None,
+        max_attempts: int = DEFAULT_MAX_CALL_ATTEMPTS,
     ):
-        for hook in hooks:
-            if isinstance(hook, BaseBamlHookAsync):
-                raise TypeError(
-                    f"Async hook ({type(hook).__name__}) provided in a sync context "
-                    f"for function '{baml_function_name}'"
-                )
         super().__init__(
             hooks=hooks,
             baml_function_name=baml_function_name,
             baml_function_params=baml_function_params,
+            plan=plan,
+            max_attempts=max_attempts,
         )
+        if (hook := self._plan.first_async_hook()) is not None:
+            raise TypeError(
+                f"Async hook ({type(hook).__name__}) provided in a sync context "
+                f"for function '{baml_function_name}'"
+            )
 
     def on_before_call(self) -> None:
-        for hook in self._hooks:
-            if isinstance(hook, OnBeforeCallHookSync):
-                ctx = OnBeforeCallHookContext.from_base_context(ctx=self._ctx)
-                hook.on_before_call(ctx=ctx, params=self.params)
+        if not (methods := self._plan.on_before_call):
+            return
+        ctx = OnBeforeCallHookContext.from_base_context(ctx=self._ctx)
+        self._before_call_ctx = ctx
+        for method, _ in methods:
+            method(ctx=ctx, params=self.params)
 
     def on_after_call_success(self, result: Mutable) -> None:
-        for hook in self._hooks:
-            if isinstance(hook, OnAfterCallSuccessHookSync):
-                ctx = OnAfterCallSuccessHookContext.from_base_context(
-                    ctx=self._ctx, params=self.params
-                )
-                hook.on_after_call_success(ctx=ctx, result=result)
+        if not (methods := self._plan.on_after_call_success):
+            return
+        ctx = OnAfterCallSuccessHookContext.from_base_context(
+            ctx=self._ctx, params=self.params
+        )
+        for method, _ in methods:
+            method(ctx=ctx, result=result)
+
+    def on_partial_response_parsed(self, partial_result: Any) -> None:
+        ctx = OnPartialResponseParsedHookContext.from_base_context(
+            ctx=self._ctx, partial_result=partial_result
+        )
+        for method, _ in self._plan.on_partial_response_parsed:
+            method(ctx=ctx)
+
+    def on_error(self, error: Exception, *, attempt: int) -> ErrorRecovery | None:
+        recovery = Mutable(value=None)
+        if methods := self._plan.on_error:
+            ctx = self._error_context(error, attempt)
+            for method, _ in methods:
+                method(ctx=ctx, params=self.params, recovery=recovery)
+        return self._check_recovery(recovery, attempt)
+
+    def notify_error(self, error: Exception) -> None:
+        """Runs the error hooks for an error of a stream, ignoring their recovery."""
+        self._ignore_recovery(self.on_error(error, attempt=1))
+
+    def call(self, baml_function: Callable[..., Any]) -> Any:
+        """
+        Calls the BAML function with the hooked params. Failed calls go through
+        the error hooks, which may retry the call or provide a return value.
+        After `max_attempts` calls the error is raised, even if a hook asks
+        for another RetryCall.
+        After-success hooks run on successful responses and on results
+        provided by a before-call hook, not on a `ReturnValue` recovery.
+        """
+        if self.has_provided_result:
+            result = self.provided_result
+        else:
+            attempt = 0
+            while True:
+                try:
+                    result = baml_function(**self.params)
+                    break
+                except Exception as e:
+                    attempt += 1
+                    recovery = self.on_error(e, attempt=attempt)
+                    if recovery is None:
+                        raise
+                    if isinstance(recovery, ReturnValue):
+                        return recovery.value
+                    if recovery.delay_s > 0:
+                        time.sleep(recovery.delay_s)
+
+        mutable_result = Mutable(value=result)
+        self.on_after_call_success(mutable_result)
+        return mutable_result.value
 
 
 class HookEngineAsync(BaseHookEngine):
     async def on_before_call(self) -> None:
-        for hook in self._hooks:
-            if isinstance(hook, OnBeforeCallHookSync):
-                ctx = OnBeforeCallHookContext.from_base_context(ctx=self._ctx)
-                hook.on_before_call(ctx=ctx, params=self.params)
-            if isinstance(hook, OnBeforeCallHookAsync):
-                ctx = OnBeforeCallHookContext.from_base_context(ctx=self._ctx)
-                await hook.on_before_call(ctx=ctx, params=self.params)
+        if not (methods := self._plan.on_before_call):
+            return
+        ctx = OnBeforeCallHookContext.from_base_context(ctx=self._ctx)
+        self._before_call_ctx = ctx
+        for method, is_async in methods:
+            if is_async:
+                await method(ctx=ctx, params=self.params)
+            else:
+                method(ctx=ctx, params=self.params)
 
     async def on_after_call_success(self, result: Mutable) -> None:
-        for hook in self._hooks:
-            if isinstance(hook, OnAfterCallSuccessHookSync):
-                ctx = OnAfterCallSuccessHookContext.from_base_context(
-                    ctx=self._ctx, params=self.params
-                )
-                hook.on_after_call_success(ctx=ctx, result=result)
-            if isinstance(hook, OnAfterCallSuccessHookAsync):
-                ctx = OnAfterCallSuccessHookContext.from_base_context(
-                    ctx=self._ctx, params=self.params
-                )
-                await hook.on_after_call_success(ctx=ctx, result=result)
+        if not (methods := self._plan.on_after_call_success):
+            return
+        ctx = OnAfterCallSuccessHookContext.from_base_context(
+            ctx=self._ctx, params=self.params
+        )
+        for method, is_async in methods:
+            if is_async:
+                await method(ctx=ctx, result=result)
+            else:
+                method(ctx=ctx, result=result)
+
+    async def on_partial_response_parsed(self, partial_result: Any) -> None:
+        ctx = OnPartialResponseParsedHookContext.from_base_context(
+            ctx=self._ctx, partial_result=partial_result
+        )
+        for method, is_async in self._plan.on_partial_response_parsed:
+            if is_async:
+                await method(ctx=ctx)
+            else:
+                method(ctx=ctx)
+
+    async def on_error(self, error: Exception, *, attempt: int) -> ErrorRecovery | None:
+        recovery = Mutable(value=None)
+        if methods := self._plan.on_error:
+            ctx = self._error_context(error, attempt)
+            for method, is_async in methods:
+                if is_async:
+                    await method(ctx=ctx, params=self.params, recovery=recovery)
+                else:
+                    method(ctx=ctx, params=self.params, recovery=recovery)
+        return self._check_recovery(recovery, attempt)
+
+    async def notify_error(self, error: Exception) -> None:
+        """Async counterpart of `HookEngineSync.notify_error`."""
+        self._ignore_recovery(await self.on_error(error, attempt=1))
+
+    async def call(self, baml_function: Callable[..., Awaitable[Any]]) -> Any:
+        """Async counterpart of `HookEngineSync.call`."""
+        if self.has_provided_result:
+            result = self.provided_result
+        else:
+            attempt = 0
+            while True:
+                try:
+                    result = await baml_function(**self.params)
+                    break
+                except Exception as e:
+                    attempt += 1
+                    recovery = await self.on_error(e, attempt=attempt)
+                    if recovery is None:
+                        raise
+                    if isinstance(recovery, ReturnValue):
+                        return recovery.value
+                    if recovery.delay_s > 0:
+                        await asyncio.sleep(recovery.delay_s)
+
+        mutable_result = Mutable(value=result)
+        await self.on_after_call_success(mutable_result)
+        return mutable_result.value
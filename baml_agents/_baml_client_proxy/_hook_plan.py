@@ -0,0 +1,111 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Self
+
+from baml_agents._baml_client_proxy._hooks._base_hook import (
+    BamlHookFactory,
+    BaseBamlHook,
+    BaseBamlHookAsync,
+)
+from baml_agents._baml_client_proxy._hooks._implementations._with_options import (
+    WithOptions,
+)
+from baml_agents._baml_client_proxy._hooks._on_after_call_success_hook import (
+    OnAfterCallSuccessHookAsync,
+    OnAfterCallSuccessHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._on_before_call_hook import (
+    OnBeforeCallHookAsync,
+    OnBeforeCallHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._on_error_hook import (
+    OnErrorHookAsync,
+    OnErrorHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._on_partial_response_parsed_hook import (
+    OnPartialResponseParsedHookAsync,
+    OnPartialResponseParsedHookSync,
+)
+
+# A bound hook method and whether it has to be awaited
+HookMethod = tuple[Callable, bool]
+
+
+def _methods(
+    hooks: Sequence[BaseBamlHook],
+    method_name: str,
+    sync_cls: type,
+    async_cls: type,
+) -> tuple[HookMethod, ...]:
+    methods: list[HookMethod] = []
+    for hook in hooks:
+        if isinstance(hook, sync_cls):
+            methods.append((getattr(hook, method_name), False))
+        if isinstance(hook, async_cls):
+            methods.append((getattr(hook, method_name), True))
+    return tuple(methods)
+
+
+@dataclass(frozen=True)
+class HookPlan:
+    """
+    Per-phase dispatch tables for a list of hooks, built once when the hooks
+    are attached to a proxy instead of being re-derived on every call.
+
+    Stateless hooks are shared by all calls. Hooks that are a `BamlHookFactory`
+    are instantiated per call by `for_call`, which then builds a fresh plan.
+    """
+
+    hooks: tuple[BaseBamlHook, ...]
+    on_before_call: tuple[HookMethod, ...]
+    on_after_call_success: tuple[HookMethod, ...]
+    on_partial_response_parsed: tuple[HookMethod, ...]
+    on_error: tuple[HookMethod, ...]
+    has_factories: bool
+
+    @classmethod
+    def build(cls, hooks: Sequence[BaseBamlHook]) -> Self:
+        # Move WithOptions to the start of the list
+        # Because otherwise it might overwrite baml options set by other hooks
+        # leading to silent bugs and unexpected behavior
+        ordered = tuple(
+            sorted(hooks, key=lambda hook: not isinstance(hook, WithOptions))
+        )
+        return cls(
+            hooks=ordered,
+            on_before_call=_methods(
+                ordered,
+                "on_before_call",
+                OnBeforeCallHookSync,
+                OnBeforeCallHookAsync,
+            ),
+            on_after_call_success=_methods(
+                ordered,
+                "on_after_call_success",
+                OnAfterCallSuccessHookSync,
+                OnAfterCallSuccessHookAsync,
+            ),
+            on_partial_response_parsed=_methods(
+                ordered,
+                "on_partial_response_parsed",
+                OnPartialResponseParsedHookSync,
+                OnPartialResponseParsedHookAsync,
+            ),
+            on_error=_methods(
+                ordered,
+                "on_error",
+                OnErrorHookSync,
+                OnErrorHookAsync,
+            ),
+            has_factories=any(isinstance(h, BamlHookFactory) for h in ordered),
+        )
+
+    def for_call(self) -> Self:
+        if not self.has_factories:
+            return self
+        return self.build(
+            [h() if isinstance(h, BamlHookFactory) else h for h in self.hooks]
+        )
+
+    def first_async_hook(self) -> BaseBamlHook | None:
+        return next((h for h in self.hooks if isinstance(h, BaseBamlHookAsync)), None)
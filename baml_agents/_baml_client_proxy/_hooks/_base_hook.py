@@ -1,21 +1,27 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Any, Self
 
-from pydantic import BaseModel, ConfigDict, Field
 
-
-class BaseBamlHookContext(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BaseBamlHookContext:
     baml_function_name: str
     baml_function_return_type: type
 
     # Shared mutable state dictionary for communication between hooks
-    shared_state_between_hooks: dict[str, Any] = Field(default_factory=dict)
-
-    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+    shared_state_between_hooks: dict[str, Any] = field(default_factory=dict)
 
     @classmethod
-    def from_base_context(cls, *, ctx: "BaseBamlHookContext") -> Self:
-        return cls(**ctx.model_dump())
+    def from_base_context(cls, *, ctx: "BaseBamlHookContext", **fields: Any) -> Self:
+        # Contexts are frozen, so the per-call ones are cheap to derive and are
+        # shared by all hooks of a phase. The shared state dict is passed by
+        # reference so that it really is shared between the phases of a call.
+        return cls(
+            baml_function_name=ctx.baml_function_name,
+            baml_function_return_type=ctx.baml_function_return_type,
+            shared_state_between_hooks=ctx.shared_state_between_hooks,
+            **fields,
+        )
 
 
 class BaseBamlHook:
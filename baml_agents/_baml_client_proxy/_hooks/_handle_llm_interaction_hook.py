@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any, final
 
 from baml_agents._baml_client_proxy._hooks._base_hook import (
@@ -12,6 +13,7 @@ PartialCallback = Callable[[Any], Awaitable[None]] | None
 
 
 @final
+@dataclass(frozen=True, slots=True, kw_only=True)
 class HandleLlmInteractionHookContext(BaseBamlHookContext):
     pass
 
@@ -0,0 +1,53 @@
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from baml_py import ClientRegistry
+
+from baml_agents._baml_client_proxy._hooks._implementations._retry_with_backoff import (
+    is_transient_baml_error,
+)
+from baml_agents._baml_client_proxy._hooks._on_error_hook import (
+    OnErrorHookContext,
+    OnErrorHookSync,
+    RetryCall,
+)
+from baml_agents._baml_client_proxy._hooks._types import Mutable
+
+
+class FallbackClients(OnErrorHookSync):
+    """
+    Retries a failed call with the next client registry in `fallbacks`, e.g.
+    one created with `make_client_registry`.
+
+    Place it after `RetryWithBackoff` to switch clients only once the retries
+    on the current client are exhausted.
+    """
+
+    def __init__(
+        self,
+        fallbacks: Sequence[ClientRegistry],
+        *,
+        fallback_if: Callable[[Exception], bool] = is_transient_baml_error,
+    ) -> None:
+        super().__init__()
+        self._fallbacks = tuple(fallbacks)
+        self._fallback_if = fallback_if
+        self._state_key = f"{type(self).__name__}:{id(self)}:next_fallback"
+
+    def on_error(
+        self,
+        *,
+        ctx: OnErrorHookContext,
+        params: dict[str, Any],
+        recovery: Mutable,
+        **_: Any,
+    ) -> None:
+        if recovery.value is not None or not self._fallback_if(ctx.error):
+            return
+        next_fallback = ctx.shared_state_between_hooks.get(self._state_key, 0)
+        if next_fallback >= len(self._fallbacks):
+            return
+        ctx.shared_state_between_hooks[self._state_key] = next_fallback + 1
+
+        params["baml_options"]["client_registry"] = self._fallbacks[next_fallback]
+        recovery.value = RetryCall()
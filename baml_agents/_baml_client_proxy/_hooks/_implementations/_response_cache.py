@@ -0,0 +1,138 @@
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from baml_agents._baml_client_proxy._hooks._on_after_call_success_hook import (
+    OnAfterCallSuccessHookContext,
+    OnAfterCallSuccessHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._on_before_call_hook import (
+    OnBeforeCallHookContext,
+    OnBeforeCallHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._types import Mutable
+from baml_agents._baml_clients._with_baml_client import client_registry_identity
+from baml_agents._utils._cache_store import CacheStore, MemoryCacheStore
+from baml_agents._utils._canonical_key import canonical_params_key
+
+
+def default_client_identity(baml_options: Mapping[str, Any]) -> str | None:
+    """
+    Identifies the client and output types from the BAML options of a call.
+
+    A ClientRegistry can't be inspected, only the primary client of those
+    created by `make_client_registry` (and so `with_baml_client`/`with_model`)
+    is known. For other registries this returns None.
+    """
+    registry = None
+    if (cr := baml_options.get("client_registry")) is not None:
+        registry = client_registry_identity(cr)
+        if registry is None:
+            return None
+    type_builder = baml_options.get("tb") or baml_options.get("type_builder")
+    return repr(
+        (
+            baml_options.get("client"),
+            registry,
+            str(type_builder) if type_builder is not None else None,
+        )
+    )
+
+
+class ResponseCacheHook(OnBeforeCallHookSync, OnAfterCallSuccessHookSync):
+    """
+    Caches the results of BAML function calls. On a hit the BAML function is
+    not called at all.
+
+    The key covers the function name, the bound params (independent of their
+    order), `client_identity(baml_options)` and `namespace`. Calls whose
+    client can't be identified (`client_identity` returns None, e.g. for a
+    hand-made ClientRegistry) aren't cached, unless `namespace` is set to
+    tell them apart.
+    """
+
+    def __init__(
+        self,
+        store: CacheStore | None = None,
+        *,
+        namespace: str = "",
+        ttl_s: float | None = None,
+        client_identity: Callable[[Mapping[str, Any]], str | None] = (
+            default_client_identity
+        ),
+    ) -> None:
+        super().__init__()
+        self._store = store if store is not None else MemoryCacheStore()
+        self._namespace = namespace
+        self._ttl_s = ttl_s
+        self._client_identity = client_identity
+        self._state_key = f"{type(self).__name__}:{id(self)}"
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self._hits + self._misses
+        return self._hits / total if total else 0.0
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def _key(self, baml_function_name: str, params: Mapping[str, Any]) -> str | None:
+        client = self._client_identity(params.get("baml_options") or {})
+        if client is None and not self._namespace:
+            return None
+        return canonical_params_key(
+            baml_function_name,
+            {
+                "params": {k: v for k, v in params.items() if k != "baml_options"},
+                "client": client,
+                "namespace": self._namespace,
+            },
+        )
+
+    def on_before_call(
+        self,
+        *,
+        ctx: OnBeforeCallHookContext,
+        params: dict[str, Any],
+    ) -> None:
+        key = self._key(ctx.baml_function_name, params)
+        if key is None:
+            ctx.shared_state_between_hooks[self._state_key] = (None, False)
+            return
+        hit, value = self._store.get(key)
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        ctx.shared_state_between_hooks[self._state_key] = (key, hit)
+        if hit:
+            ctx.provide_result(value)
+
+    def on_after_call_success(
+        self,
+        *,
+        ctx: OnAfterCallSuccessHookContext,
+        result: Mutable,
+    ) -> None:
+        key, hit = ctx.shared_state_between_hooks[self._state_key]
+        if hit or key is None:
+            return
+        # Keyed on the options the result came from, they change if e.g.
+        # FallbackClients switched to another client registry
+        key = self._key(ctx.baml_function_name, ctx.params)
+        if key is not None:
+            self._store.set(key, result.value, ttl_s=self._ttl_s)
@@ -0,0 +1,75 @@
+import random
+from collections.abc import Callable
+from typing import Any
+
+from baml_py.errors import BamlClientHttpError, BamlTimeoutError
+
+from baml_agents._baml_client_proxy._hooks._on_error_hook import (
+    OnErrorHookContext,
+    OnErrorHookSync,
+    RetryCall,
+)
+from baml_agents._baml_client_proxy._hooks._types import Mutable
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429})
+
+
+def is_transient_baml_error(error: Exception) -> bool:
+    """Timeouts, rate limits and server errors, i.e. errors worth retrying."""
+    if isinstance(error, BamlTimeoutError):
+        return True
+    if isinstance(error, BamlClientHttpError):
+        status_code = getattr(error, "status_code", None)
+        return status_code is not None and (
+            status_code in RETRYABLE_STATUS_CODES or status_code >= 500  # noqa: PLR2004
+        )
+    return False
+
+
+class RetryWithBackoff(OnErrorHookSync):
+    """
+    Retries failed calls with exponential backoff and jitter.
+
+    The delay before retry n (starting at 0) is
+    `min(max_delay_s, initial_delay_s * multiplier**n)`, randomized by
+    `±jitter`. Only errors for which `retry_if` returns True are retried.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        max_retries: int = 3,
+        initial_delay_s: float = 1.0,
+        max_delay_s: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.1,
+        retry_if: Callable[[Exception], bool] = is_transient_baml_error,
+    ) -> None:
+        super().__init__()
+        self._max_retries = max_retries
+        self._initial_delay_s = initial_delay_s
+        self._max_delay_s = max_delay_s
+        self._multiplier = multiplier
+        self._jitter = jitter
+        self._retry_if = retry_if
+        self._state_key = f"{type(self).__name__}:{id(self)}:retries"
+
+    def on_error(
+        self,
+        *,
+        ctx: OnErrorHookContext,
+        recovery: Mutable,
+        **_: Any,
+    ) -> None:
+        if recovery.value is not None or not self._retry_if(ctx.error):
+            return
+        retries = ctx.shared_state_between_hooks.get(self._state_key, 0)
+        if retries >= self._max_retries:
+            return
+        ctx.shared_state_between_hooks[self._state_key] = retries + 1
+
+        delay_s = min(
+            self._max_delay_s, self._initial_delay_s * self._multiplier**retries
+        )
+        delay_s *= 1 + random.uniform(-self._jitter, self._jitter)  # noqa: S311
+        recovery.value = RetryCall(delay_s=max(0.0, delay_s))
@@ -0,0 +1,70 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+from baml_agents._baml_client_proxy._hooks._implementations._retry_with_backoff import (
+    is_transient_baml_error,
+)
+from baml_agents._baml_client_proxy._hooks._on_after_call_success_hook import (
+    OnAfterCallSuccessHookContext,
+    OnAfterCallSuccessHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._on_error_hook import (
+    OnErrorHookContext,
+    OnErrorHookSync,
+    ReturnValue,
+)
+from baml_agents._baml_client_proxy._hooks._types import Mutable
+from baml_agents._utils._canonical_key import canonical_params_key
+from baml_agents._utils._lru_cache import LruCache
+
+
+class ReturnCachedOnError(OnAfterCallSuccessHookSync, OnErrorHookSync):
+    """
+    Remembers the last successful response per function and arguments, and
+    returns it when the same call fails later, instead of raising.
+
+    Responses older than `max_age_s` are not returned. Add it after retry and
+    fallback hooks so that it only kicks in once they gave up.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_age_s: float | None = None,
+        return_if: Callable[[Exception], bool] = is_transient_baml_error,
+    ) -> None:
+        super().__init__()
+        self._responses: LruCache[str, tuple[float, Any]] = LruCache(max_entries)
+        self._max_age_s = max_age_s
+        self._return_if = return_if
+
+    def on_after_call_success(
+        self,
+        *,
+        ctx: OnAfterCallSuccessHookContext,
+        result: Mutable,
+    ) -> None:
+        key = canonical_params_key(ctx.baml_function_name, ctx.params)
+        self._responses.set(key, (time.monotonic(), result.value))
+
+    def on_error(
+        self,
+        *,
+        ctx: OnErrorHookContext,
+        params: dict[str, Any],
+        recovery: Mutable,
+    ) -> None:
+        if recovery.value is not None or not self._return_if(ctx.error):
+            return
+        key = canonical_params_key(ctx.baml_function_name, params)
+        if (cached := self._responses.get(key)) is None:
+            return
+        stored_at, value = cached
+        if (
+            self._max_age_s is not None
+            and time.monotonic() - stored_at > self._max_age_s
+        ):
+            return
+        recovery.value = ReturnValue(value=value)
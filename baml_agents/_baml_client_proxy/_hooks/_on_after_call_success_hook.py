@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
 from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, Self, final
 
-from frozendict import frozendict
-
 from baml_agents._baml_client_proxy._hooks._base_hook import (
     BaseBamlHookAsync,
     BaseBamlHookContext,
@@ -13,14 +13,21 @@ from baml_agents._baml_client_proxy._hooks._types import Mutable
 
 
 @final
+@dataclass(frozen=True, slots=True, kw_only=True)
 class OnAfterCallSuccessHookContext(BaseBamlHookContext):
-    params: frozendict[str, Any]
+    # Read-only view of the params the BAML function was called with
+    params: Mapping[str, Any]
 
     @classmethod
     def from_base_context(
         cls, *, ctx: "BaseBamlHookContext", params: Mapping[str, Any]
     ) -> Self:
-        return cls(**ctx.model_dump(), params=frozendict(params))
+        return cls(
+            baml_function_name=ctx.baml_function_name,
+            baml_function_return_type=ctx.baml_function_return_type,
+            shared_state_between_hooks=ctx.shared_state_between_hooks,
+            params=MappingProxyType(params),
+        )
 
 
 class OnAfterCallSuccessHookAsync(BaseBamlHookAsync, ABC):
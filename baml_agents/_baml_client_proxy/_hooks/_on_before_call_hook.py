@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Any, final
 
 from baml_agents._baml_client_proxy._hooks._base_hook import (
@@ -6,11 +7,34 @@ from baml_agents._baml_client_proxy._hooks._base_hook import (
     BaseBamlHookContext,
     BaseBamlHookSync,
 )
+from baml_agents._baml_client_proxy._hooks._types import Mutable
+
+_NO_RESULT = object()
 
 
 @final
+@dataclass(frozen=True, slots=True, kw_only=True)
 class OnBeforeCallHookContext(BaseBamlHookContext):
-    pass
+    _provided_result: Mutable = field(
+        default_factory=lambda: Mutable(value=_NO_RESULT), repr=False
+    )
+
+    def provide_result(self, value: Any) -> None:
+        """
+        Supplies the result of the call, so that the BAML function (and the
+        LLM behind it) is not called. After-success hooks still run.
+        """
+        self._provided_result.value = value
+
+    @property
+    def has_result(self) -> bool:
+        return self._provided_result.value is not _NO_RESULT
+
+    @property
+    def provided_result(self) -> Any:
+        if not self.has_result:
+            raise ValueError("No result was provided by a before-call hook")
+        return self._provided_result.value
 
 
 class OnBeforeCallHookAsync(BaseBamlHookAsync, ABC):
@@ -1,21 +1,77 @@
 from abc import ABC, abstractmethod
-from typing import final
+from dataclasses import dataclass
+from typing import Any, final
 
-from baml_agents._baml_client_proxy._hooks._base_hook import BaseBamlHookContext
+from baml_agents._baml_client_proxy._hooks._base_hook import (
+    BaseBamlHookAsync,
+    BaseBamlHookContext,
+    BaseBamlHookSync,
+)
+from baml_agents._baml_client_proxy._hooks._types import Mutable
 
 
 @final
+@dataclass(frozen=True, slots=True, kw_only=True)
 class OnErrorHookContext(BaseBamlHookContext):
     error: Exception
+    # 1 for the first failed call, 2 if the first retry failed as well, etc.
+    attempt: int
 
 
-class OnErrorHookAsync(ABC):
+@dataclass(frozen=True, slots=True)
+class RetryCall:
+    """Call the BAML function again, with the current params, after `delay_s`."""
+
+    delay_s: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class ReturnValue:
+    """Return `value` to the caller instead of raising the error."""
+
+    value: Any
+
+
+ErrorRecovery = RetryCall | ReturnValue
+
+
+class OnErrorHookAsync(BaseBamlHookAsync, ABC):
     @abstractmethod
-    async def on_error(self, *, ctx: OnErrorHookContext) -> None:
-        pass
+    async def on_error(
+        self,
+        *,
+        ctx: OnErrorHookContext,
+        params: dict[str, Any],
+        recovery: Mutable,
+    ) -> None:
+        """
+        Called when the BAML function raised. `recovery.value` starts as None,
+        which re-raises the error. Set it to a `RetryCall` or a `ReturnValue`
+        to recover. Hooks run in order and see the decision of earlier hooks.
 
+        Errors of `b.stream.Fn(...)` only notify the hooks: partials may
+        already have been handed out, so the stream can be neither retried
+        nor replaced by a value. Their recovery is ignored and the error is
+        raised to the caller.
+        """
 
-class OnErrorHookSync(ABC):
+
+class OnErrorHookSync(BaseBamlHookSync, ABC):
     @abstractmethod
-    def on_error(self, *, ctx: OnErrorHookContext) -> None:
-        pass
+    def on_error(
+        self,
+        *,
+        ctx: OnErrorHookContext,
+        params: dict[str, Any],
+        recovery: Mutable,
+    ) -> None:
+        """
+        Called when the BAML function raised. `recovery.value` starts as None,
+        which re-raises the error. Set it to a `RetryCall` or a `ReturnValue`
+        to recover. Hooks run in order and see the decision of earlier hooks.
+
+        Errors of `b.stream.Fn(...)` only notify the hooks: partials may
+        already have been handed out, so the stream can be neither retried
+        nor replaced by a value. Their recovery is ignored and the error is
+        raised to the caller.
+        """
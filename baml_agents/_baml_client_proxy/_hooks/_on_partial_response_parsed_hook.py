@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Any, final
 
 from baml_agents._baml_client_proxy._hooks._base_hook import (
@@ -9,6 +10,7 @@ from baml_agents._baml_client_proxy._hooks._base_hook import (
 
 
 @final
+@dataclass(frozen=True, slots=True, kw_only=True)
 class OnPartialResponseParsedHookContext(BaseBamlHookContext):
     partial_result: Any
 
@@ -0,0 +1,447 @@
+import asyncio
+import inspect
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from baml_agents._baml_client_proxy._function_binder import BamlFunctionBinder
+from baml_agents._baml_client_proxy._hook_engine import HookEngineAsync, HookEngineSync
+from baml_agents._baml_client_proxy._hooks._types import Mutable
+
+if TYPE_CHECKING:
+    from baml_agents._baml_client_proxy._baml_client_proxy import BamlClientProxy
+
+OnFullBuffer = Literal["block", "drop_oldest", "drop_newest"]
+
+_UNSET = object()
+
+
+@dataclass(frozen=True)
+class PartialHookPolicy:
+    """
+    How partial responses are handed to OnPartialResponseParsed hooks.
+
+    Partial hooks run off the token stream: in a worker thread for sync
+    clients and in a task for async clients. Up to `max_buffer` partials wait
+    for slow hooks. Once the buffer is full, `on_full` decides whether the
+    stream waits for the hooks ("block") or whether the oldest or the newest
+    partial is dropped. Partials are cumulative, so dropping the oldest one
+    loses no data that a later partial won't also contain.
+    """
+
+    max_buffer: int = 64
+    on_full: OnFullBuffer = "drop_oldest"
+
+    def __post_init__(self):
+        if self.max_buffer < 1:
+            raise ValueError(f"max_buffer must be at least 1, got {self.max_buffer}")
+        if self.on_full not in {"block", "drop_oldest", "drop_newest"}:
+            raise ValueError(f"Unknown on_full policy: {self.on_full!r}")
+
+
+class _PartialDispatcherSync:
+    def __init__(self, dispatch: Callable[[Any], None], policy: PartialHookPolicy):
+        self._dispatch = dispatch
+        self._policy = policy
+        self._buffer: deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+
+    def put(self, partial: Any) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="baml-partial-hooks", daemon=True
+                )
+                self._thread.start()
+            while len(self._buffer) >= self._policy.max_buffer:
+                if self._error is not None:
+                    return
+                if self._policy.on_full == "block":
+                    self._cond.wait()
+                elif self._policy.on_full == "drop_oldest":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                else:
+                    self.dropped += 1
+                    return
+            if self._error is None:
+                self._buffer.append(partial)
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buffer and not self._closed:
+                    self._cond.wait()
+                if not self._buffer:
+                    return
+                partial = self._buffer.popleft()
+                self._cond.notify_all()
+            try:
+                self._dispatch(partial)
+            except BaseException as e:  # noqa: BLE001
+                with self._cond:
+                    self._error = e
+                    self._buffer.clear()
+                    self._cond.notify_all()
+                return
+
+    def close(self, *, raise_error: bool = True) -> None:
+        """Waits until all buffered partials were handled."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        if raise_error and self._error is not None:
+            raise self._error
+
+
+class _PartialDispatcherAsync:
+    def __init__(
+        self, dispatch: Callable[[Any], Awaitable[None]], policy: PartialHookPolicy
+    ):
+        self._dispatch = dispatch
+        self._policy = policy
+        self._buffer: deque[Any] = deque()
+        self._cond = asyncio.Condition()
+        self._closed = False
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    async def put(self, partial: Any) -> None:
+        async with self._cond:
+            if self._task is None:
+                self._task = asyncio.create_task(self._run())
+            while len(self._buffer) >= self._policy.max_buffer:
+                if self._error is not None:
+                    return
+                if self._policy.on_full == "block":
+                    await self._cond.wait()
+                elif self._policy.on_full == "drop_oldest":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                else:
+                    self.dropped += 1
+                    return
+            if self._error is None:
+                self._buffer.append(partial)
+                self._cond.notify_all()
+
+    async def _run(self) -> None:
+        while True:
+            async with self._cond:
+                while not self._buffer and not self._closed:
+                    await self._cond.wait()
+                if not self._buffer:
+                    return
+                partial = self._buffer.popleft()
+                self._cond.notify_all()
+            try:
+                await self._dispatch(partial)
+            except Exception as e:  # noqa: BLE001
+                async with self._cond:
+                    self._error = e
+                    self._buffer.clear()
+                    self._cond.notify_all()
+                return
+
+    async def close(self, *, raise_error: bool = True) -> None:
+        """Waits until all buffered partials were handled."""
+        async with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._task is not None:
+            await self._task
+        if raise_error and self._error is not None:
+            raise self._error
+
+
+class _ProvidedResultSyncStream:
+    """Stands in for the BAML stream when a before-call hook provided the result."""
+
+    def __init__(self, result: Any):
+        self._result = result
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(())
+
+    def get_final_response(self) -> Any:
+        return self._result
+
+
+class _ProvidedResultAsyncStream:
+    """Async counterpart of `_ProvidedResultSyncStream`."""
+
+    def __init__(self, result: Any):
+        self._result = result
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        return
+        yield
+
+    async def get_final_response(self) -> Any:
+        return self._result
+
+
+class HookedSyncStream:
+    """
+    Wraps a `BamlSyncStream` of a proxied client.
+
+    The stream is created lazily, after the before-call hooks ran, so that they
+    can still change the params. Partial hooks see every parsed partial and
+    after-success hooks see the final response. Errors of the stream are
+    passed to the error hooks, whose recovery is ignored, and raised to the
+    caller.
+    """
+
+    def __init__(
+        self,
+        *,
+        create_stream: Callable[[dict[str, Any]], Any],
+        hook_engine: HookEngineSync,
+        policy: PartialHookPolicy,
+    ):
+        self._create_stream = create_stream
+        self._hook_engine = hook_engine
+        self._policy = policy
+        self._stream: Any = None
+        self._consumed = False
+        self._final: Any = _UNSET
+        # The error the error hooks were called for, it may be raised again
+        self._notified: Exception | None = None
+        self.dropped_partials = 0
+
+    def _notify_error(self, error: Exception) -> None:
+        if error is not self._notified:
+            self._notified = error
+            self._hook_engine.notify_error(error)
+
+    def _start(self) -> Any:
+        if self._stream is None:
+            self._hook_engine.on_before_call()
+            if self._hook_engine.has_provided_result:
+                self._stream = _ProvidedResultSyncStream(
+                    self._hook_engine.provided_result
+                )
+            else:
+                try:
+                    self._stream = self._create_stream(self._hook_engine.params)
+                except Exception as e:
+                    self._notify_error(e)
+                    raise
+        return self._stream
+
+    def _partials(self, stream: Any) -> Iterator[Any]:
+        partials = iter(stream)
+        while True:
+            try:
+                partial = next(partials)
+            except StopIteration:
+                return
+            except Exception as e:
+                self._notify_error(e)
+                raise
+            yield partial
+
+    def __iter__(self) -> Iterator[Any]:
+        stream = self._partials(self._start())
+        if not self._hook_engine.has_partial_hooks:
+            yield from stream
+            self._consumed = True
+            return
+
+        dispatcher = _PartialDispatcherSync(
+            self._hook_engine.on_partial_response_parsed, self._policy
+        )
+        try:
+            for partial in stream:
+                dispatcher.put(partial)
+                yield partial
+        except BaseException:
+            dispatcher.close(raise_error=False)
+            raise
+        finally:
+            self.dropped_partials = dispatcher.dropped
+        dispatcher.close()
+        self._consumed = True
+
+    def get_final_response(self) -> Any:
+        if self._final is _UNSET:
+            if self._hook_engine.has_partial_hooks and not self._consumed:
+                # Drive the stream ourselves so that the partial hooks still fire
+                for _ in self:
+                    pass
+            try:
+                result = self._start().get_final_response()
+            except Exception as e:
+                self._notify_error(e)
+                raise
+            mutable_result = Mutable(value=result)
+            self._hook_engine.on_after_call_success(mutable_result)
+            self._final = mutable_result.value
+        return self._final
+
+
+class HookedAsyncStream:
+    """Async counterpart of `HookedSyncStream`, wrapping a `BamlStream`."""
+
+    def __init__(
+        self,
+        *,
+        create_stream: Callable[[dict[str, Any]], Any],
+        hook_engine: HookEngineAsync,
+        policy: PartialHookPolicy,
+    ):
+        self._create_stream = create_stream
+        self._hook_engine = hook_engine
+        self._policy = policy
+        self._stream: Any = None
+        self._consumed = False
+        self._final: Any = _UNSET
+        # The error the error hooks were called for, it may be raised again
+        self._notified: Exception | None = None
+        self.dropped_partials = 0
+
+    async def _notify_error(self, error: Exception) -> None:
+        if error is not self._notified:
+            self._notified = error
+            await self._hook_engine.notify_error(error)
+
+    async def _start(self) -> Any:
+        if self._stream is None:
+            await self._hook_engine.on_before_call()
+            if self._hook_engine.has_provided_result:
+                self._stream = _ProvidedResultAsyncStream(
+                    self._hook_engine.provided_result
+                )
+            else:
+                try:
+                    self._stream = self._create_stream(self._hook_engine.params)
+                except Exception as e:
+                    await self._notify_error(e)
+                    raise
+        return self._stream
+
+    async def _partials(self, stream: Any) -> AsyncIterator[Any]:
+        partials = aiter(stream)
+        while True:
+            try:
+                partial = await anext(partials)
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                await self._notify_error(e)
+                raise
+            yield partial
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        stream = self._partials(await self._start())
+        if not self._hook_engine.has_partial_hooks:
+            async for partial in stream:
+                yield partial
+            self._consumed = True
+            return
+
+        dispatcher = _PartialDispatcherAsync(
+            self._hook_engine.on_partial_response_parsed, self._policy
+        )
+        try:
+            async for partial in stream:
+                await dispatcher.put(partial)
+                yield partial
+        except BaseException:
+            await dispatcher.close(raise_error=False)
+            raise
+        finally:
+            self.dropped_partials = dispatcher.dropped
+        await dispatcher.close()
+        self._consumed = True
+
+    async def get_final_response(self) -> Any:
+        if self._final is _UNSET:
+            if self._hook_engine.has_partial_hooks and not self._consumed:
+                # Drive the stream ourselves so that the partial hooks still fire
+                async for _ in self:
+                    pass
+            stream = await self._start()
+            try:
+                result = await stream.get_final_response()
+            except Exception as e:
+                await self._notify_error(e)
+                raise
+            mutable_result = Mutable(value=result)
+            await self._hook_engine.on_after_call_success(mutable_result)
+            self._final = mutable_result.value
+        return self._final
+
+
+class BamlStreamClientProxy:
+    """
+    Stands in for `b.stream` of a proxied client: `b.stream.Fn(...)` returns
+    a hooked stream instead of the raw BAML stream.
+    """
+
+    def __init__(self, stream_client: Any, *, proxy: "BamlClientProxy"):
+        self._stream_client = stream_client
+        self._proxy = proxy
+
+    def __getattr__(self, name: str) -> Any:
+        proxy = self._proxy
+        cache = object.__getattribute__(proxy, "_wrapper_cache")
+        key = ("stream", name)
+        if cache is not None and (wrapper := cache.get(key)) is not None:
+            return wrapper
+
+        attr = getattr(self._stream_client, name)
+        if not callable(attr):
+            return attr
+
+        root_target = object.__getattribute__(proxy, "_root_target")
+        is_async = inspect.iscoroutinefunction(getattr(root_target, name, None))
+        binder = BamlFunctionBinder(attr)
+
+        def stream_wrapper(*args, **kwargs):
+            plan = object.__getattribute__(proxy, "_hook_plan")
+            if plan is None:
+                return attr(*args, **kwargs)
+            params = object.__getattribute__(proxy, "_get_baml_function_params")(
+                binder, args, kwargs
+            )
+            policy = object.__getattribute__(proxy, "_partial_hook_policy")
+            if is_async:
+                return HookedAsyncStream(
+                    create_stream=lambda p: attr(**p),
+                    hook_engine=HookEngineAsync(
+                        plan=plan,
+                        baml_function_name=name,
+                        baml_function_params=params,
+                    ),
+                    policy=policy,
+                )
+            return HookedSyncStream(
+                create_stream=lambda p: attr(**p),
+                hook_engine=HookEngineSync(
+                    plan=plan,
+                    baml_function_name=name,
+                    baml_function_params=params,
+                ),
+                policy=policy,
+            )
+
+        if cache is not None:
+            cache.set(key, stream_wrapper)
+        return stream_wrapper
+
+    def __repr__(self):
+        return f"<BamlStreamClientProxy wrapping {self._stream_client!r}>"
@@ -6,6 +6,7 @@ if TYPE_CHECKING:
     from collections.abc import Sequence
 
     from baml_agents._baml_client_proxy._hooks._base_hook import BaseBamlHook
+    from baml_agents._baml_client_proxy._streaming import PartialHookPolicy
 
 T_BamlClient = TypeVar("T_BamlClient")
 
@@ -13,6 +14,9 @@ T_BamlClient = TypeVar("T_BamlClient")
 def with_hooks(
     b: T_BamlClient,
     hooks: "Sequence[BaseBamlHook]",
+    *,
+    partial_hook_policy: "PartialHookPolicy | None" = None,
+    max_call_attempts: int | None = None,
 ) -> T_BamlClient:
     """
     Applies lifecycle hooks to a BAML client instance by wrapping it.
@@ -20,6 +24,10 @@ def with_hooks(
     Args:
         b: The original baml_client instance.
         hooks: A list of BamlHook instances.
+        partial_hook_policy: How partial responses of `b.stream.Fn(...)` are
+            buffered for OnPartialResponseParsed hooks.
+        max_call_attempts: How often a call is made at most when error hooks
+            ask for a RetryCall, the first call included (default 10).
 
     Returns:
         A BamlClient wrapper instance that provides the same interface
@@ -27,5 +35,14 @@ def with_hooks(
 
     """
     if isinstance(b, BamlClientProxy):
-        return b.add_hooks(hooks)
-    return BamlClientProxy(b, hooks=hooks)  # type: ignore
+        return b.add_hooks(
+            hooks,
+            partial_hook_policy=partial_hook_policy,
+            max_call_attempts=max_call_attempts,
+        )
+    return BamlClientProxy(
+        b,
+        hooks=hooks,
+        partial_hook_policy=partial_hook_policy,
+        max_call_attempts=max_call_attempts,
+    )  # type: ignore
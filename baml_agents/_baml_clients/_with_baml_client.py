@@ -1,9 +1,62 @@
+import hashlib
+import json
+import threading
 from typing import TypeVar
 
 from baml_py import ClientRegistry
 
 T = TypeVar("T")
 
+# A ClientRegistry can't be inspected, weakly referenced, given attributes or
+# subclassed. So `make_client_registry` creates one registry per distinct
+# provider and options, keyed by a hash of them, and returns it for all calls
+# with the same content. The registries are never dropped, so their ids stay
+# unique and identify them.
+_registries: dict[str, ClientRegistry] = {}
+_identities: dict[int, str] = {}
+_registries_lock = threading.Lock()
+
+
+def client_registry_identity(cr: ClientRegistry) -> str | None:
+    """
+    Identifies the primary client of a registry created by
+    `make_client_registry` (a hash of its name, provider and options), or None
+    for any other registry.
+    """
+    return _identities.get(id(cr))
+
+
+def make_client_registry(*, provider: str, options: dict) -> ClientRegistry:
+    """
+    Returns a ClientRegistry whose primary client is `provider/options["model"]`.
+
+    Calls with the same provider and options share one registry, don't add
+    clients to it.
+    """
+    if "model" not in options:
+        raise ValueError("Options must contain a 'model' key.")
+    model = options["model"]
+    name = f"{provider}/{model}"
+    content = json.dumps(
+        {"primary": name, "provider": provider, "options": options},
+        sort_keys=True,
+        default=repr,
+    )
+    # Hashed, the options may hold API keys
+    identity = hashlib.sha256(content.encode()).hexdigest()
+    with _registries_lock:
+        if (cr := _registries.get(identity)) is None:
+            cr = ClientRegistry()
+            cr.add_llm_client(
+                name=name,
+                provider=provider,
+                options=options,
+            )
+            cr.set_primary(name)
+            _registries[identity] = cr
+            _identities[id(cr)] = identity
+    return cr
+
 
 def with_baml_client(
     b: T,
@@ -11,15 +64,5 @@ def with_baml_client(
     provider: str,
     options: dict,
 ) -> T:
-    cr = ClientRegistry()
-    if "model" not in options:
-        raise ValueError("Options must contain a 'model' key.")
-    model = options["model"]
-    name = f"{provider}/{model}"
-    cr.add_llm_client(
-        name=name,
-        provider=provider,
-        options=options,
-    )
-    cr.set_primary(name)
+    cr = make_client_registry(provider=provider, options=options)
     return b.with_options(client_registry=cr)  # type: ignore
@@ -0,0 +1,251 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+from baml_agents._utils._lru_cache import LruCache
+
+
+class CacheStore(ABC):
+    """A key-value store for cached values with optional expiry."""
+
+    @abstractmethod
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns `(True, value)` on a hit and `(False, None)` on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, *, ttl_s: float | None = None) -> None:
+        """Stores `value`, expiring after `ttl_s` (or the store's default TTL)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryCacheStore(CacheStore):
+    """In-process LRU store. Values are kept as is, not copied."""
+
+    def __init__(self, *, max_entries: int = 1024, ttl_s: float | None = None):
+        self._entries: LruCache[str, tuple[float | None, Any]] = LruCache(max_entries)
+        self._ttl_s = ttl_s
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        if (entry := self._entries.get(key)) is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._entries.pop(key)
+            return False, None
+        return True, value
+
+    def set(self, key: str, value: Any, *, ttl_s: float | None = None) -> None:
+        ttl_s = ttl_s if ttl_s is not None else self._ttl_s
+        expires_at = time.monotonic() + ttl_s if ttl_s is not None else None
+        self._entries.set(key, (expires_at, value))
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCacheStore(CacheStore):
+    """
+    On-disk store backed by a single SQLite file. Values are pickled. Several
+    threads and processes can share the same file; the connection is opened on
+    first use and again in forked children, as SQLite connections can't be
+    carried across a fork.
+
+    Least recently used entries are evicted once the store grows past
+    `max_entries`. To keep writes cheap, eviction runs after every
+    `max_entries // 10` writes, so the store can briefly exceed its limit.
+    To keep reads from writing, the access times of hits are written in
+    batches (and before each eviction), so evictions by other processes can
+    miss the latest reads of this one.
+    """
+
+    _TOUCH_BATCH = 256
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_entries: int = 10_000,
+        ttl_s: float | None = None,
+    ):
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._ttl_s = ttl_s
+        self._evict_every = max(1, max_entries // 10)
+        self._writes_since_eviction = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        # Connections opened before a fork, kept open in the child: closing
+        # their file would drop the child's own locks on the database
+        self._inherited: list[sqlite3.Connection] = []
+        # Access times of hits not yet written, see _flush_touches
+        self._touched: dict[str, float] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Called with `self._lock` held."""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        if self._conn is not None:
+            self._inherited.append(self._conn)
+            self._touched.clear()
+        conn = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None
+        )
+        # WAL lets readers in other processes proceed while one process writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache(accessed_at)"
+        )
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            value, expires_at = row
+            if expires_at is not None and now >= expires_at:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._touched.pop(key, None)
+                return False, None
+            self._touched[key] = now
+            if len(self._touched) >= self._TOUCH_BATCH:
+                self._flush_touches(conn)
+        return True, pickle.loads(value)  # noqa: S301
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        """Writes the pending access times in one transaction."""
+        if not self._touched:
+            return
+        touched = [(t, k) for k, t in self._touched.items()]
+        self._touched.clear()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "UPDATE cache SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                touched,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def set(self, key: str, value: Any, *, ttl_s: float | None = None) -> None:
+        now = time.time()
+        ttl_s = ttl_s if ttl_s is not None else self._ttl_s
+        expires_at = now + ttl_s if ttl_s is not None else None
+        blob = pickle.dumps(value)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, expires_at, now),
+            )
+            self._touched.pop(key, None)
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self._evict_every:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        self._writes_since_eviction = 0
+        self._flush_touches(conn)
+        conn.execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        )
+        conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._touched.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM cache")
+            self._touched.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None or self._pid != os.getpid():
+                return
+            self._flush_touches(self._conn)
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            return conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class TieredCacheStore(CacheStore):
+    """
+    Reads from a fast `front` store (usually a `MemoryCacheStore`) and falls
+    back to a shared `back` store (usually a `SqliteCacheStore`), copying hits
+    from the back into the front. Writes go to both.
+
+    Entries copied into the front use the front's default TTL, so give the
+    front a TTL no longer than the back's. The front is per process: deletes
+    made by other processes only show up once the front entry expires.
+    """
+
+    def __init__(self, front: CacheStore, back: CacheStore):
+        self._front = front
+        self._back = back
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        hit, value = self._front.get(key)
+        if hit:
+            return hit, value
+        hit, value = self._back.get(key)
+        if hit:
+            self._front.set(key, value)
+        return hit, value
+
+    def set(self, key: str, value: Any, *, ttl_s: float | None = None) -> None:
+        self._back.set(key, value, ttl_s=ttl_s)
+        self._front.set(key, value, ttl_s=ttl_s)
+
+    def delete(self, key: str) -> None:
+        self._front.delete(key)
+        self._back.delete(key)
+
+    def clear(self) -> None:
+        self._front.clear()
+        self._back.clear()
@@ -0,0 +1,45 @@
+import hashlib
+import json
+from collections.abc import Mapping
+from collections.abc import Set as AbstractSet
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def _to_jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, BaseModel):
+        return _to_jsonable(value.model_dump(mode="json"))
+    if isinstance(value, Enum):
+        return _to_jsonable(value.value)
+    if isinstance(value, Mapping):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, AbstractSet):
+        return sorted((_to_jsonable(v) for v in value), key=repr)
+    if isinstance(value, list | tuple):
+        return [_to_jsonable(v) for v in value]
+    return repr(value)
+
+
+def canonical_params_key(
+    baml_function_name: str,
+    params: Mapping[str, Any],
+    *,
+    exclude: AbstractSet[str] = frozenset({"baml_options"}),
+) -> str:
+    """
+    A stable sha256 key for a BAML function call, independent of the dict order
+    of the params. Pydantic models and enums are keyed by their JSON value.
+    """
+    payload = json.dumps(
+        [
+            baml_function_name,
+            {k: _to_jsonable(v) for k, v in params.items() if k not in exclude},
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
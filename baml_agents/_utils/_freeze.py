@@ -0,0 +1,58 @@
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, TypeVar, overload
+
+from frozendict import frozendict
+
+T = TypeVar("T")
+
+
+def freeze(value: Any) -> Any:
+    """Returns a read-only copy of a JSON value: frozendicts and tuples."""
+    if isinstance(value, Mapping):
+        return frozendict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list | tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Returns a mutable copy of a (frozen) JSON value: dicts and lists."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class SequenceView(Sequence[T]):
+    """A read-only view of a list, which reflects later changes to it."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: list[T]):
+        self._items = items
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SequenceView):
+            other = other._items
+        return isinstance(other, Sequence) and list(self._items) == list(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._items!r})"
@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter usable from threads and from asyncio.
+
+    `reserve()` takes a token and returns how long the caller has to wait
+    before using it, so the waiting happens outside of the lock with either
+    `time.sleep` or `asyncio.sleep`.
+    """
+
+    def __init__(self, rate_per_s: float, *, burst: int | None = None):
+        if rate_per_s <= 0:
+            raise ValueError(f"rate_per_s must be positive, got {rate_per_s}")
+        self._rate_per_s = rate_per_s
+        self._capacity = float(burst if burst is not None else max(1, int(rate_per_s)))
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate_per_s(self) -> float:
+        return self._rate_per_s
+
+    @property
+    def burst(self) -> int:
+        return int(self._capacity)
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._updated_at) * self._rate_per_s,
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate_per_s
+
+
+_rate_limiters: dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    key: str, rate_per_s: float, *, burst: int | None = None
+) -> TokenBucket:
+    """
+    Returns the process-wide limiter for `key`, so that all callers using the
+    same key (e.g. a provider name) share one budget. The limiter is replaced
+    if `rate_per_s` or `burst` changed.
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        requested = TokenBucket(rate_per_s, burst=burst)
+        if limiter is None or (limiter.rate_per_s, limiter.burst) != (
+            requested.rate_per_s,
+            requested.burst,
+        ):
+            limiter = _rate_limiters[key] = requested
+        return limiter
@@ -0,0 +1,25 @@
+from baml_py import BamlRuntime
+from baml_py.type_builder import TypeBuilder
+
+_RUNTIME = BamlRuntime.from_files(
+    "baml_src", {"baml_src/bench.baml": "class NextAction {\n  @@dynamic\n}\n"}, {}
+)
+
+
+class _OutputClass:
+    def __init__(self, tb: TypeBuilder, name: str):
+        self._bldr = tb._tb.class_(name)  # noqa: SLF001
+
+    def add_property(self, name: str, type_):
+        return self._bldr.property(name).type(type_)
+
+
+class BenchTypeBuilder(TypeBuilder):
+    """Mimics a generated TypeBuilder with one dynamic class."""
+
+    def __init__(self):
+        super().__init__(classes={"NextAction"}, enums=set(), runtime=_RUNTIME)
+
+    @property
+    def NextAction(self) -> _OutputClass:  # noqa: N802
+        return _OutputClass(self, "NextAction")
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Any
+
+
+class FakeSyncStream:
+    """Mimics `baml_py.BamlSyncStream`: yields growing partials of `text`."""
+
+    def __init__(self, text: str, token_delay_s: float):
+        self._text = text
+        self._token_delay_s = token_delay_s
+
+    def __iter__(self):
+        for i in range(1, len(self._text) + 1):
+            if self._token_delay_s:
+                time.sleep(self._token_delay_s)
+            yield self._text[:i]
+
+    def get_final_response(self) -> str:
+        return self._text
+
+
+class FakeAsyncStream:
+    """Mimics `baml_py.BamlStream`: yields growing partials of `text`."""
+
+    def __init__(self, text: str, token_delay_s: float):
+        self._text = text
+        self._token_delay_s = token_delay_s
+
+    async def __aiter__(self):
+        for i in range(1, len(self._text) + 1):
+            await asyncio.sleep(self._token_delay_s)
+            yield self._text[:i]
+
+    async def get_final_response(self) -> str:
+        return self._text
+
+
+class BamlStreamClient:
+    def __init__(self, token_delay_s: float, *, is_async: bool):
+        self.token_delay_s = token_delay_s
+        self._is_async = is_async
+
+    def Classify(  # noqa: N802
+        self,
+        text: str,
+        labels: list[str] | None = None,
+        baml_options: dict[str, Any] = {},  # noqa: B006
+    ) -> FakeSyncStream | FakeAsyncStream:
+        stream_cls = FakeAsyncStream if self._is_async else FakeSyncStream
+        return stream_cls(text if labels is None else labels[0], self.token_delay_s)
+
+
+class BamlSyncClient:
+    """Mimics the surface of a generated sync `baml_client` used by the proxy."""
+
+    def __init__(
+        self,
+        baml_options: dict[str, Any] | None = None,
+        *,
+        token_delay_s: float = 0.0,
+    ):
+        self.__baml_options = baml_options or {}
+        self.__stream_client = BamlStreamClient(token_delay_s, is_async=False)
+
+    @property
+    def stream(self) -> BamlStreamClient:
+        return self.__stream_client
+
+    def Classify(  # noqa: N802
+        self,
+        text: str,
+        labels: list[str] | None = None,
+        baml_options: dict[str, Any] = {},  # noqa: B006
+    ) -> str:
+        return text if labels is None else labels[0]
+
+
+class BamlAsyncClient:
+    """Mimics the surface of a generated async `baml_client` used by the proxy."""
+
+    def __init__(
+        self,
+        baml_options: dict[str, Any] | None = None,
+        *,
+        token_delay_s: float = 0.0,
+    ):
+        self.__baml_options = baml_options or {}
+        self.__stream_client = BamlStreamClient(token_delay_s, is_async=True)
+
+    @property
+    def stream(self) -> BamlStreamClient:
+        return self.__stream_client
+
+    async def Classify(  # noqa: N802
+        self,
+        text: str,
+        labels: list[str] | None = None,
+        baml_options: dict[str, Any] = {},  # noqa: B006
+    ) -> str:
+        return text if labels is None else labels[0]
@@ -0,0 +1,99 @@
+"""
+Minimal MCP server speaking newline-delimited JSON-RPC over stdio.
+
+Tools: `echo(text)` and `add(a, b)`. `tools/list` is paginated, one tool per
+page, to exercise cursor handling. With `--crash-after N` the process exits
+after answering N tool calls, to exercise reconnects.
+
+Run it with: python -m benchmarks._stub_mcp_server
+"""
+
+import argparse
+import json
+import sys
+
+TOOLS = [
+    {
+        "name": "echo",
+        "description": "Returns the given text.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"text": {"type": "string"}},
+            "required": ["text"],
+        },
+    },
+    {
+        "name": "add",
+        "description": "Adds two numbers.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
+            "required": ["a", "b"],
+        },
+    },
+]
+
+
+def _text(text: str, *, is_error: bool = False) -> dict:
+    return {"content": [{"type": "text", "text": text}], "isError": is_error}
+
+
+def _call_tool(params: dict) -> dict:
+    arguments = params.get("arguments") or {}
+    if params["name"] == "echo":
+        return _text(str(arguments["text"]))
+    if params["name"] == "add":
+        return _text(str(arguments["a"] + arguments["b"]))
+    return _text(f"Unknown tool: {params['name']}", is_error=True)
+
+
+def _handle(message: dict) -> dict | None:
+    method = message.get("method")
+    if method == "initialize":
+        result = {
+            "protocolVersion": message["params"]["protocolVersion"],
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "stub", "version": "0"},
+        }
+    elif method == "tools/list":
+        page = int((message.get("params") or {}).get("cursor") or 0)
+        result = {"tools": TOOLS[page : page + 1]}
+        if page + 1 < len(TOOLS):
+            result["nextCursor"] = str(page + 1)
+    elif method == "tools/call":
+        result = _call_tool(message["params"])
+    elif method == "ping":
+        result = {}
+    elif "id" not in message:
+        return None
+    else:
+        return {
+            "jsonrpc": "2.0",
+            "id": message["id"],
+            "error": {"code": -32601, "message": "Method not found"},
+        }
+    return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--crash-after", type=int, default=None)
+    args = parser.parse_args()
+
+    calls = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if (response := _handle(message)) is None:
+            continue
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+        if message.get("method") == "tools/call":
+            calls += 1
+            if args.crash_after is not None and calls >= args.crash_after:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
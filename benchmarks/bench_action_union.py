@@ -0,0 +1,61 @@
+"""
+Compares building the action union of ActionRunner.tb from scratch on every
+call (as before) with replaying the per-tool recipes cached by ActionRunner.
+
+    python -m benchmarks.bench_action_union
+"""
+
+import time
+
+from baml_agents import Action, ActionRunner, Result
+from baml_agents._agent_tools._mcp_schema_to_type_builder._facade import (
+    add_available_actions,
+)
+from benchmarks._bench_type_builder import BenchTypeBuilder
+
+N_TOOLS = 80
+REPEATS = 50
+
+
+def _make_tool(i: int) -> type[Action]:
+    class Tool(Action):
+        """Searches something, with some filters and paging."""
+
+        query: str
+        limit: int = 10
+        tags: list[str] | None = None
+        exact: bool = False
+
+        def run(self) -> Result:
+            return Result(content="")
+
+    Tool.__name__ = f"SearchTool{i}"
+    return Tool
+
+
+def _per_call_ms(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main() -> None:
+    runner = ActionRunner(BenchTypeBuilder)
+    for i in range(N_TOOLS):
+        runner.add_action(_make_tool(i))
+    actions = runner.actions
+
+    rebuild = _per_call_ms(
+        lambda: add_available_actions("NextAction", actions, BenchTypeBuilder())
+    )
+    runner.tb("NextAction")  # Records the recipe
+    replay = _per_call_ms(lambda: runner.tb("NextAction"))
+
+    print(f"{N_TOOLS} tools, ms per ActionRunner.tb call")
+    print(f"{'rebuild':<10}{rebuild:>8.2f}")
+    print(f"{'replay':<10}{replay:>8.2f}{rebuild / replay:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
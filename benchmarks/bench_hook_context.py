@@ -0,0 +1,91 @@
+"""
+Cost of the hook dispatch of one call (before-call and after-call-success
+phases) with 1, 5 and 20 no-op hooks attached, without the BAML call itself.
+
+"legacy" reproduces the previous dispatch: pydantic contexts re-created via
+`model_dump()` for every hook and phase, with the params copied into a new
+`frozendict` for every after-call-success hook. "current" runs
+`HookEngineSync` as the proxy does, with the `HookPlan` built once per hook
+list: one frozen, slotted context per phase that all hooks share, with a
+read-only view of the params.
+"""
+
+import timeit
+from typing import Any
+
+from frozendict import frozendict
+from pydantic import BaseModel, ConfigDict, Field
+
+from baml_agents import OnAfterCallSuccessHookSync, OnBeforeCallHookSync
+from baml_agents._baml_client_proxy._hook_engine import HookEngineSync
+from baml_agents._baml_client_proxy._hook_plan import HookPlan
+from baml_agents._baml_client_proxy._hooks._types import Mutable
+
+N = 2_000
+PARAMS = {"text": "hello", "labels": ["a", "b"], "baml_options": {}}
+
+
+class _NoopHook(OnBeforeCallHookSync, OnAfterCallSuccessHookSync):
+    def on_before_call(self, *, ctx, params) -> None:
+        pass
+
+    def on_after_call_success(self, *, ctx, result) -> None:
+        pass
+
+
+class _LegacyBaseContext(BaseModel):
+    baml_function_name: str
+    baml_function_return_type: type
+    shared_state_between_hooks: dict[str, Any] = Field(default_factory=dict)
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
+
+class _LegacyBeforeContext(_LegacyBaseContext):
+    pass
+
+
+class _LegacyAfterContext(_LegacyBaseContext):
+    params: frozendict[str, Any]
+
+
+def _legacy(hooks: list[_NoopHook]) -> None:
+    params = dict(PARAMS)
+    base = _LegacyBaseContext(
+        baml_function_name="Classify", baml_function_return_type=str
+    )
+    for hook in hooks:
+        if isinstance(hook, OnBeforeCallHookSync):
+            ctx = _LegacyBeforeContext(**base.model_dump())
+            hook.on_before_call(ctx=ctx, params=params)
+    result = Mutable(value="hello")
+    for hook in hooks:
+        if isinstance(hook, OnAfterCallSuccessHookSync):
+            ctx = _LegacyAfterContext(**base.model_dump(), params=frozendict(params))
+            hook.on_after_call_success(ctx=ctx, result=result)
+
+
+def _current(plan: HookPlan) -> None:
+    engine = HookEngineSync(
+        plan=plan, baml_function_name="Classify", baml_function_params=dict(PARAMS)
+    )
+    engine.on_before_call()
+    engine.on_after_call_success(Mutable(value="hello"))
+
+
+def _per_call_us(fn) -> float:
+    return min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+
+
+def main() -> None:
+    print(f"{'hooks':>5}{'legacy us/call':>16}{'current us/call':>17}{'speedup':>9}")
+    for n_hooks in (1, 5, 20):
+        hooks = [_NoopHook() for _ in range(n_hooks)]
+        plan = HookPlan.build(hooks)
+        legacy = _per_call_us(lambda hooks=hooks: _legacy(hooks))
+        current = _per_call_us(lambda plan=plan: _current(plan))
+        print(f"{n_hooks:>5}{legacy:>16.2f}{current:>17.2f}{legacy / current:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Time of `json_schema_to_baml_source` against the size of synthetic schemas, to
+check that it scales linearly (constant µs per node):
+
+- wide: one object with many object properties, all with a nested object of
+  the same derived name, so most class names collide (`Address2`, ...)
+- deep: objects nested in objects, beyond Python's recursion limit
+- referenced: many `$defs` that each refer to the previous ones, and a root
+  that refers to all of them
+
+    python -m benchmarks.bench_json_schema_to_baml
+"""
+
+import time
+import warnings
+
+from baml_agents._agent_tools._json_schema_to_baml_source._facade import (
+    json_schema_to_baml_source,
+)
+
+SIZES = (500, 1_000, 2_000, 4_000)
+REFS_PER_DEF = 3
+
+
+def _wide(n: int) -> dict:
+    address = {"type": "object", "properties": {"street": {"type": "string"}}}
+    return {
+        "type": "object",
+        "properties": {
+            f"field_{i}": {
+                "type": "object",
+                "properties": {"address": address, "count": {"type": "integer"}},
+            }
+            for i in range(n)
+        },
+    }
+
+
+def _deep(n: int) -> dict:
+    node: dict = {"type": "string", "enum": ["leaf", "end"]}
+    for i in range(n):
+        node = {
+            "type": "object",
+            "properties": {f"level_{i}": node, "depth": {"type": "integer"}},
+            "required": [f"level_{i}"],
+        }
+    return node
+
+
+def _referenced(n: int) -> dict:
+    defs = {
+        f"Def{i}": {
+            "type": "object",
+            "title": f"Def{i}",
+            "properties": {
+                "name": {"type": "string"},
+                **{
+                    f"ref_{j}": {"$ref": f"#/$defs/Def{j}"}
+                    for j in range(max(0, i - REFS_PER_DEF), i)
+                },
+            },
+        }
+        for i in range(n)
+    }
+    return {
+        "type": "object",
+        "properties": {f"use_{i}": {"$ref": f"#/$defs/Def{i}"} for i in range(n)},
+        "$defs": defs,
+    }
+
+
+def main() -> None:
+    print(f"{'shape':<12}{'nodes':>7}{'ms':>10}{'µs/node':>10}")
+    for shape, make in (("wide", _wide), ("deep", _deep), ("referenced", _referenced)):
+        for n in SIZES:
+            schema = make(n)
+            start = time.perf_counter()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                json_schema_to_baml_source("Root", schema)
+            ms = (time.perf_counter() - start) * 1000
+            print(f"{shape:<12}{n:>7}{ms:>10.1f}{ms * 1000 / n:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
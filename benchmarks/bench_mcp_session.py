@@ -0,0 +1,64 @@
+"""
+Tool calls per second against a local stub MCP server.
+
+"new process per call" starts the server, does the MCP handshake and makes one
+call every time, which is what spawning `mcptools` per call amounts to (minus
+the `mcptools` process itself). If `mcptools` is installed, `call_tool` through
+it is measured as well. "persistent session" reuses one `McpStdioSession`.
+"""
+
+import shlex
+import sys
+import time
+
+from loguru import logger
+
+from baml_agents._agent_tools._mcp import call_tool
+from baml_agents._agent_tools._mcp_session import McpStdioSession
+from baml_agents._agent_tools._mcptools_utils import (
+    McpToolsNotFoundError,
+    find_mcptools_binary,
+)
+
+SERVER = shlex.join([sys.executable, "-m", "benchmarks._stub_mcp_server"])
+ARGS = {"text": "hello"}
+
+
+def _calls_per_s(call, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        call()
+    return n / (time.perf_counter() - start)
+
+
+def _new_process_per_call() -> None:
+    with McpStdioSession(SERVER) as session:
+        session.call_tool("echo", ARGS)
+
+
+def main() -> None:
+    logger.remove()
+    rows = {"new process per call": _calls_per_s(_new_process_per_call, 20)}
+
+    try:
+        find_mcptools_binary()
+    except McpToolsNotFoundError:
+        pass
+    else:
+        rows["mcptools per call"] = _calls_per_s(
+            lambda: call_tool("echo", ARGS, SERVER), 20
+        )
+
+    with McpStdioSession(SERVER) as session:
+        rows["persistent session"] = _calls_per_s(
+            lambda: session.call_tool("echo", ARGS), 2_000
+        )
+
+    baseline = rows["new process per call"]
+    print(f"{'variant':<24}{'calls/s':>10}{'speedup':>10}")
+    for label, calls_per_s in rows.items():
+        print(f"{label:<24}{calls_per_s:>10.1f}{calls_per_s / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
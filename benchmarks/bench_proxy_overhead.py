@@ -0,0 +1,46 @@
+"""
+Per-call overhead of calling a BAML function through `BamlClientProxy`.
+
+Compares the raw client, the proxy without wrapper caching (every attribute
+access rebuilds the wrapper) and the proxy with cached compiled wrappers.
+"""
+
+import timeit
+
+from baml_agents import BamlClientProxy, OnBeforeCallHookSync
+from benchmarks._fake_baml_client import BamlSyncClient
+
+N = 20_000
+
+
+class _NoopHook(OnBeforeCallHookSync):
+    def on_before_call(self, *, ctx, params) -> None:
+        pass
+
+
+def _per_call_us(fn) -> float:
+    return min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+
+
+def main() -> None:
+    raw = BamlSyncClient()
+    variants = {
+        "raw client": raw,
+        "proxy, no hooks": BamlClientProxy(raw, cache_wrappers=False),
+        "cached proxy, no hooks": BamlClientProxy(raw),
+        "proxy, 1 hook": BamlClientProxy(
+            raw, hooks=[_NoopHook()], cache_wrappers=False
+        ),
+        "cached proxy, 1 hook": BamlClientProxy(raw, hooks=[_NoopHook()]),
+    }
+    baseline = None
+    print(f"{'variant':<26}{'us/access':>10}{'us/call':>10}{'overhead':>12}")
+    for label, b in variants.items():
+        access_us = _per_call_us(lambda b=b: b.Classify)
+        us = _per_call_us(lambda b=b: b.Classify("hello"))
+        baseline = baseline if baseline is not None else us
+        print(f"{label:<26}{access_us:>10.2f}{us:>10.2f}{us - baseline:>+12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Latency a slow OnPartialResponseParsed hook adds to a proxied stream.
+
+The fake client emits 50 partials 1ms apart and the hook takes 5ms per partial.
+"inline" runs the hook in the consuming loop, which is what a stream without
+buffering would do. The other rows use `PartialHookPolicy` and report the time
+until the last partial reached the consumer and until the final response
+(which waits for the buffered hooks) was available.
+"""
+
+import time
+
+from baml_agents import OnPartialResponseParsedHookSync, PartialHookPolicy, with_hooks
+from benchmarks._fake_baml_client import BamlSyncClient
+
+TEXT = "x" * 50
+TOKEN_DELAY_S = 0.001
+HOOK_DELAY_S = 0.005
+
+
+class _SlowPartialHook(OnPartialResponseParsedHookSync):
+    def __init__(self):
+        self.calls = 0
+
+    def on_partial_response_parsed(self, *, ctx) -> None:
+        time.sleep(HOOK_DELAY_S)
+        self.calls += 1
+
+
+def _inline() -> tuple[float, float, int]:
+    hook = _SlowPartialHook()
+    start = time.perf_counter()
+    stream = BamlSyncClient(token_delay_s=TOKEN_DELAY_S).stream.Classify(TEXT)
+    for _ in stream:
+        hook.on_partial_response_parsed(ctx=None)
+    last_partial = time.perf_counter() - start
+    stream.get_final_response()
+    return last_partial, time.perf_counter() - start, hook.calls
+
+
+def _hooked(policy: PartialHookPolicy) -> tuple[float, float, int]:
+    hook = _SlowPartialHook()
+    b = with_hooks(
+        BamlSyncClient(token_delay_s=TOKEN_DELAY_S),
+        [hook],
+        partial_hook_policy=policy,
+    )
+    start = time.perf_counter()
+    stream = b.stream.Classify(TEXT)
+    for i, _ in enumerate(stream, 1):
+        if i == len(TEXT):
+            last_partial = time.perf_counter() - start
+    stream.get_final_response()
+    return last_partial, time.perf_counter() - start, hook.calls
+
+
+def main() -> None:
+    rows = {"inline": _inline}
+    for on_full in ("block", "drop_oldest", "drop_newest"):
+        policy = PartialHookPolicy(max_buffer=8, on_full=on_full)
+        rows[f"{on_full} (buffer 8)"] = lambda p=policy: _hooked(p)
+
+    print(f"{'variant':<24}{'last partial ms':>16}{'final ms':>10}{'hook calls':>12}")
+    for label, run in rows.items():
+        last_partial, final, calls = run()
+        print(f"{label:<24}{last_partial * 1e3:>16.1f}{final * 1e3:>10.1f}{calls:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Prompt size and TypeBuilder build time against catalog size, with all tools in
+the action union versus only the top-k tools selected by a ToolIndex.
+
+Prompt size is approximated by the size of the rendered TypeBuilder, which
+holds every tool's name, description and parameters.
+
+    python -m benchmarks.bench_tool_index
+"""
+
+import itertools
+import time
+
+from baml_agents import McpToolDefinition, ToolIndex
+from baml_agents._agent_tools._mcp_schema_to_type_builder._facade import (
+    add_available_actions,
+)
+from benchmarks._bench_type_builder import BenchTypeBuilder
+
+CATALOG_SIZES = (25, 100, 400)
+TOP_K = 10
+REPEATS = 20
+QUERY = "What's the weather forecast in Paris tomorrow? Convert it to fahrenheit."
+
+_VERBS = ("get", "list", "create", "delete", "update", "search", "convert", "export")
+_NOUNS = (
+    "weather_forecast", "calendar_event", "github_issue", "slack_message",
+    "invoice", "temperature", "customer", "email_draft", "file", "pull_request",
+    "database_row", "currency", "stock_quote", "flight", "hotel_booking",
+    "support_ticket", "wiki_page", "spreadsheet", "playlist", "map_route",
+    "translation", "image", "payment", "user_account", "shipping_label",
+    "news_article", "recipe", "contact", "deployment", "metric", "alert",
+    "backup", "certificate", "dns_record", "container", "secret", "log_entry",
+    "feature_flag", "survey", "timesheet", "expense", "lead", "note", "task",
+    "bookmark", "podcast", "video", "chart", "report", "sensor_reading",
+)  # fmt: skip
+
+
+def _catalog(size: int) -> list[McpToolDefinition]:
+    tools = []
+    for verb, noun in itertools.islice(itertools.product(_VERBS, _NOUNS), size):
+        words = noun.replace("_", " ")
+        tools.append(
+            McpToolDefinition(
+                name=f"{verb}_{noun}",
+                description=f"{verb.capitalize()} a {words} by id or by a query.",
+                parameters_json_schema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": f"The {words}"},
+                        "location": {"type": "string"},
+                        "limit": {"type": "integer"},
+                    },
+                    "required": ["query"],
+                },
+            )
+        )
+    return tools
+
+
+def _build(tools) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        tb = add_available_actions("NextAction", tools, BenchTypeBuilder())
+    return (time.perf_counter() - start) / REPEATS * 1000, len(str(tb))
+
+
+def main() -> None:
+    print(
+        f"{'tools':>6}{'all: ms':>10}{'all: chars':>12}"
+        f"{f'top-{TOP_K}: ms':>14}{f'top-{TOP_K}: chars':>16}{'search ms':>11}"
+    )
+    for size in CATALOG_SIZES:
+        tools = _catalog(size)
+        all_ms, all_chars = _build(tools)
+
+        index = ToolIndex(tools)
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            include = index.include(QUERY, top_k=TOP_K)
+        search_ms = (time.perf_counter() - start) / REPEATS * 1000
+        top_ms, top_chars = _build([t for t in tools if include(t)])
+
+        print(
+            f"{size:>6}{all_ms:>10.2f}{all_chars:>12}"
+            f"{top_ms:>14.2f}{top_chars:>16}{search_ms:>11.3f}"
+        )
+    print(f"\nTop 5 for {QUERY!r}:")
+    for tool, score in ToolIndex(_catalog(max(CATALOG_SIZES))).search(QUERY, top_k=5):
+        print(f"  {score:6.2f}  {tool.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any
+
+import pytest
+from baml_py import BamlRuntime
+from baml_py.type_builder import TypeBuilder
+
+_RUNTIME = BamlRuntime.from_files(
+    "baml_src", {"baml_src/test.baml": "class NextAction {\n  @@dynamic\n}\n"}, {}
+)
+
+
+class _NextAction:
+    def __init__(self, tb: TypeBuilder):
+        self._bldr = tb._tb.class_("NextAction")  # noqa: SLF001
+
+    def add_property(self, name: str, type_):
+        return self._bldr.property(name).type(type_)
+
+
+class _TypeBuilder(TypeBuilder):
+    """Mimics a generated TypeBuilder with one dynamic class, `NextAction`."""
+
+    def __init__(self):
+        super().__init__(classes={"NextAction"}, enums=set(), runtime=_RUNTIME)
+
+    @property
+    def NextAction(self) -> _NextAction:  # noqa: N802
+        return _NextAction(self)
+
+
+@pytest.fixture
+def tb_cls() -> type[TypeBuilder]:
+    return _TypeBuilder
+
+
+class _FakeStream:
+    def __init__(self, text: str, failures: list[Exception] | None = None):
+        self._text = text
+        self._failures = failures if failures is not None else []
+
+    def __iter__(self):
+        for i in range(1, len(self._text) + 1):
+            yield self._text[:i]
+            if self._failures:
+                raise self._failures.pop(0)
+
+    def get_final_response(self) -> str:
+        return self._text
+
+
+class _FakeAsyncStream(_FakeStream):
+    async def __aiter__(self):
+        for partial in _FakeStream.__iter__(self):
+            await asyncio.sleep(0)
+            yield partial
+
+    async def get_final_response(self) -> str:
+        return self._text
+
+
+class _FakeStreamClient:
+    def __init__(self, client: "BamlSyncClient", stream_cls: type[_FakeStream]):
+        self._client = client
+        self._stream_cls = stream_cls
+
+    def Classify(  # noqa: N802
+        self,
+        text: str,
+        labels: list[str] | None = None,
+        baml_options: dict[str, Any] = {},  # noqa: B006
+    ) -> _FakeStream:
+        self._client.calls.append(text)
+        self._client.options.append(baml_options)
+        return self._stream_cls(
+            text if labels is None else labels[0], self._client.failures
+        )
+
+
+class BamlSyncClient:
+    """Mimics a generated sync `baml_client`, recording the calls it gets."""
+
+    def __init__(self):
+        self.__baml_options: dict[str, Any] = {}
+        self.calls: list[str] = []
+        self.options: list[dict[str, Any]] = []
+        self.failures: list[Exception] = []
+
+    @property
+    def stream(self) -> _FakeStreamClient:
+        return _FakeStreamClient(self, _FakeStream)
+
+    def Classify(  # noqa: N802
+        self,
+        text: str,
+        labels: list[str] | None = None,
+        baml_options: dict[str, Any] = {},  # noqa: B006
+    ) -> str:
+        self.calls.append(text)
+        self.options.append(baml_options)
+        if self.failures:
+            raise self.failures.pop(0)
+        return text if labels is None else labels[0]
+
+
+class BamlAsyncClient(BamlSyncClient):
+    """Mimics a generated async `baml_client`."""
+
+    @property
+    def stream(self) -> _FakeStreamClient:
+        return _FakeStreamClient(self, _FakeAsyncStream)
+
+    async def Classify(  # noqa: N802
+        self,
+        text: str,
+        labels: list[str] | None = None,
+        baml_options: dict[str, Any] = {},  # noqa: B006
+    ) -> str:
+        return super().Classify(text, labels, baml_options)
+
+
+@pytest.fixture
+def fake_b() -> BamlSyncClient:
+    return BamlSyncClient()
+
+
+@pytest.fixture
+def fake_async_b() -> BamlAsyncClient:
+    return BamlAsyncClient()
@@ -0,0 +1,51 @@
+import pytest
+from pydantic import ValidationError
+
+from baml_agents import Action, ActionRunner, Result
+
+
+class Search(Action):
+    """Searches the docs."""
+
+    query: str
+
+    def run(self) -> Result:
+        return Result(content=self.query)
+
+
+class DeepSearch(Search):
+    _alias = "DeepSearchDocs"
+
+    depth: int = 2
+
+
+def test_definition_is_computed_once_per_class(monkeypatch):
+    def rebuild(cls):
+        pytest.fail(f"{cls.__name__} definition was rebuilt")
+
+    definition = Search.get_mcp_definition()
+    monkeypatch.setattr(Search, "_build_mcp_definition", classmethod(rebuild))
+    assert Search.get_mcp_definition() is definition
+    assert Search.get_action_id() == "search"
+
+
+def test_subclasses_get_their_own_definition():
+    definition = DeepSearch.get_mcp_definition()
+    assert definition is not Search.get_mcp_definition()
+    assert definition.name == DeepSearch.get_action_id() == "deep_search_docs"
+    assert set(definition.parameters_json_schema["properties"]) == {"query", "depth"}
+
+
+def test_shared_definition_is_frozen(tb_cls):
+    definition = Search.get_mcp_definition()
+    with pytest.raises(ValidationError):
+        definition.name = "other"
+    with pytest.raises(TypeError):
+        definition.parameters_json_schema["properties"]["query"]["title"] = "HACKED"
+    assert Search.get_mcp_definition() is definition
+    runner = ActionRunner(tb_cls)
+    runner.add_action(Search)
+    assert runner.actions == (definition,)
+    assert runner.actions[0] is definition
+    with pytest.raises(AttributeError):
+        runner.actions.append(definition)  # type: ignore[attr-defined]
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+from baml_py.type_builder import TypeBuilder
+from pydantic import BaseModel
+
+from baml_agents import Action, ActionRunner, Result
+
+
+class Sleep(Action):
+    s: float
+
+    async def run(self) -> Result:
+        await asyncio.sleep(self.s)
+        return Result(content=f"slept {self.s}")
+
+
+class BlockingSleep(Action):
+    s: float
+
+    def run(self) -> Result:
+        time.sleep(self.s)
+        return Result(content=f"slept {self.s}")
+
+
+class Fail(Action):
+    def run(self) -> Result:
+        raise RuntimeError("tool broke")
+
+
+class NextAction(BaseModel):
+    chosen_action: dict | list[dict]
+
+
+def _runner() -> ActionRunner:
+    runner = ActionRunner(TypeBuilder)
+    runner.add_action(Sleep)
+    runner.add_action(BlockingSleep)
+    runner.add_action(Fail)
+    runner.add_action(type("Slow", (Sleep,), {}), timeout_s=0.05)
+    return runner
+
+
+def test_parallel_actions_run_concurrently_in_order():
+    actions = [
+        {"action_id": "sleep", "s": 0.2},
+        {"action_id": "blocking_sleep", "s": 0.2},
+        {"action_id": "sleep", "s": 0.01},
+    ]
+    start = time.perf_counter()
+    results = asyncio.run(_runner().arun(NextAction(chosen_action=actions)))
+    assert time.perf_counter() - start < 0.35
+    assert [r.content for r in results] == ["slept 0.2", "slept 0.2", "slept 0.01"]
+
+
+def test_timeouts_yield_error_results():
+    runner = _runner()
+    action = NextAction(chosen_action={"action_id": "sleep", "s": 1})
+    result = asyncio.run(runner.arun(action, timeout_s=0.05))
+    assert result.error
+    assert "timed out after 0.05s" in result.content
+    # The timeout of `add_action` takes precedence
+    action = NextAction(chosen_action={"action_id": "slow", "s": 1})
+    assert asyncio.run(runner.arun(action, timeout_s=10)).error
+
+
+def test_failures_of_parallel_actions_keep_the_other_results():
+    runner = _runner()
+    actions = [{"action_id": "fail"}, {"action_id": "sleep", "s": 0}]
+    failed, slept = asyncio.run(runner.arun(NextAction(chosen_action=actions)))
+    assert failed.error
+    assert "tool broke" in failed.content
+    assert slept == Result(content="slept 0.0")
+    # A single action raises, like `run`
+    with pytest.raises(RuntimeError, match="tool broke"):
+        asyncio.run(runner.arun(NextAction(chosen_action={"action_id": "fail"})))
@@ -0,0 +1,210 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from baml_agents import (
+    Action,
+    ActionRunner,
+    AgentBudget,
+    AgentLoop,
+    AgentRun,
+    EpisodeResult,
+    InteractionHistory,
+    Result,
+    SlidingWindow,
+    run_episodes,
+)
+
+
+class Add(Action):
+    a: int
+    b: int
+
+    async def run(self) -> Result:
+        await asyncio.sleep(0.01)
+        return Result(content=str(self.a + self.b))
+
+
+class Stop(Action):
+    answer: str
+
+    def run(self) -> Result:
+        raise AssertionError("Stop actions are not run")
+
+
+class NextAction(BaseModel):
+    chosen_action: dict
+
+
+class _Client:
+    """Adds 1 until the last result reaches `target`, then stops."""
+
+    def __init__(self, target: int):
+        self.target = target
+        self.tbs = []
+
+    async def GetNextAction(self, goal, interactions, baml_options):  # noqa: N802
+        if goal == "fail":
+            raise RuntimeError("LLM unavailable")
+        self.tbs.append(baml_options["tb"])
+        last = int(interactions[-1]["result"]["content"]) if interactions else 0
+        if last >= self.target:
+            return NextAction(chosen_action={"action_id": "stop", "answer": "done"})
+        return NextAction(chosen_action={"action_id": "add", "a": last, "b": 1})
+
+
+def _runner(tb_cls) -> ActionRunner:
+    runner = ActionRunner(tb_cls)
+    runner.add_action(Add)
+    runner.add_action(Stop)
+    return runner
+
+
+def test_runs_until_stop_action(tb_cls):
+    client = _Client(target=3)
+    loop = AgentLoop(_runner(tb_cls), client, stop_actions=["stop"])
+    run = asyncio.run(loop.run("count to 3"))
+    assert run.stop_reason == "stop"
+    assert [s.result.content for s in run.steps] == ["1", "2", "3"]
+    assert run.final_action.chosen_action["answer"] == "done"
+    assert all(s.tool_s > 0 for s in run.steps)
+    # A new TypeBuilder per step
+    assert len({id(tb) for tb in client.tbs}) == 4
+
+
+def test_budgets(tb_cls):
+    loop = AgentLoop(
+        _runner(tb_cls), _Client(target=100), budget=AgentBudget(max_steps=2)
+    )
+    assert asyncio.run(loop.run("count")).stop_reason == "max_steps"
+
+    budget = AgentBudget(max_steps=None, max_cost=1.0)
+    loop = AgentLoop(
+        _runner(tb_cls), _Client(target=100), budget=budget, cost=lambda _: 0.4
+    )
+    run = asyncio.run(loop.run("count"))
+    assert (run.stop_reason, len(run.steps)) == ("max_cost", 3)
+
+    with pytest.raises(ValueError, match="cost"):
+        AgentLoop(_runner(tb_cls), _Client(target=1), budget=budget)
+
+
+def test_tools_are_chosen_per_goal_and_step(tb_cls):
+    runner = _runner(tb_cls)
+    seen = []
+
+    def include_for(goal, interactions):
+        seen.append((goal, len(interactions)))
+        return runner.relevant_actions(goal, top_k=1, always_include=["stop"])
+
+    built = []
+    tb = runner.tb
+
+    def record_tb(field, /, *, include=None, **kwargs):
+        built.append([a.name for a in runner.actions if include(a)])
+        return tb(field, include=include, **kwargs)
+
+    runner.tb = record_tb
+    loop = AgentLoop(
+        runner, _Client(target=2), include_for=include_for, stop_actions=["stop"]
+    )
+    asyncio.run(run_episodes(loop, ["add", "stop"], max_concurrency=1))
+    # Built ahead of each step, without the results of the running one
+    assert seen == [
+        ("add", 0),
+        ("add", 0),
+        ("add", 1),
+        ("stop", 0),
+        ("stop", 0),
+        ("stop", 1),
+    ]
+    assert built[0] == ["add", "stop"]
+    assert built[-1] == ["stop"]
+
+    with pytest.raises(ValueError, match="include_for"):
+        AgentLoop(runner, _Client(target=1), include=bool, include_for=include_for)
+
+
+class Slow(Action):
+    s: float
+
+    async def run(self) -> Result:
+        await asyncio.sleep(self.s)
+        return Result(content="done")
+
+
+class _SlowClient:
+    async def GetNextAction(self, goal, interactions, baml_options):  # noqa: ARG002, N802
+        return NextAction(chosen_action={"action_id": "slow", "s": 5})
+
+
+def test_step_cut_short_by_wall_time_is_recorded(tb_cls):
+    runner = _runner(tb_cls)
+    runner.add_action(Slow)
+    loop = AgentLoop(runner, _SlowClient(), budget=AgentBudget(max_wall_s=0.2))
+    run = asyncio.run(loop.run("wait"))
+    assert run.stop_reason == "max_wall_s"
+    assert run.elapsed_s < 1
+    [step] = run.steps
+    assert step.result.error
+    assert "max_wall_s" in step.result.content
+    assert run.interactions[0]["result"]["error"]
+
+
+def test_history_is_compacted_between_steps(tb_cls):
+    history = InteractionHistory(max_tokens=40, policies=[SlidingWindow()])
+    loop = AgentLoop(_runner(tb_cls), _Client(target=5), stop_actions=["stop"])
+    run = asyncio.run(loop.run("count to 5", history=history))
+    assert len(run.steps) == 5
+    assert len(run.interactions) < 5
+    assert run.interactions[-1]["result"]["content"] == "5"
+
+
+def test_episodes_share_one_runner(tb_cls, tmp_path):
+    loop = AgentLoop(_runner(tb_cls), _Client(target=2), stop_actions=["stop"])
+    goals = [f"goal {i}" for i in range(9)] + ["fail"]
+    path = tmp_path / "episodes.jsonl"
+    results = asyncio.run(run_episodes(loop, goals, jsonl_path=path, max_concurrency=4))
+    assert [r.goal for r in results] == goals
+    assert all(r.unwrap().stop_reason == "stop" for r in results[:-1])
+    assert isinstance(results[-1].error, RuntimeError)
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(r["index"] for r in records) == list(range(10))
+    records = {r["goal"]: r for r in records}
+    assert records["goal 0"]["stop_reason"] == "stop"
+    assert len(records["goal 0"]["steps"]) == 2
+    assert records["goal 0"]["steps"][0]["action"] == {
+        "chosen_action": {"action_id": "add", "a": 0, "b": 1}
+    }
+    assert "error" in records["fail"]
+
+
+def test_episode_records_keep_json_values():
+    run = AgentRun("goal", [], [], "stop", 0.5, final_action={"answer": [1, None]})
+    record = EpisodeResult(0, "goal", run=run).to_json()
+    assert record["final_action"] == {"answer": [1, None]}
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.tbs = []
+
+    async def GetNextAction(self, baml_options) -> NextAction:  # noqa: N802
+        self.tbs.append(baml_options["tb"])
+        return NextAction(chosen_action={})
+
+
+def test_b_options_are_bound_to_the_returned_client(tb_cls):
+    client = _RecordingClient()
+    runner = ActionRunner(tb_cls, b=client)
+    runner.add_action(Add)
+    runner.add_action(Stop)
+    only_add = runner.b_(include=lambda t: t.name == "add")
+    every = runner.b
+    asyncio.run(only_add.GetNextAction())
+    asyncio.run(every.GetNextAction())
+    first, second = (str(tb) for tb in client.tbs)
+    assert "Stop" not in first
+    assert "Stop" in second
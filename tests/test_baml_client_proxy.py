@@ -0,0 +1,35 @@
+from baml_agents import BamlClientProxy, OnBeforeCallHookSync, with_hooks
+from baml_agents._utils._lru_cache import LruCache
+
+
+class _Upper(OnBeforeCallHookSync):
+    def on_before_call(self, *, ctx, params):  # noqa: ARG002
+        params["text"] = params["text"].upper()
+
+
+def test_wrappers_are_compiled_once_per_name(fake_b):
+    b = BamlClientProxy(fake_b, hooks=[_Upper()])
+    assert b.Classify is b.Classify
+    assert b.Classify("a") == "A"
+    uncached = BamlClientProxy(fake_b, hooks=[_Upper()], cache_wrappers=False)
+    assert uncached.Classify is not uncached.Classify
+    assert uncached.Classify("a") == "A"
+
+
+def test_adding_hooks_drops_the_compiled_wrappers(fake_b):
+    b = with_hooks(fake_b, [])
+    classify = b.Classify
+    assert classify("a") == "a"
+    b = with_hooks(b, [_Upper()])
+    assert b.Classify is not classify
+    assert b.Classify("a") == "A"
+
+
+def test_lru_cache_evicts_the_least_recently_used():
+    cache = LruCache[str, int](2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert (cache.get("a"), cache.get("c"), len(cache)) == (1, 3, 2)
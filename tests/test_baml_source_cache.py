@@ -0,0 +1,113 @@
+import json
+import subprocess
+import sys
+
+from baml_agents import MemoryCacheStore
+from baml_agents._agent_tools._json_schema_to_baml_source import _facade
+from baml_agents._agent_tools._json_schema_to_baml_source._facade import (
+    json_schema_to_baml_source,
+    json_schemas_to_baml_sources,
+)
+from baml_agents._agent_tools._json_schema_to_baml_source._json_to_model import (
+    JsonSchemaToBamlModelConverterConfig,
+)
+from baml_agents._agent_tools._json_schema_to_baml_source._source_cache import (
+    baml_source_cache_key,
+)
+
+SCHEMA = {"type": "object", "properties": {"city": {"type": "string"}}}
+
+
+def test_hit_returns_stored_source(monkeypatch):
+    cache = MemoryCacheStore()
+    source = json_schema_to_baml_source("Weather", SCHEMA, cache=cache)
+    monkeypatch.setattr(_facade, "_convert", None)
+    # Formatting and key order of the schema don't matter
+    reordered = json.dumps({"properties": SCHEMA["properties"], "type": "object"})
+    assert json_schema_to_baml_source("Weather", reordered, cache=cache) == source
+    assert len(cache) == 1
+
+
+def test_key_depends_on_class_name():
+    cache = MemoryCacheStore()
+    json_schema_to_baml_source("Weather", SCHEMA, cache=cache)
+    assert "class Forecast {" in json_schema_to_baml_source(
+        "Forecast", SCHEMA, cache=cache
+    )
+    assert len(cache) == 2
+
+
+def test_bulk_conversion(tmp_path, monkeypatch):
+    schemas, out = tmp_path / "schemas", tmp_path / "out"
+    schemas.mkdir()
+    for name in ("get_weather", "send_email", "list_files"):
+        (schemas / f"{name}.json").write_text(json.dumps(SCHEMA))
+    cache = MemoryCacheStore()
+
+    # Not cached by default
+    monkeypatch.chdir(tmp_path)
+    assert json_schemas_to_baml_sources(schemas, max_workers=1)
+    assert not (tmp_path / ".cache").exists()
+    sources = json_schemas_to_baml_sources(
+        schemas, output_dir=out, cache=cache, max_workers=2
+    )
+    assert [p.stem for p in sources] == ["get_weather", "list_files", "send_email"]
+    assert "class GetWeather {" in sources[schemas / "get_weather.json"]
+    assert (out / "send_email.baml").read_text() == sources[schemas / "send_email.json"]
+    assert len(cache) == 3
+    assert json_schemas_to_baml_sources(schemas, cache=cache) == sources
+
+
+def _config(prop_name, cache_key="") -> JsonSchemaToBamlModelConverterConfig:
+    return JsonSchemaToBamlModelConverterConfig(
+        prop_name=prop_name, cache_key=cache_key
+    )
+
+
+def _suffix_a(*, name, **_):
+    return name + "A"
+
+
+def _suffix_b(*, name, **_):
+    return name + "B"
+
+
+class _Prefix:
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+    def __call__(self, *, name, **_):
+        return self.prefix + name
+
+
+def test_key_depends_on_callback_names_and_cache_key():
+    keys = {
+        baml_source_cache_key("Weather", SCHEMA, config)
+        for config in (
+            _config(_suffix_a),
+            _config(_suffix_b),
+            _config(_Prefix("x")),
+            _config(_suffix_a, cache_key="2"),
+        )
+    }
+    assert len(keys) == 4
+    # Callbacks count by name, a change in behavior needs a new cache_key
+    assert baml_source_cache_key(
+        "Weather", SCHEMA, _config(_Prefix("x"))
+    ) == baml_source_cache_key("Weather", SCHEMA, _config(_Prefix("y")))
+
+
+def test_default_key_is_stable_across_processes():
+    script = (
+        "from baml_agents._agent_tools._json_schema_to_baml_source._source_cache "
+        "import baml_source_cache_key; "
+        "print(baml_source_cache_key('Weather', {'type': 'object'}))"
+    )
+    keys = {
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+        for _ in range(2)
+    }
+    assert len(keys) == 1
+    assert keys.pop().strip() == baml_source_cache_key("Weather", {"type": "object"})
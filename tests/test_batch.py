@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from baml_agents import OnBeforeCallHookSync, with_hooks
+from baml_agents._utils._rate_limiter import TokenBucket, get_rate_limiter
+
+
+class _Upper(OnBeforeCallHookSync):
+    def on_before_call(self, *, ctx, params):  # noqa: ARG002
+        params["text"] = params["text"].upper()
+
+
+def test_items_are_hooked_and_kept_in_order(fake_b):
+    fake_b.failures = [RuntimeError("first call fails")]
+    b = with_hooks(fake_b, [_Upper()])
+    results = b.batch.Classify(
+        ["a", ("b", ["label"]), {"text": "c"}], max_concurrency=1
+    )
+    assert [r.index for r in results] == [0, 1, 2]
+    assert isinstance(results[0].error, RuntimeError)
+    assert [r.value for r in results[1:]] == ["label", "C"]
+    assert [r.ok for r in results] == [False, True, True]
+
+
+def test_async_batches_are_awaited(fake_async_b):
+    b = with_hooks(fake_async_b, [_Upper()])
+    results = asyncio.run(b.batch.Classify(["a", "b", "c"], max_concurrency=2))
+    assert [r.unwrap() for r in results] == ["A", "B", "C"]
+
+
+def test_batches_are_rate_limited(fake_b):
+    b = with_hooks(fake_b, [])
+    start = time.perf_counter()
+    b.batch.Classify(
+        ["a"] * 4, requests_per_second=20, burst=1, rate_limit_key="test_batch"
+    )
+    # The first call uses the burst, the others wait 50 ms each
+    assert time.perf_counter() - start >= 0.14
+
+
+def test_token_bucket_reserves_future_slots():
+    bucket = TokenBucket(10, burst=2)
+    assert [bucket.reserve() > 0 for _ in range(3)] == [False, False, True]
+
+
+def test_rate_limiter_is_replaced_when_its_limits_change():
+    limiter = get_rate_limiter("test_limits", 10, burst=2)
+    assert get_rate_limiter("test_limits", 10, burst=2) is limiter
+    assert get_rate_limiter("test_limits", 10, burst=5).burst == 5
+    assert get_rate_limiter("test_limits", 20, burst=5).rate_per_s == 20
+    # Without burst, it defaults to the rate
+    assert get_rate_limiter("test_limits", 20) is get_rate_limiter(
+        "test_limits", 20, burst=20
+    )
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from baml_agents import (
+    OnErrorHookAsync,
+    OnErrorHookSync,
+    RetryCall,
+    ReturnValue,
+    with_hooks,
+)
+
+
+class _Retry(OnErrorHookSync):
+    def __init__(self):
+        self.attempts = []
+
+    def on_error(self, *, ctx, params, recovery):  # noqa: ARG002
+        self.attempts.append(ctx.attempt)
+        recovery.value = RetryCall()
+
+
+class _Fallback(OnErrorHookAsync):
+    async def on_error(self, *, ctx, params, recovery):
+        if isinstance(ctx.error, ValueError):
+            recovery.value = ReturnValue(f"fallback for {params['text']}")
+
+
+def test_retry_until_success(fake_b):
+    fake_b.failures = [RuntimeError("1"), RuntimeError("2")]
+    retry = _Retry()
+    assert with_hooks(fake_b, [retry]).Classify("a") == "a"
+    assert retry.attempts == [1, 2]
+    assert fake_b.calls == ["a", "a", "a"]
+
+
+def test_retries_are_capped(fake_b):
+    fake_b.failures = [RuntimeError(str(i)) for i in range(10)]
+    retry = _Retry()
+    with pytest.raises(RuntimeError, match="2"):
+        with_hooks(fake_b, [retry], max_call_attempts=3).Classify("a")
+    assert retry.attempts == [1, 2, 3]
+
+
+def test_return_value_replaces_the_error(fake_async_b):
+    b = with_hooks(fake_async_b, [_Fallback()])
+    fake_async_b.failures = [ValueError("bad output")]
+    assert asyncio.run(b.Classify("a")) == "fallback for a"
+    fake_async_b.failures = [RuntimeError("other")]
+    with pytest.raises(RuntimeError, match="other"):
+        asyncio.run(b.Classify("a"))
+
+
+class _Recorder(OnErrorHookSync):
+    def __init__(self):
+        self.errors = []
+
+    def on_error(self, *, ctx, params, recovery):  # noqa: ARG002
+        self.errors.append(ctx.error)
+        recovery.value = RetryCall()
+
+
+def test_stream_errors_notify_the_hooks(fake_b):
+    recorder = _Recorder()
+    fake_b.failures = [RuntimeError("connection lost")]
+    stream = with_hooks(fake_b, [recorder]).stream.Classify("abc")
+    partials = []
+    with pytest.raises(RuntimeError, match="connection lost"):
+        partials.extend(stream)
+    assert partials == ["a"]
+    # Notified once, the RetryCall is ignored
+    assert [str(e) for e in recorder.errors] == ["connection lost"]
+    assert fake_b.calls == ["abc"]
+
+
+def test_async_stream_errors_notify_the_hooks(fake_async_b):
+    recorder = _Recorder()
+    fake_async_b.failures = [RuntimeError("connection lost")]
+    stream = with_hooks(fake_async_b, [recorder]).stream.Classify("abc")
+
+    async def consume():
+        return [partial async for partial in stream]
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        asyncio.run(consume())
+    assert [str(e) for e in recorder.errors] == ["connection lost"]
@@ -0,0 +1,51 @@
+import inspect
+
+import pytest
+
+from baml_agents._baml_client_proxy._function_binder import BamlFunctionBinder
+
+
+def generated(text: str, labels: list | None = None, *, baml_options: dict = {}):  # noqa: B006
+    pass
+
+
+def unusual(text, /, *args, labels=None, **kwargs):
+    pass
+
+
+def _inspect_bind(fn, args, kwargs) -> dict:
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+@pytest.mark.parametrize(
+    ("fn", "args", "kwargs"),
+    [
+        (generated, ("a",), {}),
+        (generated, ("a", ["x"]), {"baml_options": {"client": "c"}}),
+        (generated, (), {"labels": ["x"], "text": "a"}),
+        # Falls back to inspect.Signature.bind
+        (unusual, ("a", 1, 2), {"labels": ["x"], "extra": True}),
+        (unusual, ("a",), {}),
+    ],
+)
+def test_binds_like_inspect(fn, args, kwargs):
+    assert BamlFunctionBinder(fn).bind(args, kwargs) == _inspect_bind(fn, args, kwargs)
+
+
+@pytest.mark.parametrize(
+    ("args", "kwargs", "error"),
+    [
+        ((), {}, "missing a required argument: 'text'"),
+        (("a", None, {}), {}, "too many positional arguments"),
+        (("a",), {"text": "b"}, "multiple values for argument 'text'"),
+        (("a",), {"label": "x"}, "unexpected keyword argument 'label'"),
+    ],
+)
+def test_rejects_invalid_calls_like_inspect(args, kwargs, error):
+    binder = BamlFunctionBinder(generated)
+    with pytest.raises(TypeError, match=error):
+        binder.bind(args, kwargs)
+    with pytest.raises(TypeError, match=error):
+        _inspect_bind(generated, args, kwargs)
@@ -0,0 +1,63 @@
+import dataclasses
+
+import pytest
+
+from baml_agents import (
+    OnAfterCallSuccessHookSync,
+    OnBeforeCallHookSync,
+    OnErrorHookSync,
+    ReturnValue,
+    with_hooks,
+)
+
+
+class _Phases(OnBeforeCallHookSync, OnAfterCallSuccessHookSync, OnErrorHookSync):
+    def __init__(self):
+        self.states = []
+        self.after_params = None
+
+    def on_before_call(self, *, ctx, params):
+        assert ctx.shared_state_between_hooks == {}
+        ctx.shared_state_between_hooks["before"] = params["text"]
+        params["text"] += "!"
+        self.states.append(ctx.shared_state_between_hooks)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            ctx.baml_function_name = "Other"
+
+    def on_after_call_success(self, *, ctx, result):  # noqa: ARG002
+        self.states.append(ctx.shared_state_between_hooks)
+        self.after_params = ctx.params
+
+    def on_error(self, *, ctx, params, recovery):  # noqa: ARG002
+        self.states.append(ctx.shared_state_between_hooks)
+        recovery.value = ReturnValue("recovered")
+
+
+class _Provide(OnBeforeCallHookSync):
+    def on_before_call(self, *, ctx, params):
+        ctx.provide_result(f"cached {params['text']}")
+
+
+def test_phases_of_a_call_share_one_state_dict(fake_b):
+    hook = _Phases()
+    b = with_hooks(fake_b, [hook])
+    assert b.Classify("a") == "a!"
+    before, after = hook.states
+    assert before is after
+    assert before == {"before": "a"}
+    # The after-success hook sees the mutated params, read-only
+    assert hook.after_params["text"] == "a!"
+    with pytest.raises(TypeError):
+        hook.after_params["text"] = "b"
+
+    fake_b.failures = [RuntimeError("down")]
+    assert b.Classify("b") == "recovered"
+    before, error = hook.states[2:]
+    assert before is error
+    assert before is not after
+
+
+def test_provided_result_skips_the_call(fake_b):
+    b = with_hooks(fake_b, [_Provide()])
+    assert b.Classify("a") == "cached a"
+    assert fake_b.calls == []
@@ -0,0 +1,70 @@
+import pytest
+
+from baml_agents import (
+    OnAfterCallSuccessHookSync,
+    OnBeforeCallHookAsync,
+    OnBeforeCallHookSync,
+    WithOptions,
+    with_hooks,
+)
+from baml_agents._baml_client_proxy._hook_plan import HookPlan
+from baml_agents._baml_client_proxy._hooks._base_hook import BamlHookFactory
+
+
+class _Log(OnBeforeCallHookSync, OnAfterCallSuccessHookSync):
+    def __init__(self, name: str, log: list):
+        self.name = name
+        self.log = log
+
+    def on_before_call(self, *, ctx, params):  # noqa: ARG002
+        self.log.append(f"before {self.name}")
+
+    def on_after_call_success(self, *, ctx, result):  # noqa: ARG002
+        self.log.append(f"after {self.name}")
+
+
+class _Count(OnBeforeCallHookSync):
+    def __init__(self):
+        self.calls = 0
+
+    def on_before_call(self, *, ctx, params):  # noqa: ARG002
+        self.calls += 1
+        params["text"] += str(self.calls)
+
+
+class _CountFactory(BamlHookFactory):
+    def __init__(self):
+        self.created = []
+
+    def __call__(self) -> _Count:
+        self.created.append(_Count())
+        return self.created[-1]
+
+
+class _Async(OnBeforeCallHookAsync):
+    async def on_before_call(self, *, ctx, params):
+        pass
+
+
+def test_hooks_run_in_order_with_options_first(fake_b):
+    log = []
+    options = WithOptions()
+    plan = HookPlan.build([_Log("a", log), options, _Log("b", log)])
+    assert plan.hooks[0] is options
+    assert len(plan.on_before_call) == 3
+    with_hooks(fake_b, [_Log("a", log), _Log("b", log)]).Classify("x")
+    assert log == ["before a", "before b", "after a", "after b"]
+
+
+def test_factories_create_a_hook_per_call(fake_b):
+    factory = _CountFactory()
+    b = with_hooks(fake_b, [factory])
+    assert [b.Classify("a"), b.Classify("b")] == ["a1", "b1"]
+    assert len(factory.created) == 2
+    plan = HookPlan.build([_Count()])
+    assert plan.for_call() is plan
+
+
+def test_async_hooks_are_rejected_by_sync_clients(fake_b):
+    with pytest.raises(TypeError, match="Async hook"):
+        with_hooks(fake_b, [_Async()]).Classify("a")
@@ -0,0 +1,160 @@
+from copy import deepcopy
+
+import pytest
+
+from baml_agents import McpToolDefinition
+from baml_agents._agent_tools._mcp_schema_to_type_builder._baml_tool_prompt_config import (
+    BamlToolPromptConfig,
+)
+from baml_agents._agent_tools._mcp_schema_to_type_builder._facade import (
+    add_available_actions,
+    incremental_orchestrator,
+)
+from baml_agents._agent_tools._mcp_schema_to_type_builder._json_schema_to_baml_converter import (
+    JsonSchemaToBamlConverter,
+)
+from baml_agents._agent_tools._mcp_schema_to_type_builder._tool_to_baml_type import (
+    ToolToBamlType,
+)
+from baml_agents._utils._freeze import thaw
+
+
+def _tool(name: str, **properties) -> McpToolDefinition:
+    return McpToolDefinition(
+        name=name,
+        description=f"The {name} tool.",
+        parameters_json_schema={
+            "type": "object",
+            "properties": properties or {"query": {"type": "string"}},
+            "required": list(properties)[:1],
+        },
+    )
+
+
+SEARCH = _tool("search", query={"type": "string"}, limit={"type": "integer"})
+WEATHER = _tool(
+    "get_weather",
+    city={"type": "string", "description": "City name"},
+    unit={"type": "string", "enum": ["celsius", "fahrenheit"]},
+)
+PAINT = McpToolDefinition(
+    name="paint",
+    description="Paints.",
+    parameters_json_schema={
+        "type": "object",
+        "properties": {
+            "color": {"$ref": "#/$defs/Color"},
+            "shades": {"type": "array", "items": {"$ref": "#/$defs/Color"}},
+            "n": {"anyOf": [{"type": "integer"}, {"type": "null"}]},
+        },
+        "required": ["color"],
+        "$defs": {
+            "Color": {"type": "string", "enum": ["red", "blue"], "title": "Color"}
+        },
+    },
+)
+STOP = _tool("stop")
+
+
+def _full_rebuild(tb_cls, tools) -> str:
+    return str(add_available_actions("NextAction", tools, tb_cls()))
+
+
+def _direct(tb_cls, tools) -> str:
+    """Converts each tool straight onto the TypeBuilder, without any replay."""
+    cfg = BamlToolPromptConfig()
+    converter = ToolToBamlType(schema_converter=JsonSchemaToBamlConverter())
+    tb = tb_cls()
+    output_class = tb.NextAction
+    types = [
+        converter.convert(tool=t, tb=tb, baml_tool_id_field=cfg.id_field) for t in tools
+    ]
+    output_class.add_property(cfg.tools_field, tb.union(types))
+    return str(tb)
+
+
+def _incremental(tb_cls, tbo, tools) -> str:
+    return str(add_available_actions("NextAction", tools, tb_cls(), tbo=tbo))
+
+
+@pytest.mark.parametrize(
+    "tools",
+    [
+        [STOP],
+        [SEARCH, WEATHER],
+        [SEARCH, WEATHER, PAINT, STOP],
+        [PAINT, STOP, WEATHER, SEARCH],
+    ],
+)
+def test_matches_full_rebuild(tb_cls, tools):
+    tbo = incremental_orchestrator()
+    # Without conflicting names, both match converting without a recording
+    assert _full_rebuild(tb_cls, tools) == _direct(tb_cls, tools)
+    assert _incremental(tb_cls, tbo, tools) == _direct(tb_cls, tools)
+    # The second build replays the recorded tools
+    assert _incremental(tb_cls, tbo, tools) == _direct(tb_cls, tools)
+
+
+def test_matches_full_rebuild_when_tools_are_added_and_removed(tb_cls):
+    tbo = incremental_orchestrator()
+    steps = [
+        [SEARCH],
+        [SEARCH, WEATHER],
+        [SEARCH, WEATHER, PAINT],
+        [WEATHER, PAINT],
+        [PAINT, STOP, SEARCH],
+        [STOP],
+    ]
+    for tools in steps:
+        assert _incremental(tb_cls, tbo, tools) == _direct(tb_cls, tools)
+
+
+def test_only_new_tools_are_converted(tb_cls, monkeypatch):
+    tbo = incremental_orchestrator()
+    _incremental(tb_cls, tbo, [SEARCH, WEATHER])
+
+    converted = []
+    convert = tbo._converter.convert  # noqa: SLF001
+    monkeypatch.setattr(
+        tbo._converter,  # noqa: SLF001
+        "convert",
+        lambda *, tool, **kwargs: (
+            converted.append(tool.name) or convert(tool=tool, **kwargs)
+        ),
+    )
+    _incremental(tb_cls, tbo, [SEARCH, WEATHER, PAINT])
+    _incremental(tb_cls, tbo, [WEATHER, PAINT])
+    # Equal definitions, e.g. listed again from an MCP server
+    _incremental(tb_cls, tbo, [deepcopy(SEARCH), deepcopy(PAINT)])
+    assert converted == ["paint"]
+
+
+def test_changed_tool_is_converted_again(tb_cls):
+    tbo = incremental_orchestrator()
+    _incremental(tb_cls, tbo, [SEARCH])
+    renamed = SEARCH.model_copy(update={"name": "find"})
+    assert _incremental(tb_cls, tbo, [renamed]) == _direct(tb_cls, [renamed])
+
+
+def test_shared_definitions_are_added_once_like_full_rebuild(
+    tb_cls,
+):
+    tools = [PAINT, PAINT.model_copy(update={"name": "paint_again"})]
+    full = _full_rebuild(tb_cls, tools)
+    assert _incremental(tb_cls, incremental_orchestrator(), tools) == full
+    assert full.count("Color {") == 1
+
+
+def test_conflicting_definitions_are_renamed_like_full_rebuild(
+    tb_cls,
+):
+    schema = thaw(PAINT.parameters_json_schema)
+    schema["$defs"]["Color"]["enum"] = ["green"]
+    green = PAINT.model_copy(
+        update={"name": "paint_green", "parameters_json_schema": schema}
+    )
+    tools = [PAINT, green]
+    full = _full_rebuild(tb_cls, tools)
+    assert _incremental(tb_cls, incremental_orchestrator(), tools) == full
+    assert "Color {" in full
+    assert "Color2 {" in full
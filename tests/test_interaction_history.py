@@ -0,0 +1,48 @@
+import asyncio
+
+from baml_agents import (
+    InteractionHistory,
+    Result,
+    SlidingWindow,
+    SummarizeTurns,
+    TruncateResults,
+)
+
+
+def _history(**kwargs) -> InteractionHistory:
+    history = InteractionHistory(**kwargs)
+    for i in range(10):
+        history.add(f"action {i}", Result(content=f"{i}" * 400))
+    return history
+
+
+def test_running_token_estimate_triggers_compaction():
+    history = _history(max_tokens=1000, policies=[SlidingWindow()])
+    assert history.tokens == sum(e.tokens for e in history.entries)
+    assert history.needs_compaction
+    asyncio.run(history.compact())
+    assert history.tokens <= 1000 * 0.6
+    assert history.entries[-1].action == "action 9"
+    assert not history.needs_compaction
+
+
+def test_policies_apply_in_order():
+    policies = [TruncateResults(max_chars=20, keep_last=2), SlidingWindow()]
+    history = _history(max_tokens=1000, policies=policies)
+    asyncio.run(history.compact())
+    # Truncating the older results was enough
+    assert len(history) == 10
+    assert history.entries[-1].result.content == "9" * 400
+    assert history.entries[0].result.content.startswith("0" * 20 + "\n…")
+
+
+def test_summarize_older_turns():
+    async def summarize(entries):
+        return f"{len(entries)} earlier steps"
+
+    history = _history(max_tokens=1000, policies=[SummarizeTurns(summarize)])
+    asyncio.run(history.compact())
+    assert [e.action for e in history.entries][1:] == [
+        f"action {i}" for i in range(6, 10)
+    ]
+    assert history.interactions[0]["result"]["content"] == "6 earlier steps"
@@ -0,0 +1,53 @@
+import sys
+import warnings
+
+from baml_agents._agent_tools._json_schema_to_baml_source._facade import (
+    json_schema_to_baml_source,
+)
+
+
+def _convert(schema: dict) -> str:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return json_schema_to_baml_source("Root", schema)
+
+
+def test_nesting_deeper_than_the_recursion_limit():
+    depth = sys.getrecursionlimit() * 2
+    node: dict = {"type": "integer"}
+    for i in range(depth):
+        node = {"type": "object", "properties": {f"level_{i}": node}}
+    source = _convert(node)
+    assert source.count("class ") == depth
+    assert "level0 int?" in source
+
+
+def test_definition_referenced_many_times_is_emitted_once():
+    schema = {
+        "type": "object",
+        "properties": {
+            "home": {"$ref": "#/$defs/Address"},
+            "work": {"$ref": "#/$defs/Address"},
+            "past": {"type": "array", "items": {"$ref": "#/$defs/Address"}},
+        },
+        "$defs": {
+            "Address": {"type": "object", "properties": {"city": {"type": "string"}}}
+        },
+    }
+    source = _convert(schema)
+    assert source.count("class Address {") == 1
+    assert "past Address[]" in source
+
+
+def test_colliding_names_are_numbered():
+    address = {"type": "object", "properties": {"city": {"type": "string"}}}
+    schema = {
+        "type": "object",
+        "properties": {
+            f"f{i}": {"type": "object", "properties": {"address": address}}
+            for i in range(4)
+        },
+    }
+    source = _convert(schema)
+    for name in ("Address", "Address2", "Address3", "Address4"):
+        assert f"class {name} {{" in source
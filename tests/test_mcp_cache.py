@@ -0,0 +1,122 @@
+import multiprocessing
+import sqlite3
+import sys
+import time
+
+import pytest
+
+from baml_agents import (
+    McpCache,
+    McpCacheStats,
+    MemoryCacheStore,
+    SqliteCacheStore,
+    TieredCacheStore,
+)
+
+
+def test_memory_store_ttl_and_lru():
+    store = MemoryCacheStore(max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2, ttl_s=0.01)
+    time.sleep(0.02)
+    assert store.get("a") == (True, 1)
+    assert store.get("b") == (False, None)
+    store.set("c", 3)
+    store.set("d", 4)
+    assert store.get("a") == (False, None)
+    assert len(store) == 2
+
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    store = SqliteCacheStore(path)
+    store.set("a", {"tools": ["echo"]})
+    store.set("b", 2, ttl_s=0.01)
+    store.close()
+    time.sleep(0.02)
+    store = SqliteCacheStore(path)
+    assert store.get("a") == (True, {"tools": ["echo"]})
+    assert store.get("b") == (False, None)
+    assert len(store) == 1
+
+
+def test_sqlite_store_evicts_least_recently_used(tmp_path):
+    store = SqliteCacheStore(tmp_path / "cache.sqlite", max_entries=10)
+    for i in range(10):
+        store.set(str(i), i)
+    store.get("0")
+    store.set("10", 10)
+    assert len(store) == 10
+    assert store.get("0") == (True, 0)
+    assert store.get("1") == (False, None)
+
+
+def test_sqlite_store_writes_access_times_in_batches(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    store = SqliteCacheStore(path)
+    store.set("a", 1)
+
+    def accessed_at():
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT accessed_at FROM cache").fetchone()[0]
+
+    written = accessed_at()
+    time.sleep(0.01)
+    assert store.get("a") == (True, 1)
+    assert accessed_at() == written
+    store.close()
+    assert accessed_at() > written
+
+
+def _set_in_child(store: SqliteCacheStore) -> None:
+    assert store.get("parent") == (True, 1)
+    store.set("child", 2)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs fork")
+def test_sqlite_store_reconnects_in_forked_children(tmp_path):
+    store = SqliteCacheStore(tmp_path / "cache.sqlite")
+    store.set("parent", 1)
+    child = multiprocessing.get_context("fork").Process(
+        target=_set_in_child, args=(store,)
+    )
+    child.start()
+    child.join(10)
+    assert child.exitcode == 0
+    assert store.get("child") == (True, 2)
+
+
+def test_tiered_store_copies_back_hits_into_front(tmp_path):
+    back = SqliteCacheStore(tmp_path / "cache.sqlite")
+    back.set("a", 1)
+    front = MemoryCacheStore()
+    store = TieredCacheStore(front, back)
+    assert store.get("a") == (True, 1)
+    assert front.get("a") == (True, 1)
+    store.delete("a")
+    assert store.get("a") == (False, None)
+
+
+def test_mcp_cache_namespaces_and_stats(tmp_path):
+    cache = McpCache.on_disk(tmp_path / "cache.sqlite")
+    calls = []
+
+    def compute(result):
+        def run():
+            calls.append(result)
+            return result
+
+        return run
+
+    params = {"name": "echo", "arguments": {"text": "a"}}
+    assert cache.get_or_compute("s1", "call_tool", params, compute("r1")) == "r1"
+    assert cache.get_or_compute("s1", "call_tool", params, compute("r2")) == "r1"
+    assert cache.get_or_compute("s2", "call_tool", params, compute("r3")) == "r3"
+    assert calls == ["r1", "r3"]
+    assert cache.stats("s1").hits == 1
+    assert cache.stats() == McpCacheStats(hits=1, misses=2)
+
+    # A new process sees the entries on disk
+    cache = McpCache.on_disk(tmp_path / "cache.sqlite")
+    assert cache.get_or_compute("s2", "call_tool", params, compute("r4")) == "r3"
+    assert cache.stats().hit_rate == 1.0
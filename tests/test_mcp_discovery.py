@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+from baml_py.type_builder import TypeBuilder
+
+from baml_agents import Action, ActionRunner, McpToolDefinition
+from baml_agents._agent_tools import _mcp
+
+
+def _tool(name: str) -> McpToolDefinition:
+    return McpToolDefinition(
+        name=name, description="", parameters_json_schema={"type": "object"}
+    )
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    tools = {"fast": ["a", "b"], "other": ["c"], "slow": ["d"], "twice": ["e", "e"]}
+    release = threading.Event()
+
+    def list_tools(server, **_):
+        if server == "broken":
+            raise RuntimeError("cannot start")
+        if server == "slow":
+            release.wait(5)
+        return [_tool(name) for name in tools[server]]
+
+    monkeypatch.setattr(_mcp, "list_tools", list_tools)
+    return release
+
+
+def test_servers_are_merged_in_order(servers):
+    servers.set()
+    runner = ActionRunner(TypeBuilder)
+    report = runner.add_from_mcp_servers(["fast", "other", "broken"])
+    assert [a.name for a in runner.actions] == ["a", "b", "c"]
+    assert report.servers["fast"].tool_count == 2
+    assert report.servers["fast"].latency_s is not None
+    assert isinstance(report.errors["broken"], RuntimeError)
+
+
+def test_duplicates_raise(servers):
+    servers.set()
+    runner = ActionRunner(TypeBuilder)
+    runner.add_from_mcp_server("other")
+    with pytest.raises(ValueError, match="already exists"):
+        runner.add_from_mcp_servers(["fast", "other"])
+
+
+def test_slow_servers_finish_in_background(servers):
+    runner = ActionRunner(TypeBuilder)
+    report = runner.add_from_mcp_servers(["fast", "slow"], wait_s=0.2)
+    assert report.pending == ["slow"]
+    assert [a.name for a in runner.actions] == ["a", "b"]
+    servers.set()
+    assert report.wait(5)
+    assert report.servers["slow"].status == "ok"
+    assert [a.name for a in runner.actions] == ["a", "b", "d"]
+
+
+def test_duplicate_actions_leave_the_tool_set_unchanged(servers):
+    servers.set()
+    runner = ActionRunner(TypeBuilder)
+    runner.add_from_mcp_server("fast")
+    with pytest.raises(ValueError, match="already exists"):
+        runner.add_action(type("A", (Action,), {"run": lambda _: "a"}))
+    assert [a.name for a in runner.actions] == ["a", "b"]
+    assert runner._tool_set_version == 2  # noqa: SLF001
+
+
+def test_duplicates_within_a_server_register_none_of_its_tools(servers):
+    servers.set()
+    runner = ActionRunner(TypeBuilder)
+    with pytest.raises(ValueError, match="already exists"):
+        runner.add_from_mcp_server("twice")
+    assert runner.actions == ()
+    assert runner._tool_set_version == 0  # noqa: SLF001
+
+
+def test_duplicates_raise_after_all_servers_are_registered(servers):
+    runner = ActionRunner(TypeBuilder)
+    runner.add_from_mcp_server("other")
+    with pytest.raises(ValueError, match="already exists"):
+        runner.add_from_mcp_servers(["other", "fast", "slow"], wait_s=0.2)
+    assert [a.name for a in runner.actions] == ["c", "a", "b"]
+    servers.set()
+    for _ in range(50):
+        if [a.name for a in runner.actions] == ["c", "a", "b", "d"]:
+            break
+        threading.Event().wait(0.1)
+    assert [a.name for a in runner.actions] == ["c", "a", "b", "d"]
+
+
+def test_repeated_servers_raise(servers):
+    servers.set()
+    runner = ActionRunner(TypeBuilder)
+    with pytest.raises(ValueError, match="more than once"):
+        runner.add_from_mcp_servers(["fast", "other", "fast"])
+    assert runner.actions == ()
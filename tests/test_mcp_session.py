@@ -0,0 +1,85 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from baml_agents import McpStdioSession
+from baml_agents._agent_tools._mcp_session import McpSessionError, _ServerProcess
+
+_STUB_SERVER = Path(__file__).parents[1] / "benchmarks" / "_stub_mcp_server.py"
+
+
+def _session(*args: str, **kwargs) -> McpStdioSession:
+    return McpStdioSession([sys.executable, str(_STUB_SERVER), *args], **kwargs)
+
+
+def _wait_until_exited(session: McpStdioSession) -> None:
+    deadline = time.monotonic() + 5
+    while session.is_running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_one_process_serves_all_requests():
+    with _session() as session:
+        tools = session.list_tools()["tools"]
+        assert [t["name"] for t in tools] == ["echo", "add"]
+        assert session.server_info == {"name": "stub", "version": "0"}
+        result = session.call_tool("add", {"a": 1, "b": 2})
+        assert result["content"][0]["text"] == "3"
+        assert session.is_running
+    assert not session.is_running
+
+
+def test_restarts_after_a_crash():
+    with _session("--crash-after", "1") as session:
+        assert session.call_tool("echo", {"text": "a"})["content"][0]["text"] == "a"
+        _wait_until_exited(session)
+        assert not session.is_running
+        assert session.call_tool("echo", {"text": "b"})["content"][0]["text"] == "b"
+
+
+def test_processes_are_stopped_outside_the_lock(monkeypatch):
+    session = _session("--crash-after", "1")
+    stop = _ServerProcess.stop
+    locked = []
+
+    def stop_and_check(process):
+        locked.append(session._lock.locked())  # noqa: SLF001
+        stop(process)
+
+    monkeypatch.setattr(_ServerProcess, "stop", stop_and_check)
+    session.call_tool("echo", {"text": "a"})
+    _wait_until_exited(session)
+    # The crashed process is replaced, then the session is closed
+    session.call_tool("echo", {"text": "b"})
+    session.close()
+    assert locked == [False, False]
+
+
+def test_gives_up_after_max_restarts():
+    with _session("--crash-after", "1", max_restarts=0) as session:
+        session.call_tool("echo", {"text": "a"})
+        _wait_until_exited(session)
+        with pytest.raises(McpSessionError, match="giving up"):
+            session.call_tool("echo", {"text": "b"})
+
+
+def test_requests_to_a_replaced_process_keep_the_restart_count(monkeypatch):
+    with _session() as session:
+        started = session._process  # noqa: SLF001
+        send_request = session._send_request  # noqa: SLF001
+
+        def replaced_while_running(process, *args, **kwargs):
+            result = send_request(process, *args, **kwargs)
+            # As if the server crashed and was restarted in the meantime
+            session._process = object()  # noqa: SLF001
+            session._restarts = 2  # noqa: SLF001
+            return result
+
+        monkeypatch.setattr(session, "_send_request", replaced_while_running)
+        session.call_tool("echo", {"text": "a"})
+        assert session._restarts == 2  # noqa: SLF001
+        # Stopped by close()
+        session._process = started  # noqa: SLF001
+    assert started.popen.poll() is not None
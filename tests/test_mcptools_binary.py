@@ -0,0 +1,35 @@
+import pytest
+
+from baml_agents._agent_tools._mcptools_utils import (
+    MCPTOOLS_VERIFY_ENV_VAR,
+    McpToolsNotFoundError,
+    clear_mcptools_binary_cache,
+    find_mcptools_binary,
+    set_mcptools_binary,
+)
+
+
+@pytest.fixture
+def not_mcptools(tmp_path):
+    binary = tmp_path / "mcptools"
+    binary.write_text("#!/bin/sh\nexit 1\n")
+    binary.chmod(0o755)
+    set_mcptools_binary(str(binary))
+    clear_mcptools_binary_cache()
+    yield str(binary)
+    set_mcptools_binary(None)
+    clear_mcptools_binary_cache()
+
+
+def test_override_is_verified(not_mcptools):
+    with pytest.raises(McpToolsNotFoundError, match="does not look like"):
+        find_mcptools_binary()
+    assert find_mcptools_binary(verify=False) == not_mcptools
+
+
+def test_verification_can_be_disabled_by_env_var(not_mcptools, monkeypatch):
+    monkeypatch.setenv(MCPTOOLS_VERIFY_ENV_VAR, "false")
+    assert find_mcptools_binary() == not_mcptools
+    # A binary resolved without verification is verified when asked for
+    with pytest.raises(McpToolsNotFoundError):
+        find_mcptools_binary(verify=True)
@@ -0,0 +1,49 @@
+from baml_py import ClientRegistry
+
+from baml_agents import ResponseCacheHook, make_client_registry, with_hooks
+from baml_agents._baml_clients._with_baml_client import client_registry_identity
+
+
+def _registry(model: str) -> ClientRegistry:
+    return make_client_registry(provider="openai", options={"model": model})
+
+
+def test_hits_skip_the_call(fake_b):
+    cache = ResponseCacheHook()
+    b = with_hooks(fake_b, [cache])
+    assert b.Classify("a", labels=["x"]) == "x"
+    assert b.Classify(labels=["x"], text="a") == "x"
+    assert b.Classify("b") == "b"
+    assert fake_b.calls == ["a", "b"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_registries_of_different_models_are_kept_apart(fake_b):
+    b = with_hooks(fake_b, [ResponseCacheHook()])
+    for model in ["gpt-4o", "gpt-4o-mini", "gpt-4o"]:
+        b.Classify("a", baml_options={"client_registry": _registry(model)})
+    assert fake_b.calls == ["a", "a"]
+
+
+def test_unknown_registries_are_only_cached_with_a_namespace(fake_b):
+    cr = ClientRegistry()
+    b = with_hooks(fake_b, [ResponseCacheHook()])
+    b.Classify("a", baml_options={"client_registry": cr})
+    b.Classify("a", baml_options={"client_registry": cr})
+    assert fake_b.calls == ["a", "a"]
+
+    fake_b.calls.clear()
+    b = with_hooks(fake_b, [ResponseCacheHook(namespace="gpt-4o")])
+    b.Classify("a", baml_options={"client_registry": cr})
+    b.Classify("a", baml_options={"client_registry": cr})
+    assert fake_b.calls == ["a"]
+
+
+def test_registries_are_shared_per_options():
+    cr = _registry("gpt-4o")
+    assert _registry("gpt-4o") is cr
+    assert _registry("gpt-4o-mini") is not cr
+    assert client_registry_identity(cr) != client_registry_identity(
+        _registry("gpt-4o-mini")
+    )
+    assert client_registry_identity(ClientRegistry()) is None
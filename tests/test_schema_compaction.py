@@ -0,0 +1,60 @@
+from baml_agents import BamlToolPromptConfig, McpToolDefinition, SchemaCompaction
+from baml_agents._agent_tools._mcp_schema_to_type_builder._facade import (
+    estimate_prompt_tokens,
+)
+
+TOOL = McpToolDefinition(
+    name="render",
+    description="Renders a document. " * 10,
+    parameters_json_schema={
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "Path of the document"},
+            "format": {"type": "string", "enum": ["pdf"], "title": "Format"},
+            "dpi": {"type": "integer", "description": "Resolution. " * 20},
+            "title": {"type": "string"},
+            "author": {"type": "string"},
+        },
+        "required": ["path", "format"],
+    },
+)
+
+
+def test_default_changes_nothing():
+    assert SchemaCompaction().compact_tool(TOOL) is TOOL
+
+
+def test_compaction():
+    compacted = SchemaCompaction(
+        max_description_chars=30,
+        collapse_single_value_enums=True,
+        max_optional_fields=1,
+    ).compact_tool(TOOL)
+    properties = compacted.parameters_json_schema["properties"]
+    assert list(properties) == ["path", "format", "dpi"]
+    assert properties["path"]["description"] == "Path of the document"
+    assert len(properties["dpi"]["description"]) == 30
+    assert properties["dpi"]["description"].endswith("…")
+    assert "title" not in properties["format"]
+    assert len(compacted.description) == 30
+    # The original definition is left unchanged
+    assert len(TOOL.parameters_json_schema["properties"]) == 5
+
+
+def test_long_descriptions_can_be_dropped():
+    compacted = SchemaCompaction(
+        max_description_chars=30, drop_long_descriptions=True
+    ).compact_tool(TOOL)
+    properties = compacted.parameters_json_schema["properties"]
+    assert "description" in properties["path"]
+    assert "description" not in properties["dpi"]
+    assert compacted.description == ""
+
+
+def test_compaction_reduces_estimated_prompt_tokens():
+    cfg = BamlToolPromptConfig(
+        compaction=SchemaCompaction(max_description_chars=30, max_optional_fields=0)
+    )
+    full = estimate_prompt_tokens([TOOL])["render"]
+    compacted = estimate_prompt_tokens([TOOL], cfg)["render"]
+    assert 0 < compacted < full / 2
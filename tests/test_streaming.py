@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+from baml_agents import (
+    OnAfterCallSuccessHookSync,
+    OnPartialResponseParsedHookAsync,
+    OnPartialResponseParsedHookSync,
+    PartialHookPolicy,
+    with_hooks,
+)
+
+
+class _Partials(OnPartialResponseParsedHookSync, OnAfterCallSuccessHookSync):
+    def __init__(self, release: threading.Event | None = None):
+        self.partials = []
+        self.release = release
+        self.started = threading.Event()
+
+    def on_partial_response_parsed(self, *, ctx):
+        self.started.set()
+        if self.release is not None:
+            self.release.wait(5)
+        self.partials.append(ctx.partial_result)
+
+    def on_after_call_success(self, *, ctx, result):  # noqa: ARG002
+        result.value = result.value.upper()
+
+
+class _AsyncPartials(OnPartialResponseParsedHookAsync):
+    def __init__(self):
+        self.partials = []
+
+    async def on_partial_response_parsed(self, *, ctx):
+        self.partials.append(ctx.partial_result)
+
+
+def test_partial_hooks_see_every_partial_when_blocking(fake_b):
+    hook = _Partials()
+    policy = PartialHookPolicy(max_buffer=1, on_full="block")
+    stream = with_hooks(fake_b, [hook], partial_hook_policy=policy).stream.Classify(
+        "abc"
+    )
+    assert list(stream) == ["a", "ab", "abc"]
+    assert stream.get_final_response() == "ABC"
+    assert hook.partials == ["a", "ab", "abc"]
+    assert stream.dropped_partials == 0
+
+
+@pytest.mark.parametrize(
+    ("on_full", "handled"),
+    [
+        ("drop_oldest", ["a", "abcdefg", "abcdefgh"]),
+        ("drop_newest", ["a", "ab", "abc"]),
+    ],
+)
+def test_slow_partial_hooks_drop_partials(fake_b, on_full, handled):
+    release = threading.Event()
+    hook = _Partials(release)
+    policy = PartialHookPolicy(max_buffer=2, on_full=on_full)
+    stream = with_hooks(fake_b, [hook], partial_hook_policy=policy).stream.Classify(
+        "abcdefgh"
+    )
+    partials = []
+    for partial in stream:
+        partials.append(partial)
+        if len(partials) == 1:
+            hook.started.wait(5)
+        if len(partials) == 8:
+            # The hook is still stuck on the first partial
+            release.set()
+    assert len(partials) == 8
+    assert hook.partials == handled
+    assert stream.dropped_partials == 5
+
+
+def test_async_streams_drive_partial_hooks(fake_async_b):
+    hook = _AsyncPartials()
+
+    async def consume():
+        stream = with_hooks(fake_async_b, [hook]).stream.Classify("abc")
+        # Without iterating, the final response still runs the partial hooks
+        return await stream.get_final_response()
+
+    assert asyncio.run(consume()) == "abc"
+    assert hook.partials == ["a", "ab", "abc"]
+
+
+def test_policy_is_validated():
+    with pytest.raises(ValueError, match="max_buffer"):
+        PartialHookPolicy(max_buffer=0)
+    with pytest.raises(ValueError, match="on_full"):
+        PartialHookPolicy(on_full="drop_all")  # type: ignore[arg-type]
@@ -0,0 +1,49 @@
+from baml_py.type_builder import TypeBuilder
+
+from baml_agents import ActionRunner, McpToolDefinition, ToolIndex
+from baml_agents._agent_tools import _mcp
+
+
+def _tool(name: str, description: str = "", **properties) -> McpToolDefinition:
+    return McpToolDefinition(
+        name=name,
+        description=description,
+        parameters_json_schema={"type": "object", "properties": properties},
+    )
+
+
+TOOLS = [
+    _tool("getWeather", "Current weather of a city.", city={"type": "string"}),
+    _tool("search_web", "Searches the web.", query={"type": "string"}),
+    _tool("send_email", "Sends an email.", to={"description": "Recipient"}),
+    _tool("stop", "Ends the task."),
+]
+
+
+def test_search_ranks_by_name_description_and_parameters():
+    index = ToolIndex(TOOLS)
+    assert [t.name for t, _ in index.search("weather in Paris")] == ["getWeather"]
+    assert index.search("email recipient", top_k=1)[0][0].name == "send_email"
+    assert index.search("city")[0][0].name == "getWeather"
+    assert index.search("nothing matches") == []
+
+
+def test_include_keeps_top_k_and_always_included():
+    index = ToolIndex(TOOLS)
+    include = index.include("search the web", top_k=1, always_include=["stop"])
+    assert [t.name for t in TOOLS if include(t)] == ["search_web", "stop"]
+    # No match keeps every tool
+    include = index.include("nothing matches", top_k=1)
+    assert all(include(t) for t in TOOLS)
+
+
+def test_names_are_compared_as_action_ids(monkeypatch):
+    monkeypatch.setattr(_mcp, "list_tools", lambda *_, **__: TOOLS)
+    runner = ActionRunner(TypeBuilder)
+    runner.add_from_mcp_server("server")
+    for name in ["getWeather", "get_weather", "GetWeather"]:
+        include = runner.relevant_actions("email", top_k=1, always_include=[name])
+        assert [t.name for t in runner.actions if include(t)] == [
+            "getWeather",
+            "send_email",
+        ]
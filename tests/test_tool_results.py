@@ -0,0 +1,92 @@
+import json
+import sys
+
+from baml_agents import Result, ResultLimits
+from baml_agents._agent_tools._mcp import (
+    _cap_output,
+    _raw_output_limit,
+    _stream_cli_command,
+    _to_result,
+)
+
+
+def test_multi_part_and_non_text_content():
+    result = Result.from_mcp_schema(
+        {
+            "content": [
+                {"type": "text", "text": "Found 2 files"},
+                {"type": "image", "data": "aGVsbG8=", "mimeType": "image/png"},
+                {"type": "resource", "resource": {"uri": "file:///a", "text": "a"}},
+            ],
+            "isError": False,
+        }
+    )
+    assert result.content == "Found 2 files\n\n[image: image/png, 5 bytes]\n\na"
+
+
+def test_limits_truncate_items_and_text():
+    schema = {"content": [{"type": "text", "text": "x" * 50}] * 3}
+    result = Result.from_mcp_schema(schema, limits=ResultLimits(max_items=2))
+    assert result.content.endswith("[1 more content items omitted]")
+    result = Result.from_mcp_schema(schema, limits=ResultLimits(max_chars=10))
+    assert result.content.startswith("x" * 10 + "\n… [truncated")
+
+
+def test_limits_summarize():
+    limits = ResultLimits(max_tokens=5, summarize=lambda text, n: text[-n:])
+    assert limits.apply(Result(content="a" * 100 + "end")).content.endswith("end")
+    assert limits.apply(Result(content="short")).content == "short"
+
+
+def test_streaming_stops_at_byte_cap():
+    command = [sys.executable, "-c", "print('x' * 1_000_000)"]
+    output = _stream_cli_command(command, env=None, max_output_bytes=1000)
+    assert 1000 < len(output) < 1_000_000
+    assert _stream_cli_command(command, env=None, max_output_bytes=2_000_000)
+
+
+def test_capped_output_truncates_the_text_items():
+    schema = {
+        "content": [
+            {"type": "text", "text": "a" * 60},
+            {"type": "image", "data": "aGVsbG8=", "mimeType": "image/png"},
+            {"type": "text", "text": "b" * 60},
+            {"type": "text", "text": "c" * 60},
+        ],
+        "isError": False,
+    }
+    output = json.loads(_cap_output(json.dumps(schema), 100))
+    assert [item["type"] for item in output["content"]] == ["text", "image", "text"]
+    result = _to_result(output, ResultLimits())
+    assert not result.error
+    assert result.content == (
+        "a" * 60
+        + "\n\n[image: image/png, 5 bytes]\n\n"
+        + "b" * 40
+        + "\n\n[tool output cut at 100 bytes]"
+    )
+    assert _cap_output(json.dumps(schema), 1000) == json.dumps(schema)
+
+
+def test_cut_raw_output_keeps_its_text_items():
+    raw = '{"content": [{"type": "text", "text": "a"}, {"type": "text", "text": "'
+    # Read up to the raw output limit, and cut in the middle of an escape
+    raw += "x" * _raw_output_limit(100) + "\\u00"
+    output = _cap_output(raw, 100)
+    result = _to_result(json.loads(output), ResultLimits())
+    assert not result.error
+    assert result.content == "a\n\n" + "x" * 99 + "\n\n[tool output cut at 100 bytes]"
+
+
+def test_one_large_text_item_is_read_far_enough_to_fill_the_cap():
+    script = (
+        "import json; "
+        "print(json.dumps({'content': [{'type': 'text', 'text': 'é' * 100_000}]}))"
+    )
+    command = [sys.executable, "-c", script]
+    raw = _stream_cli_command(
+        command, env=None, max_output_bytes=_raw_output_limit(1000)
+    )
+    result = _to_result(json.loads(_cap_output(raw, 1000)), ResultLimits())
+    assert not result.error
+    assert result.content == "é" * 500 + "\n\n[tool output cut at 1000 bytes]"
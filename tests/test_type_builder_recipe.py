@@ -0,0 +1,65 @@
+from baml_agents import Action, ActionRunner, Result
+from baml_agents._agent_tools._mcp_schema_to_type_builder._facade import (
+    add_available_actions,
+)
+from baml_agents._agent_tools._mcp_schema_to_type_builder._type_builder_recipe import (
+    RecordingTypeBuilder,
+)
+
+
+class Search(Action):
+    """Searches the docs."""
+
+    query: str
+    limit: int = 10
+
+    def run(self) -> Result:
+        return Result(content="")
+
+
+class Stop(Action):
+    answer: str
+
+    def run(self) -> Result:
+        return Result(content="")
+
+
+def _color(rec: RecordingTypeBuilder, value: str):
+    color = rec.add_enum("Color")
+    color.add_value(value)
+    return color.type()
+
+
+def test_replay_declares_each_structure_once(tb_cls):
+    rec = RecordingTypeBuilder()
+    paint = rec.add_class("Paint")
+    paint.add_property("color", _color(rec, "red")).description("The color")
+    recipe = rec.to_recipe([paint.type()])
+
+    other = RecordingTypeBuilder()
+    other_recipe = other.to_recipe([_color(other, "blue")])
+
+    tb, declared = tb_cls(), {}
+    recipe.replay(tb, declared)
+    recipe.replay(tb, declared)
+    other_recipe.replay(tb, declared)
+    assert sorted(declared) == ["Color", "Color2", "Paint"]
+    assert str(tb).count("Paint {") == 1
+
+
+def test_runner_tb_matches_a_full_rebuild(tb_cls):
+    runner = ActionRunner(tb_cls)
+    runner.add_action(Search)
+
+    def rebuild() -> str:
+        return str(add_available_actions("NextAction", runner.actions, tb_cls()))
+
+    assert str(runner.tb("NextAction")) == str(runner.tb("NextAction")) == rebuild()
+
+    # Changing the tool set is picked up by the next call
+    runner.add_action(Stop)
+    assert "answer" in str(runner.tb("NextAction"))
+    assert str(runner.tb("NextAction")) == rebuild()
+    only_search = str(runner.tb("NextAction", include=lambda t: t.name == "search"))
+    assert "answer" not in only_search
+    assert "query" in only_search